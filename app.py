@@ -1,5 +1,7 @@
 import streamlit as st
 
+from core.catalog import CATALOG
+
 st.set_page_config(page_title="Pydataset — Presentación", layout="wide")
 
 st.title("Pydataset — Presentación")
@@ -10,6 +12,7 @@ st.markdown(
 
     - Catálogo traducido (página): contiene el listado y herramientas de filtrado.
     - Documentación (página): muestra la documentación de cada dataset.
+    - Consultas sobre la colección (página): filtros y agregaciones sobre todos los datasets a la vez.
     """
 )
 
@@ -41,4 +44,15 @@ nav_html = '''
 </script>
 '''
 
+# Resumen del catálogo unificado (core.catalog); lo reutilizan las páginas del mismo proceso.
+try:
+    summary = CATALOG.catalog().summary()
+except Exception as e:
+    st.warning(f"No se pudo preparar el catálogo: {e}")
+else:
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Datasets", f"{summary['datasets']:,}")
+    c2.metric("Con título traducido", f"{summary['translated']:,}")
+    c3.metric("En el almacén local", f"{summary['stored']:,}")
+
 st.info("Usa la barra lateral 'Pages' para navegar entre 'Catálogo traducido' y 'Documentación de pydataset'.")
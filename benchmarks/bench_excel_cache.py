@@ -0,0 +1,64 @@
+"""Benchmark de arranque en frío: openpyxl vs. caché Arrow memory-mapped.
+
+Cada medición se hace en un proceso nuevo para reflejar un worker recién
+arrancado (sin `st.cache_data`). Uso::
+
+    python -m benchmarks.bench_excel_cache [--xlsx RUTA] [--synthetic-rows 20000]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.synthetic import make_catalog
+from core.excel_cache import ROOT, ExcelCache
+
+DEFAULT_XLSX = ROOT / "data" / "pydataset_list_translated.xlsx"
+
+# Las importaciones (pandas/pyarrow) quedan fuera del tiempo medido: las paga
+# cualquier página igualmente; se mide solo la carga de la hoja.
+_OPENPYXL = ("import time, pandas as pd, openpyxl; t=time.perf_counter(); "
+             "pd.read_excel({path!r}, engine='openpyxl'); print(time.perf_counter()-t)")
+_CACHED = ("import time; from core.excel_cache import ExcelCache; t=time.perf_counter(); "
+           "ExcelCache({path!r}, cache_dir={cache!r}).load(0); print(time.perf_counter()-t)")
+
+
+def _run(code: str, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def bench(path: Path, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as cache:
+        ExcelCache(path, cache_dir=cache).manifest()  # conversión inicial
+        t_xlsx = _run(_OPENPYXL.format(path=str(path)), repeat)
+        t_arrow = _run(_CACHED.format(path=str(path), cache=cache), repeat)
+    print(f"{path.name:<40} openpyxl: {t_xlsx * 1e3:8.1f} ms   arrow mmap: {t_arrow * 1e3:8.1f} ms"
+          f"   x{t_xlsx / t_arrow:.1f}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--xlsx", type=Path, default=DEFAULT_XLSX)
+    parser.add_argument("--synthetic-rows", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.xlsx.exists():
+        bench(args.xlsx, args.repeat)
+    if args.synthetic_rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / f"synthetic_{args.synthetic_rows}.xlsx"
+            make_catalog(args.synthetic_rows).to_excel(path, index=False, engine="openpyxl")
+            bench(path, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
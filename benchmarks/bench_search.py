@@ -0,0 +1,57 @@
+"""Benchmark: índice de búsqueda precompilado vs. máscaras `str.contains`.
+
+Uso::
+
+    python -m benchmarks.bench_search --rows 100000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.synthetic import make_catalog
+from core.search_index import SearchIndex
+
+QUERIES = ["ds0001234", "population", "ventas mensual", "xyz", "ing"]
+
+
+def mask_search(df, q):
+    # Replica la lógica original de la página (se ejecutaba dos veces por rerun).
+    mask = (
+        df["dataset_id"].astype(str).str.contains(q, case=False, na=False)
+    ) | (
+        df["title"].astype(str).str.contains(q, case=False, na=False)
+    ) | (
+        df["title_es"].astype(str).str.contains(q, case=False, na=False)
+    )
+    return df[mask]
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    df = make_catalog(args.rows)
+    t0 = time.perf_counter()
+    index = SearchIndex(df)
+    print(f"filas={args.rows:,}  construcción del índice: {time.perf_counter() - t0:.3f} s")
+    print(f"{'consulta':<18}{'máscara (ms)':>14}{'índice (ms)':>14}{'filas':>10}")
+    for q in QUERIES:
+        t_mask = _best(lambda: mask_search(df, q), args.repeat)
+        t_index = _best(lambda: index.search(q), args.repeat)
+        print(f"{q:<18}{t_mask * 1e3:>14.2f}{t_index * 1e3:>14.3f}{len(index.search(q)):>10,}")
+
+
+if __name__ == "__main__":
+    main()
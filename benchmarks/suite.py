@@ -0,0 +1,272 @@
+"""Suite de benchmarks de los caminos críticos del catálogo y la vista previa.
+
+Mide, con catálogos y datasets sintéticos de tamaño creciente (10^3 a 10^6
+filas): búsqueda, orden, paginación, exportación CSV, carga del Excel, carga de
+un dataset desde el almacén y perfilado; además, el tiempo de arranque en frío
+de las dos páginas (ejecutadas sin servidor, en un proceso nuevo) y el coste de
+importación de la app por encima de Streamlit (`python -X importtime`). Para cada
+caso guarda p50/p95 de latencia y el pico de memoria (tracemalloc, en una
+ejecución aparte para no distorsionar los tiempos). Uso::
+
+    python -m benchmarks.suite                                  # 10^3..10^5
+    python -m benchmarks.suite --sizes 1000 1000000 --out resultados.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 1.3
+
+Con `--compare` sale con código 1 si algún p50 empeora más que `threshold`
+veces respecto a la línea base.
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.synthetic import make_catalog, make_dataset
+from core.excel_cache import ROOT
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+# openpyxl escribe/lee unas 20k filas/s: el Excel se limita por defecto a tamaños razonables.
+DEFAULT_EXCEL_MAX_ROWS = 10_000
+PAGES = ("pages/1_Catalogo_traducido.py", "pages/2_Documentacion_pydataset.py")
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| *(\S+)")
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, setup: Optional[Callable[[], None]] = None,
+            memory: bool = True) -> Dict[str, float]:
+    """p50/p95/mín de `fn` en ms y pico de memoria (MB) de una ejecución adicional."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1e3)
+    out = {"p50_ms": float(np.percentile(times, 50)), "p95_ms": float(np.percentile(times, 95)),
+           "min_ms": float(min(times)), "repeat": repeat}
+    if memory:
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            fn()
+            out["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return out
+
+
+def _widget_bytes(data) -> bytes:
+    """Serialización que hace `st.dataframe` (Arrow IPC stream; los DataFrames pasan antes por `from_pandas`)."""
+    import pyarrow as pa
+
+    table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data)
+    sink = pa.BufferOutputStream()
+    with pa.RecordBatchStreamWriter(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _catalog_cases(n: int, repeat: int) -> Dict[str, dict]:
+    from core.export import iter_export
+    from core.query import CatalogQueryEngine
+    from core.ranked_search import RankedSearch
+    from core.search_index import SearchIndex
+    from core.sorting import SortPermutations
+
+    df = make_catalog(n)
+    results = {"index_build": measure(lambda: SearchIndex(df), max(1, repeat // 2))}
+    engine = CatalogQueryEngine(df, index=SearchIndex(df))
+    all_positions = np.arange(n, dtype=np.int64)
+    results["search"] = measure(lambda: engine._filter("ventas mensual"), repeat)
+    results["sort_precompute"] = measure(lambda: SortPermutations(df).permutation("title_es"), max(1, repeat // 2))
+    engine.orderings.warm()
+    results["sort"] = measure(lambda: engine._sort(all_positions, "title", "asc"), repeat)
+    subset = engine._filter("ventas mensual")
+    results["sort_filtered"] = measure(lambda: engine._sort(subset, "title_es", "desc"), repeat)
+    result = engine.query("", "title", "asc")
+    middle = max(1, result.total // 25 // 2)
+    results["paginate"] = measure(lambda: result.page(middle, 25), repeat)
+    # Página del catálogo hasta los bytes del widget: vía pandas (antes) y vía la tabla Arrow del motor.
+    results["page_widget_pandas"] = measure(lambda: _widget_bytes(result.page(middle, 25)[0]), repeat)
+    engine.table
+    results["page_widget"] = measure(lambda: _widget_bytes(result.page_table(middle, 25)[0]), repeat)
+    ranker = RankedSearch(df)
+    results["ranked_build"] = measure(lambda: RankedSearch(df), 1)
+    results["ranked_search"] = measure(lambda: ranker.search("poblacoin mensual", k=50), repeat)
+    results["export_csv"] = measure(lambda: b"".join(iter_export(df, "csv")), max(1, repeat // 2))
+    return results
+
+
+def _dataset_cases(n: int, repeat: int, tmp: Path) -> Dict[str, dict]:
+    from core.arrowio import widget_table
+    from core.dataset_store import DatasetStore
+    from core.paging import PagedSource
+    from core.profiling import profile_frame
+
+    df = make_dataset(n)
+    store = DatasetStore(tmp / f"store_{n}")
+    store.put("bench", df)
+    source = PagedSource(store.path("bench"))
+    middle = n // 2
+    return {
+        "dataset_load": measure(lambda: store.get("bench"), repeat),
+        "profile": measure(lambda: profile_frame(df, name="bench"), max(1, repeat // 2)),
+        # Ventana de 50 filas y 2 columnas de la vista previa hasta los bytes del widget.
+        "preview_widget_pandas": measure(
+            lambda: _widget_bytes(source.window(middle, middle + 50, columns=["x", "label"])), repeat),
+        "preview_widget": measure(
+            lambda: _widget_bytes(widget_table(source.window_table(middle, middle + 50, columns=["x", "label"]))),
+            repeat),
+    }
+
+
+def _excel_cases(n: int, repeat: int, tmp: Path) -> Dict[str, dict]:
+    from core.excel_cache import ExcelCache
+
+    path = tmp / f"catalog_{n}.xlsx"
+    make_catalog(n).to_excel(path, index=False, engine="openpyxl")
+    cache_dir = tmp / f"excel_cache_{n}"
+
+    def cold():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return {
+        "excel_parse": measure(lambda: ExcelCache(path, cache_dir).load(0), max(1, repeat // 2), setup=cold),
+        "excel_load": measure(lambda: ExcelCache(path, cache_dir).load(0), repeat),
+    }
+
+
+def page_startup(page: str, repeat: int = 3) -> Dict[str, float]:
+    """Arranque en frío de una página en un proceso nuevo (modo sin servidor de Streamlit)."""
+    code = ("import time, runpy, sys; t = time.perf_counter(); "
+            f"runpy.run_path({page!r}, run_name='__main__'); "
+            "sys.stdout.write('\\n%f\\n' % ((time.perf_counter() - t) * 1e3))")
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True,
+                             env={**os.environ, "PYTHONPATH": str(ROOT)}, timeout=600)
+        if out.returncode != 0:
+            raise RuntimeError(out.stderr[-2000:])
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return {"p50_ms": float(np.percentile(times, 50)), "p95_ms": float(np.percentile(times, 95)),
+            "min_ms": float(min(times)), "repeat": repeat}
+
+
+def page_imports() -> List[str]:
+    """Módulos que `app.py` y las páginas importan al nivel de módulo (sin Streamlit)."""
+    modules = set()
+    for path in [ROOT / "app.py", *sorted((ROOT / "pages").glob("*.py"))]:
+        for node in ast.parse(path.read_text(encoding="utf-8")).body:
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module != "__future__":
+                modules.add(node.module)
+    return sorted(modules - {"streamlit"})
+
+
+def app_import_profile() -> List[tuple]:
+    """`(microsegundos propios, módulo)` de lo que importa la app después de Streamlit, en un proceso nuevo."""
+    code = "\n".join(["import streamlit", *(f"import {m}" for m in page_imports()),
+                      "from core.deps import pydataset_status", "pydataset_status()"])
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, env={**os.environ, "PYTHONPATH": str(ROOT)}, timeout=600, check=True).stderr
+    rows = [(int(m[1]), m[3]) for m in map(_IMPORTTIME_RE.match, out.splitlines()) if m]
+    start = next(i for i, (_, name) in enumerate(rows) if name == "streamlit") + 1
+    return rows[start:]
+
+
+def app_imports(repeat: int = 3) -> Dict[str, float]:
+    """Coste de importación de la app por encima de Streamlit (que ya trae pandas y pyarrow)."""
+    times = [sum(us for us, _ in app_import_profile()) / 1e3 for _ in range(repeat)]
+    return {"p50_ms": float(np.percentile(times, 50)), "p95_ms": float(np.percentile(times, 95)),
+            "min_ms": float(min(times)), "repeat": repeat}
+
+
+def run(sizes=DEFAULT_SIZES, repeat: int = 5, excel_max_rows: int = DEFAULT_EXCEL_MAX_ROWS,
+        pages: bool = True, progress=print) -> dict:
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            if progress:
+                progress(f"n={n:,}")
+            cases = _catalog_cases(n, repeat)
+            cases.update(_dataset_cases(n, repeat, Path(tmp)))
+            if n <= excel_max_rows:
+                cases.update(_excel_cases(n, repeat, Path(tmp)))
+            for case, stats in cases.items():
+                results[f"{case}[{n}]"] = stats
+    if pages:
+        for page in PAGES:
+            if progress:
+                progress(f"arranque de {page}")
+            results[f"page_startup[{Path(page).stem}]"] = page_startup(page, repeat=max(1, repeat // 2))
+        results["app_imports"] = app_imports(repeat=max(1, repeat // 2))
+    return {"meta": {"python": platform.python_version(), "machine": platform.machine(),
+                     "sizes": list(sizes), "repeat": repeat, "ts": time.time()},
+            "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float = 1.25, min_ms: float = 1.0) -> List[str]:
+    """Casos cuyo p50 empeora más de `threshold` veces (se ignoran los de menos de `min_ms`)."""
+    regressions = []
+    for case, stats in current["results"].items():
+        base = baseline.get("results", {}).get(case)
+        if base is None or max(stats["p50_ms"], base["p50_ms"]) < min_ms:
+            continue
+        ratio = stats["p50_ms"] / max(base["p50_ms"], 1e-9)
+        if ratio > threshold:
+            regressions.append(f"{case}: {base['p50_ms']:.2f} ms -> {stats['p50_ms']:.2f} ms (x{ratio:.2f})")
+    return regressions
+
+
+def format_table(report: dict) -> str:
+    lines = [f"{'caso':<44}{'p50 ms':>12}{'p95 ms':>12}{'pico MB':>10}"]
+    for case, s in report["results"].items():
+        peak = f"{s['peak_mb']:.1f}" if "peak_mb" in s else "—"
+        lines.append(f"{case:<44}{s['p50_ms']:>12.3f}{s['p95_ms']:>12.3f}{peak:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks del catálogo y la vista previa")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--excel-max-rows", type=int, default=DEFAULT_EXCEL_MAX_ROWS)
+    parser.add_argument("--no-pages", action="store_true", help="no medir el arranque de las páginas")
+    parser.add_argument("--out", type=Path, default=None, help="guardar los resultados en JSON")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="guardar como línea base")
+    parser.add_argument("--compare", type=Path, default=None, help="comparar con una línea base")
+    parser.add_argument("--threshold", type=float, default=1.25, help="factor de empeoramiento tolerado")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.repeat, args.excel_max_rows, pages=not args.no_pages)
+    print(format_table(report))
+    for path in (args.out, args.save_baseline):
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=1), encoding="utf-8")
+    if args.compare is not None:
+        regressions = compare(report, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        for line in regressions:
+            print(f"REGRESIÓN {line}")
+        if regressions:
+            sys.exit(1)
+        print("Sin regresiones respecto a la línea base.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Generadores de datos sintéticos para los benchmarks."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+_WORDS_EN = ["data", "population", "monthly", "sales", "airline", "passenger", "survival", "growth",
+             "income", "crime", "school", "weather", "prices", "study", "experiment", "trial"]
+_WORDS_ES = ["datos", "población", "mensual", "ventas", "aérea", "pasajeros", "supervivencia", "crecimiento",
+             "ingresos", "crimen", "escuela", "clima", "precios", "estudio", "experimento", "ensayo"]
+
+
+def make_catalog(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Catálogo sintético con las columnas `dataset_id`, `title` y `title_es`."""
+    rng = np.random.default_rng(seed)
+    words_en = np.array(_WORDS_EN)
+    words_es = np.array(_WORDS_ES)
+    picks = rng.integers(0, len(_WORDS_EN), size=(n_rows, 4))
+    return pd.DataFrame({
+        "dataset_id": [f"ds{i:07d}" for i in range(n_rows)],
+        "title": [" ".join(words_en[p]).capitalize() for p in picks],
+        "title_es": [" ".join(words_es[p]).capitalize() for p in picks],
+    })
+
+
+def make_dataset(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Dataset sintético con columnas numéricas, enteras, categóricas y de texto libre."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "x": rng.normal(size=n_rows),
+        "y": rng.uniform(0, 100, size=n_rows),
+        "count": rng.integers(0, 1000, size=n_rows),
+        "group": np.array(_WORDS_ES)[rng.integers(0, 8, size=n_rows)],
+        "label": [f"item {i}" for i in rng.integers(0, n_rows, size=n_rows)],
+    })
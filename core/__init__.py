@@ -0,0 +1,5 @@
+"""Lógica compartida de la aplicación (importable sin ejecutar Streamlit).
+
+Las páginas bajo `pages/` son scripts de Streamlit y no pueden importarse en
+los tests; el código reutilizable vive en este paquete.
+"""
@@ -0,0 +1,113 @@
+"""Conversión a Arrow y lectura/escritura de ficheros Arrow IPC memory-mapped."""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+
+def to_arrow_table(df: pd.DataFrame, preserve_index: bool = False) -> pa.Table:
+    """Convertir un DataFrame a Arrow; las columnas object con tipos mezclados se pasan a texto."""
+    try:
+        return pa.Table.from_pandas(df, preserve_index=preserve_index)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        fixed = df.copy()
+        for c in fixed.columns:
+            if fixed[c].dtype == object:
+                fixed[c] = fixed[c].map(lambda v: None if pd.isna(v) else str(v))
+        return pa.Table.from_pandas(fixed, preserve_index=preserve_index)
+
+
+def table_to_frame(table: pa.Table) -> pd.DataFrame:
+    """Tabla Arrow a DataFrame; las columnas guardadas como `string` vuelven como `string[pyarrow]`."""
+    with pd.option_context("mode.string_storage", "pyarrow"):
+        return table.to_pandas()
+
+
+def write_ipc(table: pa.Table, path: str | Path, max_chunksize: int | None = None) -> None:
+    """Escribir `table` como fichero Arrow IPC de forma atómica (temporal + rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh, pa.ipc.new_file(fh, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=max_chunksize):
+                writer.write_batch(batch)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def read_ipc(path: str | Path) -> pa.Table:
+    """Leer un fichero Arrow IPC mediante memory-map (sin copiar los buffers)."""
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+# El frontend de Streamlit 1.26 (Arrow JS) no entiende los tipos "large": se envían como sus equivalentes.
+_WIDGET_CASTS = {pa.large_string(): pa.string(), pa.large_binary(): pa.binary()}
+
+
+def _widget_type(t: pa.DataType) -> pa.DataType:
+    if pa.types.is_dictionary(t):
+        return pa.dictionary(t.index_type, _WIDGET_CASTS.get(t.value_type, t.value_type), t.ordered)
+    return _WIDGET_CASTS.get(t, t)
+
+
+@lru_cache(maxsize=256)
+def _project_pandas_metadata(metadata: bytes, names: Tuple[str, ...], num_rows: int) -> bytes:
+    meta = json.loads(metadata)
+    kept = set(names)
+    index = []
+    for entry in meta.get("index_columns", []):
+        if isinstance(entry, str):
+            if entry in kept:
+                index.append(entry)
+        elif len(range(entry["start"], entry["stop"], entry["step"])) == num_rows:
+            index.append(entry)  # un RangeIndex solo sigue valiendo si no se han quitado filas
+    meta["index_columns"] = index
+    meta["columns"] = [c for c in meta.get("columns", []) if c.get("field_name") in kept]
+    return json.dumps(meta).encode("utf-8")
+
+
+def select_columns(table: pa.Table, columns: Optional[Sequence[str]]) -> pa.Table:
+    """Proyección (sin copiar) a `columns` más las columnas de índice, con metadatos pandas coherentes."""
+    if columns is None:
+        return table
+    pandas_meta = table.schema.pandas_metadata or {}
+    index_cols = [c for c in pandas_meta.get("index_columns", []) if isinstance(c, str)]
+    names = set(table.schema.names)
+    keep = list(dict.fromkeys([c for c in columns if c in names] + index_cols))
+    return _with_pandas_metadata(table.select(keep))
+
+
+def _with_pandas_metadata(table: pa.Table) -> pa.Table:
+    metadata = table.schema.metadata or {}
+    raw = metadata.get(b"pandas")
+    if raw is None:
+        return table
+    projected = _project_pandas_metadata(raw, tuple(table.schema.names), table.num_rows)
+    return table.replace_schema_metadata({**metadata, b"pandas": projected})
+
+
+def widget_table(data, columns: Optional[Sequence[str]] = None) -> pa.Table:
+    """Tabla Arrow lista para `st.dataframe`: Streamlit la envía tal cual, sin pasar por pandas.
+
+    Acepta una tabla (p. ej. una ventana del almacén) o un DataFrame (se convierte conservando el
+    índice). Proyecta a `columns`, deja los metadatos pandas coherentes con las columnas y filas que
+    quedan (el frontend los necesita para pintar índice y tipos) y solo copia las columnas de texto
+    "large", que el frontend no sabe leer.
+    """
+    table = data if isinstance(data, pa.Table) else to_arrow_table(data, preserve_index=True)
+    table = select_columns(table, columns) if columns is not None else _with_pandas_metadata(table)
+    target = pa.schema([f.with_type(_widget_type(f.type)) for f in table.schema], metadata=table.schema.metadata)
+    if target.equals(table.schema, check_metadata=False):
+        return table
+    return table.cast(target)
@@ -0,0 +1,230 @@
+"""Carga en segundo plano del dataset seleccionado (y precarga de sus vecinos).
+
+Al elegir un dataset, la página no se bloquea cargándolo y perfilándolo: pide
+a `BackgroundLoader` una `LoadHandle` con dos futures, la fuente paginada y el
+perfil (que se lanza en cuanto la fuente está lista), y va pintando cada parte
+cuando termina. Mientras espera, la página solo hace esperas cortas, así que
+una nueva interacción del usuario interrumpe el rerun sin quedar en cola.
+
+- Las cargas se comparten entre sesiones: dos peticiones del mismo dataset
+  reutilizan el mismo future.
+- Si una sesión cambia de selección, sus cargas anteriores que aún no han
+  empezado (y que ninguna otra sesión espera) se cancelan.
+- Los vecinos del dataset en la lista de resultados se precargan en un pool
+  aparte de baja prioridad (un hilo), para que el siguiente clic sea inmediato.
+  Si se pide en primer plano un dataset cuya precarga aún está en cola, la
+  precarga se cancela y la carga pasa al pool principal.
+- Las sesiones no avisan al cerrarse: una sesión sin peticiones durante
+  `owner_ttl` segundos se olvida (como `release`), para que sus selecciones no
+  se acumulen ni impidan cancelar cargas que ya nadie espera.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from core.instrumentation import count
+
+# Segundos sin peticiones tras los que se olvida una sesión (Streamlit no avisa al cerrarla).
+OWNER_TTL_S = 1800.0
+
+
+@dataclass
+class LoadHandle:
+    name: str
+    source: Future
+    profile: Future
+
+
+def neighbours(items: Sequence[str], current: str, radius: int = 1) -> List[str]:
+    """Elementos a distancia <= `radius` de `current` en `items` (primero los siguientes)."""
+    try:
+        i = list(items).index(current)
+    except ValueError:
+        return []
+    out = []
+    for d in range(1, radius + 1):
+        for j in (i + d, i - d):
+            if 0 <= j < len(items):
+                out.append(items[j])
+    return out
+
+
+class BackgroundLoader:
+    """Pools de hilos para cargar/perfilar datasets sin bloquear el script de Streamlit."""
+
+    def __init__(self, load: Callable[[str], Any], profile: Callable[[str], Any],
+                 workers: int = 2, prefetch_workers: int = 1, owner_ttl: float = OWNER_TTL_S,
+                 clock: Callable[[], float] = time.monotonic):
+        self._load = load
+        self._profile = profile
+        self.owner_ttl = owner_ttl
+        self._clock = clock
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dataset-load")
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="dataset-prefetch")
+        self._lock = threading.RLock()  # los callbacks de futures ya terminados corren en el mismo hilo
+        self._futures: Dict[Tuple[str, str], Future] = {}
+        self._owners: Dict[Hashable, str] = {}  # sesión -> dataset seleccionado
+        self._prefetch_wanted: Dict[Hashable, List[str]] = {}
+        self._last_seen: Dict[Hashable, float] = {}
+        self._prefetch_futures: Set[Future] = set()
+        self.cancelled = 0
+
+    # Futures compartidos ----------------------------------------------------
+
+    def _track(self, key: Tuple[str, str], fut: Future) -> Future:
+        self._futures[key] = fut
+
+        def forget(f, key=key):
+            with self._lock:
+                self._prefetch_futures.discard(f)
+                if self._futures.get(key) is f:
+                    del self._futures[key]
+
+        fut.add_done_callback(forget)
+        return fut
+
+    def _source_future(self, name: str, prefetch: bool = False) -> Future:
+        key = ("source", name)
+        fut = self._futures.get(key)
+        if fut is not None and not prefetch and fut in self._prefetch_futures and fut.cancel():
+            # Precarga aún en cola detrás de otras: el clic del usuario no debe esperar a ese pool.
+            count("background.promoted")
+            fut = None
+        if fut is None:
+            pool = self._prefetch_pool if prefetch else self._pool
+            fut = self._track(key, pool.submit(self._load, name))
+            if prefetch:
+                self._prefetch_futures.add(fut)
+            count("background.prefetch" if prefetch else "background.load")
+        return fut
+
+    def _profile_future(self, name: str, source: Future) -> Future:
+        key = ("profile", name)
+        fut = self._futures.get(key)
+        if fut is not None:
+            return fut
+        # El perfil se encola cuando la fuente termina (nunca un worker esperando a otro).
+        fut = self._track(key, Future())
+
+        def start(src: Future) -> None:
+            if not fut.set_running_or_notify_cancel():
+                return
+            if src.cancelled():
+                fut.set_exception(RuntimeError(f"Carga de {name} cancelada"))
+                return
+            if src.exception() is not None:
+                fut.set_exception(src.exception())
+                return
+            task = self._pool.submit(self._profile, name)
+            task.add_done_callback(lambda t: fut.set_exception(t.exception()) if t.exception() is not None
+                                   else fut.set_result(t.result()))
+
+        source.add_done_callback(start)
+        return fut
+
+    # API --------------------------------------------------------------------
+
+    def request(self, owner: Hashable, name: str, prefetch: Iterable[str] = ()) -> LoadHandle:
+        """Cargar `name` para la sesión `owner`, cancelando su selección anterior y precargando `prefetch`."""
+        with self._lock:
+            self._expire_idle(owner)
+            previous = self._owners.get(owner)
+            self._owners[owner] = name
+            if previous is not None and previous != name:
+                self._cancel_unwanted(previous)
+            source = self._source_future(name)
+            profile = self._profile_future(name, source)
+            old_prefetch = self._prefetch_wanted.get(owner, [])
+            self._prefetch_wanted[owner] = wanted = [n for n in prefetch if n != name]
+            for n in old_prefetch:
+                if n not in wanted:
+                    self._cancel_unwanted(n)
+            for n in wanted:
+                self._source_future(n, prefetch=True)
+        return LoadHandle(name, source, profile)
+
+    def _cancel_unwanted(self, name: str) -> None:
+        # Con el lock tomado. Solo se cancela lo que no ha empezado y nadie más espera.
+        if name in self._owners.values() or any(name in w for w in self._prefetch_wanted.values()):
+            return
+        for kind in ("profile", "source"):
+            fut = self._futures.get((kind, name))
+            if fut is not None and fut.cancel():
+                self.cancelled += 1
+                count("background.cancelled")
+
+    def _expire_idle(self, current: Hashable) -> None:
+        # Con el lock tomado: olvidar las sesiones inactivas y anotar la actividad de `current`.
+        now = self._clock()
+        for owner in [o for o, seen in self._last_seen.items() if now - seen > self.owner_ttl and o != current]:
+            count("background.owner_expired")
+            self.release(owner)
+        self._last_seen[current] = now
+
+    def release(self, owner: Hashable) -> None:
+        """Olvidar la selección y las precargas de `owner` (sesión cerrada o inactiva)."""
+        with self._lock:
+            name = self._owners.pop(owner, None)
+            prefetch = self._prefetch_wanted.pop(owner, [])
+            self._last_seen.pop(owner, None)
+            for n in ([name] if name is not None else []) + prefetch:
+                self._cancel_unwanted(n)
+
+    def owners(self) -> int:
+        with self._lock:
+            return len(self._owners)
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(1 for f in self._futures.values() if not f.done())
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._prefetch_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def wait_for(fut: Future, timeout: float, poll: float = 0.1, on_tick: Optional[Callable[[float], None]] = None):
+    """Esperar `fut` con esperas cortas (llamando a `on_tick(segundos)` entre ellas).
+
+    Devuelve el resultado o lanza `concurrent.futures.TimeoutError` si no termina en `timeout`.
+    """
+    waited = 0.0
+    while True:
+        try:
+            return fut.result(timeout=min(poll, max(timeout - waited, 0.0)))
+        except FutureTimeout:
+            waited += poll
+            if waited >= timeout:
+                raise
+            if on_tick is not None:
+                on_tick(waited)
+
+
+_LOADER: Optional[BackgroundLoader] = None
+_LOADER_LOCK = threading.Lock()
+
+
+def _open_source(name: str):
+    from core.paging import open_dataset
+
+    return open_dataset(name)
+
+
+def _profile(name: str):
+    from core.profiling import get_profile
+
+    return get_profile(name)
+
+
+def get_loader() -> BackgroundLoader:
+    """Cargador del proceso (fuente paginada del almacén + perfil), compartido por todas las sesiones."""
+    global _LOADER
+    with _LOADER_LOCK:
+        if _LOADER is None:
+            _LOADER = BackgroundLoader(_open_source, _profile)
+        return _LOADER
@@ -0,0 +1,286 @@
+"""Catálogo unificado de datasets compartido por `app.py` y las páginas.
+
+Une en una sola tabla, indexada por `dataset_id`, las dos fuentes que antes
+cargaba y normalizaba cada página por su cuenta:
+
+- el catálogo traducido (`data/pydataset_list_translated.xlsx`, vía la caché
+  Arrow de `core.excel_cache`): `title_es`;
+- el catálogo de pydataset (`data()`, con `Item`/`Title` renombradas a
+  `dataset_id`/`title`) y el paquete de R de cada dataset, sacado de la ruta
+  de su documentación;
+
+y añade los metadatos precalculados de los datasets almacenados (manifest de
+`core.dataset_store`: filas, columnas, bytes en Arrow y en memoria), sin
+abrir ningún dataset. `CATALOG` se construye una vez por proceso y solo se
+reconstruye cuando cambia el xlsx; cuando cambia el almacén (p. ej. la
+precarga de vecinos escribe un dataset) solo se releen los manifests
+modificados y se actualizan sus filas. Uso::
+
+    python -m core.catalog               # resumen
+    python -m core.catalog iris Titanic  # fila de algunos datasets
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import threading
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+from core.arrowio import to_arrow_table
+from core.dataset_store import STORE, DatasetStore
+from core.deps import import_pydataset
+from core.excel_cache import ROOT, ExcelCache
+from core.instrumentation import timed
+from core.memory_cache import DATASET_CACHE
+from core.shared_cache import cached
+
+DATA_FILE = Path(os.environ.get("PYDATASETS_CATALOG_FILE", ROOT / "data" / "pydataset_list_translated.xlsx"))
+COLUMNS = ["title", "title_es", "package", "in_pydataset", "translated",
+           "stored", "rows", "columns", "nbytes", "memory_bytes"]
+_RENAMES = {"Item": "dataset_id", "Title": "title"}
+
+
+def normalize_pydataset_catalog(df: pd.DataFrame) -> pd.DataFrame:
+    """Catálogo de pydataset con `dataset_id`/`title` (versiones antiguas usan `Item`/`Title`)."""
+    renames = {old: new for old, new in _RENAMES.items() if old in df.columns and new not in df.columns}
+    return df.rename(columns=renames) if renames else df
+
+
+@cached("pydataset_catalog", memory=DATASET_CACHE)
+def pydataset_catalog() -> pd.DataFrame:
+    """Catálogo de pydataset normalizado (memoria del proceso + caché compartida entre réplicas).
+
+    Lanza ImportError si pydataset no está disponible. No debe modificarse in situ.
+    """
+    pyds = import_pydataset()
+    if not pyds.ok:
+        raise ImportError(f"pydataset no disponible: {pyds.error}")
+    return normalize_pydataset_catalog(pyds.data())
+
+
+def doc_packages() -> Dict[str, str]:
+    """{dataset_id: paquete de R} según la ruta de su documentación (`.../doc/<paquete>/<id>.html`)."""
+    from core.doc_index import pydataset_doc_paths
+
+    out = {}
+    for name, path in pydataset_doc_paths().items():
+        parent = Path(path).parent
+        if parent.parent.name == "doc":
+            out[str(name)] = parent.name
+    return out
+
+
+_STORED_COLUMNS = ["stored", "rows", "columns", "nbytes", "memory_bytes"]
+
+
+def manifest_columns(ids: pd.Index, manifest: Dict[str, dict]) -> pd.DataFrame:
+    """Columnas del almacén (`stored`, filas, columnas, bytes) de `ids` según su manifest."""
+    meta = ids.to_series(index=ids).map(manifest)
+    out = pd.DataFrame({"stored": meta.notna()}, index=ids)
+    for column, key in (("rows", "rows"), ("columns", "columns"), ("nbytes", "nbytes")):
+        out[column] = meta.map(lambda m: m.get(key) if isinstance(m, dict) else None).astype("Int64")
+    out["memory_bytes"] = meta.map(
+        lambda m: (m.get("memory") or {}).get("after") if isinstance(m, dict) else None).astype("Int64")
+    return out
+
+
+def join_catalogs(translated: Optional[pd.DataFrame], pydataset: Optional[pd.DataFrame],
+                  packages: Dict[str, str], manifest: Dict[str, dict]) -> pd.DataFrame:
+    """Tabla unida, una fila por `dataset_id` único (orden de pydataset y después los solo traducidos)."""
+    parts = []
+    if pydataset is not None:
+        parts.append(pd.DataFrame({"dataset_id": pydataset["dataset_id"].astype(str).to_numpy(),
+                                   "title": pydataset["title"].to_numpy(dtype=object), "in_pydataset": True})
+                     # pydataset repite ~30 ids (mismo dataset en dos paquetes); `data(id)` carga uno solo.
+                     .drop_duplicates("dataset_id"))
+    if translated is not None:
+        es = pd.DataFrame({"dataset_id": translated["dataset_id"].astype(str).to_numpy(),
+                           "title_tr": translated["title"].to_numpy(dtype=object),
+                           "title_es": translated["title_es"].to_numpy(dtype=object), "translated": True})
+        parts.append(es.drop_duplicates("dataset_id"))
+    if not parts:
+        return pd.DataFrame(columns=COLUMNS, index=pd.Index([], name="dataset_id"))
+    order = pd.Index(pd.concat([p["dataset_id"] for p in parts], ignore_index=True).unique(), name="dataset_id")
+    # El merge "outer" ordena las claves: se restaura el orden de pydataset seguido de los solo traducidos.
+    df = parts[0] if len(parts) == 1 else parts[0].merge(parts[1], on="dataset_id", how="outer")
+    if "title_tr" in df.columns:
+        df["title"] = df["title"].where(df["title"].notna(), df["title_tr"]) if "title" in df.columns else df["title_tr"]
+        df = df.drop(columns="title_tr")
+    for flag in ("in_pydataset", "translated"):
+        df[flag] = df[flag].eq(True) if flag in df.columns else False
+    df = df.set_index("dataset_id").reindex(order)
+    ids = df.index.to_series()
+    df["package"] = pd.Categorical(ids.map(packages), categories=sorted(set(packages.values())))
+    df[_STORED_COLUMNS] = manifest_columns(df.index, manifest)
+    for column in ("title", "title_es"):
+        if column not in df.columns:
+            df[column] = None
+        df[column] = df[column].astype(pd.StringDtype("pyarrow"))
+    return df[COLUMNS]
+
+
+class Catalog:
+    """Catálogo unido: `frame` (pandas, índice `dataset_id`) y `table` (Arrow, para widgets y consultas)."""
+
+    def __init__(self, frame: pd.DataFrame, errors: Optional[Dict[str, str]] = None):
+        self.frame = frame
+        self.errors = errors or {}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __contains__(self, dataset_id: str) -> bool:
+        return dataset_id in self.frame.index
+
+    @cached_property
+    def table(self) -> pa.Table:
+        return to_arrow_table(self.frame, preserve_index=True)
+
+    @property
+    def ids(self) -> List[str]:
+        return self.frame.index.tolist()
+
+    def get(self, dataset_id: str) -> Optional[dict]:
+        """Fila de `dataset_id` como dict (valores ausentes como None) o None si no está."""
+        try:
+            row = self.frame.loc[dataset_id]
+        except KeyError:
+            return None
+        return {k: (None if pd.isna(v) else v) for k, v in row.items()}
+
+    def summary(self) -> Dict[str, int]:
+        f = self.frame
+        return {"datasets": len(f), "pydataset": int(f["in_pydataset"].sum()),
+                "translated": int(f["translated"].sum()), "stored": int(f["stored"].sum()),
+                "stored_bytes": int(f["nbytes"].sum())}
+
+
+class CatalogService:
+    """Fuentes del catálogo y su unión, cargadas una vez por proceso (seguro entre hilos)."""
+
+    def __init__(self, data_file: str | Path | None = None, store: Optional[DatasetStore] = None,
+                 excel_cache_dir: str | Path | None = None):
+        self.data_file = Path(data_file) if data_file is not None else DATA_FILE
+        self.store = store if store is not None else STORE
+        self.excel = ExcelCache(self.data_file, excel_cache_dir)
+        self._lock = threading.RLock()
+        self._sheets: Dict[Tuple, pd.DataFrame] = {}
+        self._catalog: Optional[Catalog] = None
+        self._fingerprint = None
+        self._meta_mtimes: Dict[str, int] = {}
+
+    def _file_key(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.data_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def fingerprint(self) -> tuple:
+        """Cambia cuando se modifica el xlsx o se añade/reescribe un dataset del almacén."""
+        try:
+            store_mtime = self.store.root.stat().st_mtime_ns
+        except OSError:
+            store_mtime = None
+        return self._file_key(), store_mtime
+
+    # Fuentes ------------------------------------------------------------------
+
+    def has_translations(self) -> bool:
+        return self._file_key() is not None
+
+    def sheet_names(self) -> List[str]:
+        return self.excel.sheet_names()
+
+    def translated(self, sheet_name=None) -> pd.DataFrame:
+        """Hoja del catálogo traducido (la primera por defecto), compartida por todas las sesiones.
+
+        No debe modificarse in situ.
+        """
+        key = (self._file_key(), sheet_name)
+        with self._lock:
+            df = self._sheets.get(key)
+            if df is None:
+                df = self.excel.load(sheet_name=sheet_name if sheet_name is not None else 0)
+                self._sheets = {k: v for k, v in self._sheets.items() if k[0] == key[0]}
+                self._sheets[key] = df
+        return df
+
+    def pydataset(self) -> pd.DataFrame:
+        return pydataset_catalog()
+
+    # Catálogo unido -------------------------------------------------------------
+
+    @timed("catalog.build")
+    def build(self) -> Catalog:
+        self._meta_mtimes = self.store.meta_mtimes()
+        errors = {}
+        translated = pydataset = None
+        packages: Dict[str, str] = {}
+        if self.has_translations():
+            try:
+                translated = self.translated()
+            except Exception as e:
+                errors["translated"] = str(e)
+        try:
+            pydataset = self.pydataset()
+            packages = doc_packages()
+        except Exception as e:
+            errors["pydataset"] = str(e)
+        return Catalog(join_catalogs(translated, pydataset, packages, self.store.manifest()), errors)
+
+    @timed("catalog.refresh")
+    def _refresh_stored(self, catalog: Catalog) -> Catalog:
+        """`catalog` con las filas de los manifests añadidos, reescritos o borrados desde la última lectura."""
+        mtimes = self.store.meta_mtimes()
+        changed = [n for n, m in mtimes.items() if self._meta_mtimes.get(n) != m]
+        changed += [n for n in self._meta_mtimes if n not in mtimes]
+        self._meta_mtimes = mtimes
+        ids = catalog.frame.index.intersection(changed)
+        if ids.empty:
+            return catalog
+        manifest = {name: meta for name in ids if (meta := self.store.meta(name)) is not None}
+        frame = catalog.frame.copy()
+        frame.loc[ids, _STORED_COLUMNS] = manifest_columns(ids, manifest)
+        return Catalog(frame, catalog.errors)
+
+    def catalog(self, rebuild: bool = False) -> Catalog:
+        """Catálogo vigente; se construye la primera vez y cuando cambia el xlsx.
+
+        Si solo ha cambiado el almacén se actualizan las filas de los datasets cuyo manifest cambió.
+        """
+        fingerprint = self.fingerprint()
+        with self._lock:
+            if rebuild or self._catalog is None or self._fingerprint[0] != fingerprint[0]:
+                self._catalog = self.build()
+            elif self._fingerprint != fingerprint:
+                self._catalog = self._refresh_stored(self._catalog)
+            self._fingerprint = fingerprint
+            return self._catalog
+
+
+CATALOG = CatalogService()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Catálogo unificado de datasets")
+    parser.add_argument("names", nargs="*", help="datasets a mostrar (vacío = resumen)")
+    args = parser.parse_args(argv)
+    catalog = CATALOG.catalog()
+    for source, error in catalog.errors.items():
+        print(f"aviso: {source}: {error}")
+    if not args.names:
+        for key, value in catalog.summary().items():
+            print(f"{key}: {value}")
+        return
+    for name in args.names:
+        print(f"{name}: {catalog.get(name)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""Consultas sobre toda la colección de pydataset a la vez.
+
+Dos niveles:
+
+- Catálogo de esquema y estadísticas (`CollectionCatalog`): una fila por
+  dataset y una por columna (tipo, nulos, distintos, mín/máx/media), construido
+  a partir del almacén de datasets y de los perfiles precalculados, y persistido
+  en Arrow. Las preguntas sobre la colección ("datasets con alguna columna
+  numérica y más de 10k filas", "columnas que se llaman como `price`") son
+  filtros vectorizados sobre esas dos tablas: milisegundos, sin abrir ningún
+  dataset.
+- Escaneos (`Collection.scan`, `Collection.aggregate`): cuando hay que mirar los
+  datos, solo se abren los datasets que pasan el filtro del catálogo, solo con
+  las columnas necesarias y en paralelo (hilos sobre los ficheros Arrow
+  memory-mapped; `pyarrow.compute` libera el GIL).
+
+El catálogo se reconstruye solo cuando cambia el almacén o los perfiles. Uso::
+
+    python -m core.collection build            # (re)construir el catálogo desde el almacén
+    python -m core.collection build --warm     # almacenar y perfilar antes todo el catálogo de pydataset
+    python -m core.collection datasets --min-rows 10000 --kind numeric
+    python -m core.collection columns price
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from core.arrowio import read_ipc, write_ipc
+from core.excel_cache import CACHE_DIR
+from core.instrumentation import timed
+from core.locks import file_lock
+from core.text import fold
+
+COLLECTION_DIR = Path(os.environ.get("PYDATASETS_COLLECTION_DIR", CACHE_DIR / "collection"))
+KINDS = ("numeric", "categorical", "text", "bool", "datetime", "other")
+OPERATORS = {"==": pc.equal, "!=": pc.not_equal, "<": pc.less, "<=": pc.less_equal,
+             ">": pc.greater, ">=": pc.greater_equal}
+
+
+def arrow_kind(t: pa.DataType) -> str:
+    """Clase de una columna según su tipo Arrow (ver `KINDS`)."""
+    if pa.types.is_boolean(t):
+        return "bool"
+    if pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_decimal(t):
+        return "numeric"
+    if pa.types.is_dictionary(t):
+        return "categorical"
+    if pa.types.is_string(t) or pa.types.is_large_string(t):
+        return "text"
+    if pa.types.is_temporal(t):
+        return "datetime"
+    return "other"
+
+
+def _data_schema(path: Path) -> Tuple[pa.Schema, set]:
+    with pa.memory_map(str(path), "r") as source:
+        schema = pa.ipc.open_file(source).schema
+    pandas_meta = schema.pandas_metadata or {}
+    return schema, {c for c in pandas_meta.get("index_columns", []) if isinstance(c, str)}
+
+
+def describe_dataset(name: str, store, profiles) -> Tuple[dict, List[dict]]:
+    """Fila del dataset y filas de sus columnas para el catálogo (perfila el dataset si hace falta)."""
+    from core.profiling import profile_frame
+
+    schema, index_cols = _data_schema(store.path(name))
+    profile = profiles.get(name)
+    if profile is None:
+        profile = profile_frame(store.get(name), name=name)
+        try:
+            profiles.put(profile)
+        except OSError:
+            pass
+    by_name = {c.name: c for c in profile.columns}
+    meta = store.meta(name) or {}
+    columns = []
+    fields = [f for f in schema if f.name not in index_cols]
+    for position, field in enumerate(fields):
+        p = by_name.get(field.name)
+        stats = p.stats if p is not None else {}
+        columns.append({
+            "dataset": name, "column": field.name, "position": position,
+            "kind": arrow_kind(field.type), "dtype": str(field.type),
+            "count": p.count if p is not None else None,
+            "nulls": profile.n_rows - p.count if p is not None else None,
+            "nunique": p.nunique if p is not None else None,
+            "min": stats.get("min"), "max": stats.get("max"), "mean": stats.get("mean"),
+        })
+    dataset = {"dataset": name, "rows": profile.n_rows, "columns": len(fields),
+               "nbytes": meta.get("nbytes"), "memory_bytes": meta.get("memory", {}).get("after")}
+    for kind in KINDS:
+        dataset[f"{kind}_columns"] = sum(1 for c in columns if c["kind"] == kind)
+    return dataset, columns
+
+
+class CollectionCatalog:
+    """Tablas `datasets` (una fila por dataset) y `columns` (una por columna) con filtros vectorizados."""
+
+    def __init__(self, datasets: pd.DataFrame, columns: pd.DataFrame, errors: Optional[Dict[str, str]] = None):
+        self.datasets = datasets.reset_index(drop=True)
+        self.columns = columns.reset_index(drop=True)
+        self.errors = errors or {}
+        self._folded_datasets = self.datasets["dataset"].map(fold).to_numpy(dtype=object) \
+            if len(self.datasets) else np.empty(0, dtype=object)
+        self._folded_columns = self.columns["column"].map(fold).to_numpy(dtype=object) \
+            if len(self.columns) else np.empty(0, dtype=object)
+
+    def __len__(self) -> int:
+        return len(self.datasets)
+
+    @staticmethod
+    def _contains(folded: np.ndarray, text: str) -> np.ndarray:
+        needle = fold(text.strip())
+        if not needle:
+            return np.ones(len(folded), dtype=bool)
+        return np.fromiter((needle in s for s in folded), dtype=bool, count=len(folded))
+
+    @timed("collection.search_columns")
+    def search_columns(self, text: str = "", kinds: Sequence[str] = (), datasets: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Columnas cuyo nombre contiene `text` (sin distinguir mayúsculas ni acentos)."""
+        mask = self._contains(self._folded_columns, text)
+        if kinds:
+            mask &= self.columns["kind"].isin(list(kinds)).to_numpy()
+        if datasets is not None:
+            mask &= self.columns["dataset"].isin(list(datasets)).to_numpy()
+        return self.columns[mask]
+
+    @timed("collection.find_datasets")
+    def find_datasets(self, min_rows: Optional[int] = None, max_rows: Optional[int] = None,
+                      kinds: Sequence[str] = (), name: str = "", column: str = "",
+                      column_kinds: Sequence[str] = ()) -> pd.DataFrame:
+        """Datasets que cumplen todos los criterios.
+
+        - `kinds`: tienen al menos una columna de cada clase (p. ej. `["numeric"]`).
+        - `name`: su nombre contiene el texto.
+        - `column` / `column_kinds`: tienen alguna columna cuyo nombre contiene `column` (y es de esas clases).
+        """
+        ds = self.datasets
+        mask = np.ones(len(ds), dtype=bool)
+        rows = ds["rows"].to_numpy() if len(ds) else np.empty(0, dtype=np.int64)
+        if min_rows is not None:
+            mask &= rows >= min_rows
+        if max_rows is not None:
+            mask &= rows <= max_rows
+        for kind in kinds:
+            mask &= ds[f"{kind}_columns"].to_numpy() > 0
+        if name:
+            mask &= self._contains(self._folded_datasets, name)
+        if column or column_kinds:
+            matched = self.search_columns(column, kinds=column_kinds)["dataset"].unique()
+            mask &= ds["dataset"].isin(matched).to_numpy()
+        return ds[mask]
+
+    def save(self, root: Path, fingerprint: list) -> None:
+        root.mkdir(parents=True, exist_ok=True)
+        write_ipc(pa.Table.from_pandas(self.datasets, preserve_index=False), root / "datasets.arrow")
+        write_ipc(pa.Table.from_pandas(self.columns, preserve_index=False), root / "columns.arrow")
+        tmp = root / ".manifest.json.tmp"
+        tmp.write_text(json.dumps({"fingerprint": fingerprint, "errors": self.errors, "built_at": time.time()}),
+                       encoding="utf-8")
+        os.replace(tmp, root / "manifest.json")
+
+    @classmethod
+    def load(cls, root: Path) -> Tuple["CollectionCatalog", list]:
+        manifest = json.loads((root / "manifest.json").read_text(encoding="utf-8"))
+        catalog = cls(read_ipc(root / "datasets.arrow").to_pandas(), read_ipc(root / "columns.arrow").to_pandas(),
+                      manifest.get("errors"))
+        return catalog, manifest["fingerprint"]
+
+
+_COLUMN_FIELDS = ["dataset", "column", "position", "kind", "dtype", "count", "nulls", "nunique", "min", "max", "mean"]
+_DATASET_FIELDS = ["dataset", "rows", "columns", "nbytes", "memory_bytes"] + [f"{k}_columns" for k in KINDS]
+
+
+@lru_cache(maxsize=1024)
+def _mapped_table(path: str, mtime_ns: int) -> pa.Table:
+    # Tablas memory-mapped: mantenerlas abiertas cuesta casi nada y los escaneos repetidos no reabren ficheros.
+    return read_ipc(path)
+
+
+class Collection:
+    """Catálogo de esquema/estadísticas y escaneos paralelos sobre el almacén de datasets."""
+
+    def __init__(self, store=None, profiles=None, root: str | Path | None = None, workers: Optional[int] = None):
+        if store is None:
+            from core.dataset_store import STORE as store
+        if profiles is None:
+            from core.profiling import PROFILES as profiles
+        self.store = store
+        self.profiles = profiles
+        self.root = Path(root) if root is not None else COLLECTION_DIR
+        self.workers = workers or min(8, (os.cpu_count() or 1) + 2)
+        self._catalog: Optional[CollectionCatalog] = None
+        self._fingerprint: Optional[list] = None
+        self._lock = threading.Lock()
+
+    # Catálogo ---------------------------------------------------------------
+
+    def fingerprint(self) -> list:
+        """Cambia cuando se añade o reescribe un dataset o un perfil (mtime de los directorios)."""
+        out = []
+        for d in (self.store.root, self.profiles.root):
+            try:
+                out.append(d.stat().st_mtime_ns)
+            except OSError:
+                out.append(None)
+        return out
+
+    def stored_names(self) -> List[str]:
+        return sorted(self.store.manifest())
+
+    @timed("collection.build")
+    def build(self, names: Optional[Iterable[str]] = None) -> CollectionCatalog:
+        """Construir el catálogo de los datasets almacenados (en paralelo) y persistirlo."""
+        names = list(names) if names is not None else self.stored_names()
+        datasets, columns, errors = [], [], {}
+
+        def describe(name):
+            try:
+                return name, describe_dataset(name, self.store, self.profiles), None
+            except Exception as e:
+                return name, None, repr(e)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for name, described, error in pool.map(describe, names):
+                if error is not None:
+                    errors[name] = error
+                    continue
+                datasets.append(described[0])
+                columns.extend(described[1])
+        catalog = CollectionCatalog(pd.DataFrame(datasets, columns=_DATASET_FIELDS),
+                                    pd.DataFrame(columns, columns=_COLUMN_FIELDS), errors)
+        # Perfilar lo que faltaba cambia el directorio de perfiles: la huella es la de después de construir.
+        catalog.save(self.root, self.fingerprint())
+        return catalog
+
+    def catalog(self, rebuild: bool = False) -> CollectionCatalog:
+        """Catálogo vigente: memoria del proceso -> disco -> construcción (una sola vez entre procesos)."""
+        fingerprint = self.fingerprint()
+        with self._lock:
+            if not rebuild and self._catalog is not None and self._fingerprint == fingerprint:
+                return self._catalog
+        with file_lock(self.root / ".lock"):
+            catalog = None
+            if not rebuild:
+                try:
+                    catalog, stored = CollectionCatalog.load(self.root)
+                    if stored != fingerprint:
+                        catalog = None
+                except (OSError, ValueError, KeyError, pa.ArrowInvalid):
+                    catalog = None
+            if catalog is None:
+                catalog = self.build()
+                fingerprint = self.fingerprint()
+        with self._lock:
+            self._catalog, self._fingerprint = catalog, fingerprint
+        return catalog
+
+    # Escaneos ---------------------------------------------------------------
+
+    def table(self, name: str, columns: Optional[Sequence[str]] = None) -> pa.Table:
+        """Tabla memory-mapped de un dataset almacenado, proyectada a `columns`."""
+        path = self.store.path(name)
+        table = _mapped_table(str(path), path.stat().st_mtime_ns)
+        return table.select(list(columns)) if columns is not None else table
+
+    @timed("collection.scan")
+    def scan(self, fn: Callable[[str, pa.Table], Any], names: Iterable[str],
+             columns: Optional[Sequence[str]] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Aplicar `fn(nombre, tabla)` a cada dataset de `names` en paralelo.
+
+        Devuelve `({nombre: resultado}, {nombre: error})`; un dataset que falla no detiene el resto.
+        """
+        def run(name):
+            try:
+                return name, fn(name, self.table(name, columns)), None
+            except Exception as e:
+                return name, None, repr(e)
+
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for name, value, error in pool.map(run, list(names)):
+                if error is None:
+                    results[name] = value
+                else:
+                    errors[name] = error
+        return results, errors
+
+    def aggregate(self, column: str, names: Optional[Iterable[str]] = None,
+                  where: Optional[Tuple[str, str, Any]] = None) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        """count/mín/máx/media/suma de la columna numérica `column` en cada dataset que la tiene.
+
+        `where=(columna, operador, valor)` filtra antes las filas (operadores de `OPERATORS`); solo se
+        consideran los datasets que tienen ambas columnas. El catálogo decide qué datasets se abren.
+        Devuelve `(tabla, {nombre: error})`: p. ej. un `valor` de texto contra una columna numérica
+        falla en esos datasets sin detener el resto.
+        """
+        catalog = self.catalog()
+        targets = set(catalog.columns.loc[(catalog.columns["column"] == column)
+                                          & (catalog.columns["kind"] == "numeric"), "dataset"])
+        needed = [column]
+        if where is not None:
+            where_column, op, value = where
+            if op not in OPERATORS:
+                raise ValueError(f"Operador no soportado: {op}")
+            targets &= set(catalog.columns.loc[catalog.columns["column"] == where_column, "dataset"])
+            if where_column != column:
+                needed.append(where_column)
+        if names is not None:
+            targets &= set(names)
+
+        def agg(name: str, table: pa.Table) -> dict:
+            values = table.column(column)
+            if where is not None:
+                cond = table.column(where[0])
+                if pa.types.is_dictionary(cond.type):
+                    cond = pc.cast(cond, cond.type.value_type)
+                mask = OPERATORS[where[1]](cond, pa.scalar(where[2]))
+                values = values.filter(pc.fill_null(mask, False))
+            min_max = pc.min_max(values)
+            return {"dataset": name, "rows": len(values), "count": pc.count(values).as_py(),
+                    "min": min_max["min"].as_py(), "max": min_max["max"].as_py(),
+                    "mean": pc.mean(values).as_py(), "sum": pc.sum(values).as_py()}
+
+        results, errors = self.scan(agg, sorted(targets), columns=needed)
+        return pd.DataFrame([results[n] for n in sorted(results)],
+                            columns=["dataset", "rows", "count", "min", "max", "mean", "sum"]), errors
+
+
+COLLECTION = Collection()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Consultas sobre toda la colección de pydataset")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    build = sub.add_parser("build", help="(re)construir el catálogo de esquema y estadísticas")
+    build.add_argument("--warm", action="store_true", help="almacenar y perfilar antes todo el catálogo de pydataset")
+    build.add_argument("--workers", type=int, default=None, help="procesos de la precarga")
+    ds = sub.add_parser("datasets", help="datasets que cumplen los criterios")
+    ds.add_argument("--min-rows", type=int, default=None)
+    ds.add_argument("--max-rows", type=int, default=None)
+    ds.add_argument("--kind", action="append", default=[], choices=KINDS, help="tiene alguna columna de esta clase")
+    ds.add_argument("--column", default="", help="tiene una columna cuyo nombre contiene este texto")
+    cols = sub.add_parser("columns", help="buscar columnas por nombre en toda la colección")
+    cols.add_argument("text")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "build":
+        if args.warm:
+            from core import warmup
+            from core.dataset_store import pydataset_ids
+
+            warmup.run(pydataset_ids(), workers=args.workers)
+        t = time.perf_counter()
+        catalog = COLLECTION.catalog(rebuild=True)
+        print(f"Catálogo: {len(catalog)} datasets, {len(catalog.columns)} columnas "
+              f"({len(catalog.errors)} errores) en {time.perf_counter() - t:.1f}s -> {COLLECTION.root}")
+        return
+    catalog = COLLECTION.catalog()
+    t = time.perf_counter()
+    if args.cmd == "datasets":
+        out = catalog.find_datasets(args.min_rows, args.max_rows, kinds=args.kind, column=args.column)
+        shown = out[["dataset", "rows", "columns"] + [f"{k}_columns" for k in KINDS[:3]]]
+    else:
+        out = catalog.search_columns(args.text)
+        shown = out[["dataset", "column", "kind", "dtype", "nunique"]]
+    elapsed = (time.perf_counter() - t) * 1e3
+    print(shown.to_string(index=False))
+    print(f"{len(out)} resultados en {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Almacén local persistente de los datasets de pydataset.
+
+Cada dataset se guarda una vez como fichero Arrow IPC tipado (`<name>.arrow`),
+con los tipos ya compactados (ver `core.dtypes`), junto a un manifest de
+esquema y memoria (`<name>.json`). Las lecturas posteriores usan
+memory-map, así que varios procesos/workers de Streamlit comparten las mismas
+páginas del sistema operativo y nadie vuelve a parsear los CSV de pydataset.
+La primera carga de un dataset es single-flight: si varios procesos lo piden a
+la vez, solo uno lo lee de pydataset y los demás esperan al fichero.
+El manifest lleva `version` (`FORMAT_VERSION`): una entrada de otra versión
+(p. ej. anterior a la compactación de tipos) cuenta como ausente y se vuelve
+a almacenar desde pydataset en la siguiente carga.
+
+Uso desde la línea de comandos::
+
+    python -m core.dataset_store warm            # todos los datasets del catálogo
+    python -m core.dataset_store warm iris cats  # solo algunos
+    python -m core.dataset_store info
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from core.arrowio import read_ipc, table_to_frame, to_arrow_table, write_ipc
+from core.dtypes import compact_frame
+from core.excel_cache import CACHE_DIR
+from core.locks import file_lock
+
+STORE_DIR = Path(os.environ.get("PYDATASETS_STORE_DIR", CACHE_DIR / "datasets"))
+BATCH_ROWS = 65_536
+# Súbelo cuando cambie lo que se escribe (tipos, esquema o campos del manifest). 2: tipos compactos.
+FORMAT_VERSION = 2
+
+
+def load_from_pydataset(name: str) -> pd.DataFrame:
+    """Cargar `name` directamente desde pydataset (parsea su CSV).
+
+    Lanza ImportError si pydataset no está disponible y KeyError si el dataset no existe.
+    """
+    try:
+        from pydataset import data
+    except Exception as e:
+        raise ImportError(f"pydataset no disponible: {e}")
+    try:
+        df = data(name)
+    except Exception as e:
+        raise KeyError(name) from e
+    if not isinstance(df, pd.DataFrame):
+        # pydataset imprime sugerencias y devuelve None para nombres desconocidos.
+        raise KeyError(name)
+    return df
+
+
+def pydataset_ids() -> List[str]:
+    """Identificadores de todos los datasets del catálogo de pydataset."""
+    from pydataset import data
+
+    return [str(x) for x in data()["dataset_id"].tolist()]
+
+
+class DatasetStore:
+    """Datasets persistidos como Arrow IPC con manifest de esquema por dataset."""
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root is not None else STORE_DIR
+
+    def _paths(self, name: str):
+        if not name or "/" in name or "\\" in name or name.startswith("."):
+            raise KeyError(name)
+        return self.root / f"{name}.arrow", self.root / f"{name}.json"
+
+    def path(self, name: str) -> Path:
+        """Ruta del fichero Arrow del dataset (exista o no)."""
+        return self._paths(name)[0]
+
+    def __contains__(self, name: str) -> bool:
+        try:
+            data_path = self._paths(name)[0]
+        except KeyError:
+            return False
+        return data_path.exists() and self.meta(name) is not None
+
+    def meta(self, name: str) -> Optional[dict]:
+        """Manifest de esquema del dataset o None si no está almacenado (o es de otra versión)."""
+        try:
+            meta = json.loads(self._paths(name)[1].read_text(encoding="utf-8"))
+        except (OSError, ValueError, KeyError):
+            return None
+        return meta if meta.get("version") == FORMAT_VERSION else None
+
+    def manifest(self) -> Dict[str, dict]:
+        """Manifest de todos los datasets almacenados en la versión actual, por nombre."""
+        out = {}
+        for meta_path in sorted(self.root.glob("*.json")):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            if meta.get("version") == FORMAT_VERSION:
+                out[meta["name"]] = meta
+        return out
+
+    def meta_mtimes(self) -> Dict[str, int]:
+        """{nombre: mtime_ns de su manifest} sin leer ningún JSON (para refrescos incrementales)."""
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            return {}
+        out = {}
+        for entry in entries:
+            if entry.name.endswith(".json") and not entry.name.startswith("."):
+                try:
+                    out[entry.name[:-len(".json")]] = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return out
+
+    def put(self, name: str, df: pd.DataFrame) -> dict:
+        """Persistir `df` (con tipos compactos) y devolver su manifest."""
+        return self._store(name, df)[0]
+
+    def _store(self, name: str, df: pd.DataFrame):
+        data_path, meta_path = self._paths(name)
+        df, memory = compact_frame(df)
+        table = to_arrow_table(df, preserve_index=True)
+        write_ipc(table, data_path, max_chunksize=BATCH_ROWS)
+        meta = {
+            "version": FORMAT_VERSION,
+            "name": name,
+            "file": data_path.name,
+            "rows": int(len(df)),
+            "columns": int(df.shape[1]),
+            "schema": [{"name": f.name, "type": str(f.type)} for f in table.schema
+                       if f.name in set(map(str, df.columns))],
+            "nbytes": int(table.nbytes),
+            "memory": {"before": memory["bytes_before"], "after": memory["bytes_after"]},
+            "stored_at": time.time(),
+        }
+        fd, tmp = tempfile.mkstemp(prefix=f".{meta_path.name}.", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(meta, fh, ensure_ascii=False)
+        os.replace(tmp, meta_path)
+        return meta, df
+
+    def _load_once(self, name: str) -> Optional[pd.DataFrame]:
+        """Persistir `name` desde pydataset si falta, con un único cargador entre procesos.
+
+        Devuelve el DataFrame si lo cargó este proceso y None si ya estaba almacenado.
+        """
+        with file_lock(self.root / ".locks" / f"{name}.lock"):
+            if name in self:  # otro proceso lo persistió mientras esperábamos
+                return None
+            return self._store(name, load_from_pydataset(name))[1]
+
+    def get_table(self, name: str) -> pa.Table:
+        """Tabla Arrow memory-mapped del dataset (cero copias); lo persiste si falta."""
+        self._paths(name)
+        if name not in self:
+            self._load_once(name)
+        return read_ipc(self._paths(name)[0])
+
+    def get(self, name: str) -> pd.DataFrame:
+        """DataFrame del dataset, leyendo del almacén o persistiéndolo desde pydataset."""
+        self._paths(name)
+        if name not in self:
+            df = self._load_once(name)
+            if df is not None:
+                return df
+        return table_to_frame(read_ipc(self._paths(name)[0]))
+
+    def invalidate(self, name: str) -> None:
+        for p in self._paths(name):
+            p.unlink(missing_ok=True)
+
+    def warm(self, names: Iterable[str], force: bool = False, progress=print) -> Dict[str, str]:
+        """Persistir en bloque `names`. Devuelve {nombre: error} de los que fallaron."""
+        names = list(names)
+        failures = {}
+        for i, name in enumerate(names, 1):
+            if not force and name in self:
+                continue
+            try:
+                self.put(name, load_from_pydataset(name))
+            except Exception as e:
+                failures[name] = repr(e)
+            if progress and (i % 50 == 0 or i == len(names)):
+                progress(f"[{i}/{len(names)}] almacenados en {self.root}")
+        return failures
+
+
+STORE = DatasetStore()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Almacén local de datasets de pydataset")
+    parser.add_argument("--store", type=Path, default=None, help=f"directorio del almacén (por defecto {STORE_DIR})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    warm = sub.add_parser("warm", help="poblar el almacén")
+    warm.add_argument("names", nargs="*", help="datasets a persistir (por defecto, todo el catálogo)")
+    warm.add_argument("--force", action="store_true", help="reescribir aunque ya existan")
+    sub.add_parser("info", help="resumen del contenido del almacén")
+    args = parser.parse_args(argv)
+
+    store = DatasetStore(args.store)
+    if args.cmd == "warm":
+        failures = store.warm(args.names or pydataset_ids(), force=args.force)
+        for name, err in failures.items():
+            print(f"ERROR {name}: {err}")
+        print(f"Listo: {len(store.manifest())} datasets en {store.root} ({len(failures)} errores)")
+    else:
+        manifest = store.manifest()
+        total = sum(m["nbytes"] for m in manifest.values())
+        print(f"{len(manifest)} datasets, {total / 1e6:.1f} MB en {store.root}")
+        measured = [m["memory"] for m in manifest.values() if "memory" in m]
+        if measured:
+            before = sum(m["before"] for m in measured)
+            after = sum(m["after"] for m in measured)
+            print(f"Memoria en pandas: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB con tipos compactos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Comprobación e importación diferida de dependencias opcionales.
+
+Importar `pydataset` carga su índice de datasets (lee un CSV y recorre el
+paquete), así que las páginas no deben hacerlo solo para saber si está
+instalado. `pydataset_status` lo averigua con `importlib.util.find_spec` y los
+metadatos del paquete, sin ejecutarlo; `import_pydataset` hace la importación
+real la primera vez que se necesitan los datos y la memoriza para el resto
+del proceso (también el error, para no reintentar en cada rerun).
+"""
+from __future__ import annotations
+
+import importlib.util
+from functools import lru_cache
+from importlib import metadata
+from typing import Callable, NamedTuple, Optional, Tuple
+
+
+class Pydataset(NamedTuple):
+    ok: bool
+    data: Optional[Callable] = None
+    data_info: Optional[Callable] = None
+    error: Optional[str] = None
+
+
+@lru_cache(maxsize=None)
+def module_available(name: str) -> bool:
+    """True si `name` se puede importar (sin importarlo)."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=1)
+def pydataset_status() -> Tuple[bool, str]:
+    """`(disponible, versión o motivo)` sin importar pydataset ni cargar su catálogo."""
+    if not module_available("pydataset"):
+        return False, "No module named 'pydataset'"
+    try:
+        return True, metadata.version("pydataset")
+    except metadata.PackageNotFoundError:
+        return True, "desconocida"
+
+
+@lru_cache(maxsize=1)
+def import_pydataset() -> Pydataset:
+    """`data` y `data_info` de pydataset, importados una sola vez por proceso."""
+    try:
+        from pydataset import data
+    except Exception as e:
+        return Pydataset(False, error=repr(e))
+    try:
+        from pydataset import data_info
+    except Exception:
+        data_info = None
+    return Pydataset(True, data, data_info)
@@ -0,0 +1,173 @@
+"""Índice de la documentación de pydataset en SQLite (búsqueda O(1) por id y texto completo).
+
+`data(name, show_doc=True)` convierte el HTML de la documentación e imprime el
+resultado, así que obtenerlo exige capturar stdout en cada consulta. Aquí se
+extraen todos los textos una sola vez (con la misma conversión que pydataset)
+a una tabla SQLite con clave primaria, más una tabla FTS5 para buscar por
+contenido. Uso::
+
+    python -m core.doc_index build
+    python -m core.doc_index search "air pollution"
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.excel_cache import CACHE_DIR
+from core.locks import file_lock
+from core.text import fold
+
+INDEX_PATH = Path(os.environ.get("PYDATASETS_DOC_INDEX", CACHE_DIR / "docs.sqlite"))
+_TOKEN_RE = re.compile(r"\w+")
+_NOTE = "PyDataset Documentation (adopted from R Documentation. The displayed examples are in R)"
+
+
+def pydataset_doc_paths() -> Dict[str, str]:
+    """{dataset_id: ruta del HTML de documentación} según pydataset."""
+    try:
+        from pydataset.locate_datasets import docs
+    except Exception as e:
+        raise ImportError(f"pydataset no disponible: {e}")
+    return dict(docs)
+
+
+def render_doc(html_path: str) -> str:
+    """Texto de la documentación tal como lo imprime `data(name, show_doc=True)`."""
+    from pydataset.utils import html2text
+
+    with open(html_path, "r") as fh:
+        html = fh.read()
+    h = html2text.HTML2Text()
+    h.ignore_links = True
+    h.ignore_images = True
+    txt = h.handle(html).replace("R Documentation", _NOTE)
+    return txt + "\n"  # `print` añade el salto de línea final
+
+
+def _fts_query(query: str) -> str:
+    # Cada palabra entre comillas (sin sintaxis FTS del usuario); la última como prefijo.
+    tokens = _TOKEN_RE.findall(fold(query))
+    if not tokens:
+        return ""
+    parts = [f'"{t}"' for t in tokens]
+    parts[-1] += "*"
+    return " ".join(parts)
+
+
+class DocIndex:
+    """Textos de documentación en SQLite con búsqueda por id y por contenido."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path is not None else INDEX_PATH
+        self._local = threading.local()
+
+    def _conn(self) -> Optional[sqlite3.Connection]:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not self.path.exists():
+                return None
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self._local.conn = conn
+        return conn
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def build(self, docs: Optional[Dict[str, str]] = None) -> int:
+        """(Re)construir el índice desde `docs` ({id: ruta html}); por defecto, los de pydataset."""
+        if docs is None:
+            docs = pydataset_doc_paths()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(tmp)
+            with conn:
+                conn.execute("CREATE TABLE docs (name TEXT PRIMARY KEY, text TEXT NOT NULL)")
+                conn.execute("CREATE VIRTUAL TABLE docs_fts USING fts5(name UNINDEXED, text, "
+                             "content='docs', tokenize='unicode61 remove_diacritics 2')")
+                rows = []
+                for name, path in sorted(docs.items()):
+                    try:
+                        rows.append((name, render_doc(path)))
+                    except Exception:
+                        continue
+                conn.executemany("INSERT INTO docs (name, text) VALUES (?, ?)", rows)
+                conn.execute("INSERT INTO docs_fts (rowid, name, text) SELECT rowid, name, text FROM docs")
+            conn.close()
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._local = threading.local()  # reabrir sobre el fichero nuevo
+        return len(rows)
+
+    def ensure(self) -> "DocIndex":
+        if not self.exists():
+            # Single-flight: si varios procesos arrancan en frío, solo uno construye el índice.
+            with file_lock(self.path.with_name(f".{self.path.name}.lock")):
+                if not self.exists():
+                    self.build()
+        return self
+
+    def get(self, name: str) -> Optional[str]:
+        conn = self._conn()
+        if conn is None:
+            return None
+        row = conn.execute("SELECT text FROM docs WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def texts(self, names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """{dataset_id: texto} de todos los documentos (o solo de `names`)."""
+        conn = self._conn()
+        if conn is None:
+            return {}
+        docs = dict(conn.execute("SELECT name, text FROM docs"))
+        if names is not None:
+            docs = {n: docs[n] for n in names if n in docs}
+        return docs
+
+    def names(self) -> List[str]:
+        conn = self._conn()
+        return [r[0] for r in conn.execute("SELECT name FROM docs ORDER BY name")] if conn else []
+
+    def search(self, query: str, limit: int = 50) -> List[Tuple[str, str]]:
+        """[(dataset_id, fragmento)] que mencionan `query`, ordenados por relevancia (BM25)."""
+        conn = self._conn()
+        match = _fts_query(query)
+        if conn is None or not match:
+            return []
+        sql = ("SELECT name, snippet(docs_fts, 1, '**', '**', ' … ', 12) FROM docs_fts "
+               "WHERE docs_fts MATCH ? ORDER BY bm25(docs_fts) LIMIT ?")
+        return [(r[0], r[1]) for r in conn.execute(sql, (match, limit))]
+
+
+DOC_INDEX = DocIndex()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Índice de documentación de pydataset")
+    parser.add_argument("--path", type=Path, default=None, help=f"fichero SQLite (por defecto {INDEX_PATH})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("build", help="construir el índice")
+    search = sub.add_parser("search", help="buscar en el contenido")
+    search.add_argument("query")
+    args = parser.parse_args(argv)
+
+    index = DocIndex(args.path)
+    if args.cmd == "build":
+        print(f"{index.build()} documentos indexados en {index.path}")
+    else:
+        for name, snippet in index.ensure().search(args.query):
+            print(f"{name}: {snippet}")
+
+
+if __name__ == "__main__":
+    main()
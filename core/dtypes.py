@@ -0,0 +1,86 @@
+"""Normalización compacta de tipos para los datasets cargados.
+
+`pydataset.data` devuelve siempre int64/float64/object. Antes de persistir un
+dataset en el almacén (y, por tanto, antes de que lo sirva la caché en
+memoria) sus columnas se compactan sin perder información:
+
+- Enteros: al entero con signo más pequeño que admite su rango.
+- Flotantes: a float32 solo si todos los valores se representan exactamente.
+- Texto: `category` si la columna tiene pocos valores distintos (como mucho
+  `CATEGORY_MAX_FRACTION` de las filas con valor) y, si no, cadenas respaldadas
+  por Arrow (`string[pyarrow]`). Las columnas object con tipos mezclados no se
+  tocan.
+
+`compact_frame` devuelve también un informe con la memoria antes y después y
+los cambios por columna. Uso::
+
+    python -m core.dtypes iris cats     # informe de memoria de algunos datasets
+"""
+from __future__ import annotations
+
+import argparse
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+CATEGORY_MAX_FRACTION = 0.5
+ARROW_STRING = pd.StringDtype("pyarrow")
+
+
+def _nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def _compact_column(s: pd.Series) -> pd.Series:
+    kind = s.dtype.kind
+    if kind in "iu" and s.dtype.itemsize > 1:
+        return pd.to_numeric(s, downcast="integer" if kind == "i" else "unsigned")
+    if kind == "f" and s.dtype.itemsize > 4:
+        values = s.to_numpy()
+        with np.errstate(over="ignore", invalid="ignore"):
+            small = values.astype(np.float32)
+        if np.array_equal(small.astype(values.dtype), values, equal_nan=True):
+            return pd.Series(small, index=s.index, name=s.name)
+        return s
+    if s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) == "string":
+        if s.nunique(dropna=True) <= CATEGORY_MAX_FRACTION * s.count():
+            return s.astype("category")
+        return s.astype(ARROW_STRING)
+    return s
+
+
+def compact_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, dict]:
+    """`df` con tipos compactos (sin modificar el original) e informe de memoria.
+
+    El informe es `{"bytes_before", "bytes_after", "columns": {columna: "int64 -> int8", ...}}`.
+    """
+    out = df.copy(deep=False)
+    changes: Dict[str, str] = {}
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        new = _compact_column(col)
+        if new is not col and new.dtype != col.dtype:
+            out.isetitem(i, new)
+            changes[str(df.columns[i])] = f"{col.dtype} -> {new.dtype}"
+    before = _nbytes(df)
+    report = {"bytes_before": before, "bytes_after": _nbytes(out) if changes else before, "columns": changes}
+    return out, report
+
+
+def main(argv=None) -> None:
+    from core.dataset_store import load_from_pydataset
+
+    parser = argparse.ArgumentParser(description="Informe de memoria de la normalización de tipos")
+    parser.add_argument("names", nargs="+", help="datasets de pydataset")
+    args = parser.parse_args(argv)
+    for name in args.names:
+        _, report = compact_frame(load_from_pydataset(name))
+        before, after = report["bytes_before"], report["bytes_after"]
+        print(f"{name}: {before / 1e3:.1f} kB -> {after / 1e3:.1f} kB ({after / max(before, 1):.0%})")
+        for column, change in report["columns"].items():
+            print(f"  {column}: {change}")
+
+
+if __name__ == "__main__":
+    main()
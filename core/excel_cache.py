@@ -0,0 +1,197 @@
+"""Caché columnar en disco del Excel del catálogo traducido.
+
+La primera carga convierte cada hoja del xlsx a un fichero Arrow IPC; las
+siguientes (en este u otro proceso) lo leen mediante memory-map sin pasar por
+openpyxl. La caché se valida con el mtime/tamaño del xlsx y, si estos cambian,
+con su hash SHA-256: solo se vuelve a parsear el Excel cuando su contenido
+cambia de verdad. La conversión se hace bajo un lock de fichero, así que
+varios procesos que arrancan a la vez parsean el xlsx una sola vez.
+
+El xlsx se parsea con `read_workbook`: una sola pasada en streaming de openpyxl
+(`read_only`/`values_only`) que convierte todas las hojas a tablas Arrow, en
+vez de un `pd.read_excel` que reabre el libro por cada hoja. Lo usan también
+los ficheros subidos, identificados por `upload_digest`.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Union
+
+import pyarrow as pa
+
+from core.arrowio import read_ipc, write_ipc
+from core.instrumentation import timed
+from core.locks import file_lock
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = Path(os.environ.get("PYDATASETS_CACHE_DIR", ROOT / ".cache"))
+MANIFEST = "manifest.json"
+
+
+def file_sha256(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def upload_digest(data: bytes) -> str:
+    """Huella del contenido de un fichero subido (se calcula una vez por subida)."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _cell(value):
+    # Igual que el lector openpyxl de pandas: los números enteros guardados como float pasan a int.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _column_names(header) -> List[str]:
+    """Cabeceras como las de `pd.read_excel`: "Unnamed: i" para las vacías y ".1", ".2"... para repetidas."""
+    names, seen = [], {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else str(_cell(value))
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+        seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _column_array(values) -> pa.Array:
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Tipos mezclados (p. ej. números y texto): la columna se guarda como texto.
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def _sheet_table(rows) -> pa.Table:
+    rows = list(rows)
+    while rows and all(v is None for v in rows[-1]):
+        rows.pop()
+    if not rows:
+        return pa.table({})
+    width = max(len(r) for r in rows)
+    while width and all(len(r) < width or r[width - 1] is None for r in rows):
+        width -= 1
+    header = (tuple(rows[0]) + (None,) * width)[:width]
+    body = [(tuple(r) + (None,) * width)[:width] for r in rows[1:]]
+    columns = list(zip(*body)) if body else [()] * width
+    arrays = [_column_array([_cell(v) for v in col]) for col in columns]
+    return pa.Table.from_arrays(arrays, names=_column_names(header))
+
+
+@timed("excel.read_workbook")
+def read_workbook(source: Union[str, Path, bytes, BinaryIO]) -> Dict[str, pa.Table]:
+    """Todas las hojas de un xlsx como tablas Arrow, en una sola pasada de openpyxl.
+
+    La primera fila es la cabecera, como en `pd.read_excel(..., sheet_name=None)`.
+    """
+    from openpyxl import load_workbook
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        return {ws.title: _sheet_table(ws.iter_rows(values_only=True)) for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+
+class ExcelCache:
+    """Hojas de un xlsx convertidas a Arrow IPC bajo `cache_dir`."""
+
+    def __init__(self, path: str | Path, cache_dir: str | Path | None = None):
+        self.path = Path(path).resolve()
+        base = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+        self.dir = base / "excel" / hashlib.blake2b(str(self.path).encode("utf-8"), digest_size=8).hexdigest()
+        self.converted = False  # True si la última validación tuvo que parsear el xlsx
+
+    # Manifest ---------------------------------------------------------------
+
+    def _read_manifest(self) -> Optional[dict]:
+        try:
+            return json.loads((self.dir / MANIFEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, manifest: dict) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".manifest.", dir=self.dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.dir / MANIFEST)
+
+    @timed("excel.parse")
+    def _convert(self, sha: str, stat: os.stat_result) -> dict:
+        entries = []
+        for i, (name, table) in enumerate(read_workbook(self.path).items()):
+            fname = f"{sha[:16]}-{i}.arrow"
+            write_ipc(table, self.dir / fname)
+            entries.append({"name": str(name), "file": fname})
+        manifest = {"source": str(self.path), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                    "sha256": sha, "sheets": entries}
+        self._write_manifest(manifest)
+        for old in self.dir.glob("*.arrow"):
+            if not old.name.startswith(sha[:16]):
+                old.unlink(missing_ok=True)
+        self.converted = True
+        return manifest
+
+    def manifest(self) -> dict:
+        """Manifest válido para el xlsx actual, convirtiéndolo si hace falta."""
+        stat = self.path.stat()
+        self.converted = False
+        manifest = self._read_manifest()
+        if self._fresh(manifest, stat):
+            return manifest
+        with file_lock(self.dir / ".lock"):
+            manifest = self._read_manifest()  # otro proceso pudo convertirlo mientras esperábamos
+            if self._fresh(manifest, stat):
+                return manifest
+            return self._validate(manifest, stat)
+
+    @staticmethod
+    def _fresh(manifest: Optional[dict], stat: os.stat_result) -> bool:
+        return bool(manifest) and manifest.get("mtime_ns") == stat.st_mtime_ns and manifest.get("size") == stat.st_size
+
+    def _validate(self, manifest: Optional[dict], stat: os.stat_result) -> dict:
+        sha = file_sha256(self.path)
+        if manifest and manifest.get("sha256") == sha:
+            # Solo cambió el mtime (p. ej. un checkout): el contenido sigue siendo válido.
+            manifest.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            self._write_manifest(manifest)
+            return manifest
+        return self._convert(sha, stat)
+
+    # Lectura ----------------------------------------------------------------
+
+    def sheet_names(self) -> List[str]:
+        return [s["name"] for s in self.manifest()["sheets"]]
+
+    @timed("excel.load")
+    def load(self, sheet_name=None):
+        """Igual que `pd.read_excel(path, sheet_name=...)` pero leyendo la caché Arrow.
+
+        `sheet_name=None` devuelve un dict con todas las hojas, como pandas.
+        """
+        sheets = self.manifest()["sheets"]
+        if sheet_name is None:
+            return {s["name"]: read_ipc(self.dir / s["file"]).to_pandas() for s in sheets}
+        if isinstance(sheet_name, int):
+            entry = sheets[sheet_name]
+        else:
+            entry = next((s for s in sheets if s["name"] == str(sheet_name)), None)
+            if entry is None:
+                raise ValueError(f"Hoja no encontrada: {sheet_name}")
+        return read_ipc(self.dir / entry["file"]).to_pandas()
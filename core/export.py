@@ -0,0 +1,141 @@
+"""Exportación perezosa de DataFrames a CSV, Parquet o Feather.
+
+Los bytes solo se generan cuando el usuario pide una descarga; se producen
+bloque a bloque y se guardan en una caché LRU acotada, indexada por un hash del
+estado que identifica el contenido (dataset o catálogo + filtros + formato).
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional
+
+import pandas as pd
+
+from core.arrowio import to_arrow_table
+from core.instrumentation import count, span
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "feather": ("application/vnd.apache.arrow.file", ".feather"),
+}
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+def content_key(*parts) -> str:
+    """Hash estable del estado que determina el contenido exportado."""
+    raw = json.dumps(parts, default=str, ensure_ascii=False, sort_keys=True)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Destino de escritura que acumula bytes hasta que se vacía con `drain()`."""
+
+    def __init__(self):
+        self._parts = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+def iter_export(df: pd.DataFrame, fmt: str = "csv", chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Generar el fichero exportado en bloques de `chunk_rows` filas."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportación no soportado: {fmt}")
+    if fmt == "csv":
+        for start in range(0, max(len(df), 1), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            yield chunk.to_csv(index=False, header=(start == 0)).encode("utf-8")
+        return
+
+    table = to_arrow_table(df)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, table.schema)
+        write = writer.write_batch
+    else:
+        import pyarrow as pa
+
+        writer = pa.ipc.new_file(sink, table.schema)
+        write = writer.write_batch
+    for batch in table.to_batches(max_chunksize=chunk_rows):
+        write(batch)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+    writer.close()
+    yield sink.drain()
+
+
+class ExportCache:
+    """LRU de exportaciones con presupuesto en bytes, seguro entre hilos."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+
+EXPORT_CACHE = ExportCache()
+
+
+def export_bytes(make_df: Callable[[], pd.DataFrame], fmt: str, key: str,
+                 cache: ExportCache = EXPORT_CACHE) -> bytes:
+    """Bytes de la exportación identificada por `key`; `make_df` solo se llama si no está en caché."""
+    full_key = content_key(key, fmt)
+    data = cache.get(full_key)
+    if data is None:
+        count("export.cache.miss")
+        df = make_df()
+        with span(f"export.encode.{fmt}"):
+            data = b"".join(iter_export(df, fmt))
+        cache.put(full_key, data)
+    else:
+        count("export.cache.hit")
+    return data
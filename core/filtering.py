@@ -0,0 +1,41 @@
+"""Filtrado, ordenación y paginado del catálogo traducido.
+
+Funciones de conveniencia sobre `core.query.CatalogQueryEngine` para llamadas
+sueltas; la página mantiene un motor cacheado y reutiliza sus resultados.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from core.query import CatalogQueryEngine, QueryResult
+from core.search_index import SearchIndex
+
+
+def filter_positions(df: pd.DataFrame, search_q: str = "", index: Optional[SearchIndex] = None) -> np.ndarray:
+    """Posiciones de fila que cumplen la búsqueda.
+
+    Si se pasa un `index` precompilado se usa; si no, se construye uno al vuelo.
+    """
+    return CatalogQueryEngine(df, index=index)._filter(str(search_q or "").strip())
+
+
+def filter_sort(df: pd.DataFrame, search_q: str = "", sort_column: str | None = None,
+                sort_order: str = "asc", index: Optional[SearchIndex] = None) -> QueryResult:
+    """Resultado (filtrado + ordenado) de una consulta suelta; base de las dos funciones siguientes."""
+    return CatalogQueryEngine(df, index=index).query(search_q, sort_column, sort_order)
+
+
+def apply_filter_sort(df: pd.DataFrame, search_q: str = "", sort_column: str | None = None,
+                      sort_order: str = "asc", index: Optional[SearchIndex] = None) -> pd.DataFrame:
+    return filter_sort(df, search_q, sort_column, sort_order, index).frame
+
+
+def filter_sort_paginate(df: pd.DataFrame, search_q: str = "", sort_column: str | None = None,
+                         sort_order: str = "asc", page_size: int = 25, page: int = 1,
+                         index: Optional[SearchIndex] = None):
+    result = filter_sort(df, search_q, sort_column, sort_order, index)
+    page_df, start, end = result.page(page, page_size)
+    return page_df, result.total, start, end
@@ -0,0 +1,223 @@
+"""Medición de tiempos por etapa y contadores, con coste casi nulo si está desactivada.
+
+Las etapas se marcan con un context manager o un decorador::
+
+    with span("catalog.filter"):
+        ...
+
+    @timed("dataset.load")
+    def get_dataset(name): ...
+
+Se registra solo si la medición está activa: globalmente (variable de entorno
+`PYDATASETS_TIMINGS=1` o `set_enabled(True)`, útil para CLI y benchmarks) o
+para el rerun en curso (`begin_rerun()`, que usa el panel de depuración de las
+páginas). Desactivada, `span` devuelve un context manager nulo compartido y
+`count` solo comprueba un flag.
+
+Cada rerun guarda una traza (etapa, inicio, duración, profundidad) para pintar
+la cascada; además se acumulan totales por etapa en el proceso, exportables
+como JSON lines o en formato de texto de Prometheus.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+# Límites (segundos) de los buckets del histograma de Prometheus.
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_enabled = os.environ.get("PYDATASETS_TIMINGS", "").lower() in ("1", "true", "yes")
+_local = threading.local()
+_lock = threading.Lock()
+_totals: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0] + [0] * len(BUCKETS))  # n, suma, buckets
+_counters: Dict[str, int] = defaultdict(int)
+_collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+
+@dataclass
+class Span:
+    name: str
+    start: float  # segundos desde el inicio de la traza
+    duration: float
+    depth: int
+
+
+@dataclass
+class Trace:
+    label: str
+    t0: float = field(default_factory=time.perf_counter)
+    wall: float = field(default_factory=time.time)
+    spans: List[Span] = field(default_factory=list)
+    counters: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    depth: int = 0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def to_records(self) -> List[dict]:
+        base = {"trace": self.label, "ts": self.wall}
+        return [dict(base, **asdict(s)) for s in self.spans]
+
+
+def set_enabled(value: bool) -> None:
+    global _enabled
+    _enabled = bool(value)
+
+
+def is_enabled() -> bool:
+    return _enabled or getattr(_local, "trace", None) is not None
+
+
+def begin_rerun(label: str, enabled: bool = True) -> Optional[Trace]:
+    """Empezar la traza del rerun actual (hilo actual); con `enabled=False` se desactiva."""
+    _local.trace = Trace(label) if enabled else None
+    return _local.trace
+
+
+def current_trace() -> Optional[Trace]:
+    return getattr(_local, "trace", None)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("name", "trace", "t")
+
+    def __init__(self, name: str, trace: Optional[Trace]):
+        self.name = name
+        self.trace = trace
+
+    def __enter__(self):
+        if self.trace is not None:
+            self.trace.depth += 1
+        self.t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        t1 = time.perf_counter()
+        duration = t1 - self.t
+        trace = self.trace
+        if trace is not None:
+            trace.depth -= 1
+            trace.spans.append(Span(self.name, self.t - trace.t0, duration, trace.depth))
+        _observe(self.name, duration)
+        return False
+
+
+def span(name: str):
+    """Context manager que mide la etapa `name` (nulo si la medición está desactivada)."""
+    trace = getattr(_local, "trace", None)
+    if trace is None and not _enabled:
+        return _NULL
+    return _ActiveSpan(name, trace)
+
+
+def timed(name: str):
+    """Decorador equivalente a envolver la función en `span(name)`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            trace = getattr(_local, "trace", None)
+            if trace is None and not _enabled:
+                return fn(*args, **kwargs)
+            with _ActiveSpan(name, trace):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, n: int = 1) -> None:
+    """Incrementar un contador (p. ej. aciertos de caché)."""
+    trace = getattr(_local, "trace", None)
+    if trace is None and not _enabled:
+        return
+    if trace is not None:
+        trace.counters[name] += n
+    with _lock:
+        _counters[name] += n
+
+
+def _observe(name: str, duration: float) -> None:
+    with _lock:
+        entry = _totals[name]
+        entry[0] += 1
+        entry[1] += duration
+        for i, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                entry[2 + i] += 1
+
+
+def register_collector(name: str, fn: Callable[[], Dict[str, float]]) -> None:
+    """Añadir métricas externas (p. ej. estadísticas de una caché) a la exportación."""
+    _collectors[name] = fn
+
+
+def reset() -> None:
+    with _lock:
+        _totals.clear()
+        _counters.clear()
+
+
+def summary() -> Dict[str, dict]:
+    """{etapa: {"count", "total_s", "mean_s"}} acumulado en el proceso."""
+    with _lock:
+        return {k: {"count": v[0], "total_s": v[1], "mean_s": v[1] / v[0] if v[0] else 0.0}
+                for k, v in sorted(_totals.items())}
+
+
+def to_jsonl(trace: Optional[Trace] = None) -> str:
+    """Etapas de `trace` (por defecto, la del rerun actual) como JSON lines."""
+    trace = trace if trace is not None else current_trace()
+    if trace is None:
+        return ""
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in trace.to_records())
+
+
+def _metric_name(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+def prometheus_text() -> str:
+    """Totales del proceso en el formato de exposición de texto de Prometheus."""
+    lines = ["# TYPE pydatasets_stage_seconds histogram"]
+    with _lock:
+        totals = {k: list(v) for k, v in _totals.items()}
+        counters = dict(_counters)
+    for name, entry in sorted(totals.items()):
+        label = f'stage="{name}"'
+        for bound, n in zip(BUCKETS, entry[2:]):
+            lines.append(f'pydatasets_stage_seconds_bucket{{{label},le="{bound}"}} {n}')
+        lines.append(f'pydatasets_stage_seconds_bucket{{{label},le="+Inf"}} {entry[0]}')
+        lines.append(f"pydatasets_stage_seconds_sum{{{label}}} {entry[1]:.6f}")
+        lines.append(f"pydatasets_stage_seconds_count{{{label}}} {entry[0]}")
+    for name, value in sorted(counters.items()):
+        metric = f"pydatasets_{_metric_name(name)}_total"
+        lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+    for prefix, fn in sorted(_collectors.items()):
+        try:
+            values = fn()
+        except Exception:
+            continue
+        for key, value in sorted(values.items()):
+            metric = f"pydatasets_{_metric_name(prefix)}_{_metric_name(key)}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,188 @@
+"""Cachés en memoria acotadas por bytes, compartidas por todas las páginas.
+
+`st.cache_data` no tiene límite (ni `max_entries` ni TTL) y cada función
+mantiene su propia copia; en una instancia de larga duración la memoria crece
+sin control. Estas cachés viven a nivel de proceso (las comparten todas las
+sesiones y páginas), desalojan por LRU cuando se supera el presupuesto y
+exponen contadores de aciertos, fallos y desalojos.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+from core.instrumentation import count, register_collector, timed
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Tamaño residente de un DataFrame, incluyendo el contenido de columnas object."""
+    try:
+        return int(df.memory_usage(deep=True, index=True).sum())
+    except Exception:
+        return sys.getsizeof(df)
+
+
+def value_nbytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return frame_nbytes(value)
+    return sys.getsizeof(value)
+
+
+class ByteLRUCache:
+    """LRU con presupuesto en bytes y, opcionalmente, un nivel en disco para lo desalojado.
+
+    - `spill(key, value)` se llama al desalojar una entrada (p. ej. persistirla).
+    - `load_spilled(key)` se consulta en un fallo de memoria antes del `loader`;
+      devuelve None si la clave no está en el nivel de disco.
+    """
+
+    def __init__(self, name: str, max_bytes: int, size_of: Callable[[Any], int] = value_nbytes,
+                 spill: Optional[Callable[[Hashable, Any], None]] = None,
+                 load_spilled: Optional[Callable[[Hashable], Any]] = None):
+        self.name = name
+        self.max_bytes = max_bytes
+        self._size_of = size_of
+        self._spill = spill
+        self._load_spilled = load_spilled
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.spills = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._size_of(value)
+        evicted = []
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                # Más grande que todo el presupuesto: no se guarda en memoria.
+                evicted.append((key, value))
+            else:
+                self._entries[key] = (value, size)
+                self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                k, (v, s) = self._entries.popitem(last=False)
+                self._bytes -= s
+                self.evictions += 1
+                evicted.append((k, v))
+        if self._spill is not None:
+            for k, v in evicted:
+                try:
+                    self._spill(k, v)
+                    self.spills += 1
+                except Exception:
+                    pass
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            count(f"cache.{self.name}.hit")
+            return value
+        value = None
+        if self._load_spilled is not None:
+            value = self._load_spilled(key)
+        with self._lock:
+            if value is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+        count(f"cache.{self.name}.{'disk_hit' if value is not None else 'miss'}")
+        if value is None:
+            value = loader()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "spills": self.spills,
+            }
+
+
+def _mb_env(var: str, default_mb: int) -> int:
+    try:
+        return int(float(os.environ.get(var, default_mb)) * 1024 * 1024)
+    except ValueError:
+        return default_mb * 1024 * 1024
+
+
+def _make_dataset_cache() -> ByteLRUCache:
+    from core.dataset_store import STORE
+
+    # Solo las claves de dataset (str) van al almacén; `core.shared_cache.cached` usa tuplas.
+    def spill(name, df):
+        if isinstance(name, str) and name not in STORE:
+            STORE.put(name, df)
+
+    def load_spilled(name):
+        return STORE.get(name) if isinstance(name, str) and name in STORE else None
+
+    return ByteLRUCache("datasets", _mb_env("PYDATASETS_DATASET_CACHE_MB", 512),
+                        size_of=frame_nbytes, spill=spill, load_spilled=load_spilled)
+
+
+DATASET_CACHE = _make_dataset_cache()
+DOC_CACHE = ByteLRUCache("docs", _mb_env("PYDATASETS_DOC_CACHE_MB", 32))
+
+
+def _profile_nbytes(profile) -> int:
+    # Estimación: los perfiles son pequeños y casi todo su peso son las listas de valores.
+    return 512 + sum(256 + 64 * len(c.values) for c in profile.columns)
+
+
+PROFILE_CACHE = ByteLRUCache("profiles", _mb_env("PYDATASETS_PROFILE_CACHE_MB", 64), size_of=_profile_nbytes)
+
+
+for _cache in (DATASET_CACHE, DOC_CACHE, PROFILE_CACHE):
+    register_collector(f"cache_{_cache.name}", _cache.stats)
+
+
+@timed("dataset.load")
+def get_dataset(name: str) -> pd.DataFrame:
+    """Dataset de pydataset a través de la caché compartida (memoria -> almacén en disco -> pydataset).
+
+    El DataFrame devuelto se comparte entre sesiones: no debe modificarse in situ.
+    """
+    from core.dataset_store import STORE
+
+    return DATASET_CACHE.get_or_load(name, lambda: STORE.get(name))
@@ -0,0 +1,84 @@
+"""Fuente de datos paginada sobre los ficheros Arrow del almacén de datasets.
+
+En vez de mantener el DataFrame completo en la sesión y hacer `iloc[start:end]`,
+la vista previa pide solo la ventana visible (y solo las columnas elegidas).
+Los record batches se leen del fichero memory-mapped, así que el coste en
+memoria por sesión es O(página) y no O(dataset).
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from core.arrowio import select_columns, table_to_frame
+from core.instrumentation import timed
+
+
+class PagedSource:
+    """Acceso por ventanas a un fichero Arrow IPC, con proyección de columnas."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._source = pa.memory_map(str(self.path), "r")
+        self._reader = pa.ipc.open_file(self._source)
+        sizes = [self._reader.get_batch(i).num_rows for i in range(self._reader.num_record_batches)]
+        self._offsets = np.r_[0, np.cumsum(sizes, dtype=np.int64)]
+        self.schema = self._reader.schema
+        pandas_meta = self.schema.pandas_metadata or {}
+        self._index_cols = [c for c in pandas_meta.get("index_columns", []) if isinstance(c, str)]
+
+    @property
+    def num_rows(self) -> int:
+        return int(self._offsets[-1])
+
+    @property
+    def columns(self) -> List[str]:
+        return [n for n in self.schema.names if n not in self._index_cols]
+
+    @property
+    def shape(self):
+        return self.num_rows, len(self.columns)
+
+    @timed("preview.window")
+    def window_table(self, start: int, stop: int, columns: Optional[Sequence[str]] = None) -> pa.Table:
+        """Filas [start, stop) como tabla Arrow (solo se tocan los batches necesarios)."""
+        start = max(0, min(start, self.num_rows))
+        stop = max(start, min(stop, self.num_rows))
+        first = int(np.searchsorted(self._offsets, start, side="right")) - 1
+        batches = []
+        i = max(first, 0)
+        while i < self._reader.num_record_batches and self._offsets[i] < stop:
+            batch = self._reader.get_batch(i)
+            lo = max(start - int(self._offsets[i]), 0)
+            hi = min(stop - int(self._offsets[i]), batch.num_rows)
+            batches.append(batch.slice(lo, hi - lo))
+            i += 1
+        return select_columns(pa.Table.from_batches(batches, schema=self.schema), columns)
+
+    def window(self, start: int, stop: int, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Filas [start, stop) como DataFrame, con el índice original."""
+        return table_to_frame(self.window_table(start, stop, columns))
+
+    def page(self, page: int, page_size: int, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        start = (max(page, 1) - 1) * page_size
+        return self.window(start, start + page_size, columns)
+
+
+@lru_cache(maxsize=128)
+def _open(path: str, mtime_ns: int) -> PagedSource:
+    return PagedSource(path)
+
+
+def open_dataset(name: str, store=None) -> PagedSource:
+    """Fuente paginada de un dataset del almacén (lo persiste primero si falta)."""
+    if store is None:
+        from core.dataset_store import STORE as store
+    if name not in store:
+        store.get_table(name)
+    path = store.path(name)
+    return _open(str(path), path.stat().st_mtime_ns)
@@ -0,0 +1,292 @@
+"""Perfilado de datasets para la vista previa (dtypes, describe, value_counts).
+
+Todas las estadísticas de una columna salen de una sola pasada: las numéricas
+de un único `np.sort` (conteo, min/max, cuantiles, nunique y frecuencias) y las
+no numéricas de un único `value_counts`. Con eso se construyen tanto
+`describe(include=["number"])` como `describe(include="all")` sin repetir
+trabajo. Los perfiles son serializables a JSON para precalcularlos en lote; cada
+registro guarda `PROFILE_VERSION` y la versión del almacén de datasets de la que
+sale (`core.dataset_store.FORMAT_VERSION`), y uno de otra versión se recalcula::
+
+    python -m core.profiling precompute            # toda la colección
+    python -m core.profiling precompute iris cats
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import warnings
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.dataset_store import FORMAT_VERSION
+from core.excel_cache import CACHE_DIR
+from core.instrumentation import timed
+
+PROFILE_DIR = Path(os.environ.get("PYDATASETS_PROFILE_DIR", CACHE_DIR / "profiles"))
+# Súbelo cuando cambie `profile_frame` o el formato de `DatasetProfile`.
+PROFILE_VERSION = 1
+LOW_CARDINALITY = 50
+TOP_VALUES = 100
+CHUNK_COLUMNS = 64
+_QUANTILES = (0.25, 0.5, 0.75)
+_NUM_STATS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    dtype: str
+    numeric: bool
+    count: int
+    nunique: int  # incluye NaN como valor, igual que nunique(dropna=False)
+    stats: Dict[str, Optional[float]] = field(default_factory=dict)
+    top: Optional[str] = None
+    freq: Optional[int] = None
+    unique: Optional[int] = None  # sin NaN, como describe()
+    values: List[list] = field(default_factory=list)  # [[valor, conteo], ...] (máx. TOP_VALUES)
+
+    @property
+    def categorical(self) -> bool:
+        # object, category, bool...: todo lo que describe() no trata como número.
+        return not self.numeric
+
+
+@dataclass
+class DatasetProfile:
+    name: str
+    n_rows: int
+    n_cols: int
+    columns: List[ColumnProfile]
+
+    def dtypes(self) -> pd.DataFrame:
+        return pd.DataFrame({"column": [c.name for c in self.columns], "dtype": [c.dtype for c in self.columns]})
+
+    def describe_numeric(self) -> pd.DataFrame:
+        """Equivalente a `df.describe(include=["number"]).transpose()`."""
+        rows = {c.name: [c.stats.get(s) for s in _NUM_STATS] for c in self.columns if c.numeric}
+        return pd.DataFrame.from_dict(rows, orient="index", columns=_NUM_STATS, dtype=float)
+
+    @timed("profile.describe")
+    def describe_all(self) -> pd.DataFrame:
+        """Equivalente a `df.describe(include="all").transpose()`."""
+        if all(c.numeric for c in self.columns):
+            return self.describe_numeric()
+        cols = ["count", "unique", "top", "freq"] + _NUM_STATS[1:]
+        if not any(c.numeric for c in self.columns):
+            cols = cols[:4]
+        rows = {}
+        for c in self.columns:
+            if c.numeric:
+                row = {"count": c.count, **{s: c.stats.get(s) for s in _NUM_STATS[1:]}}
+            else:
+                row = {"count": c.count, "unique": c.unique, "top": c.top, "freq": c.freq}
+            rows[c.name] = [row.get(k, np.nan) for k in cols]
+        return pd.DataFrame.from_dict(rows, orient="index", columns=cols).astype(object)
+
+    def value_columns(self) -> List[str]:
+        """Columnas categóricas o de baja cardinalidad (las que tienen vista de valores)."""
+        return sorted(c.name for c in self.columns if c.categorical or c.nunique <= LOW_CARDINALITY)
+
+    @timed("profile.value_counts")
+    def value_counts(self, column: str) -> pd.DataFrame:
+        c = next(c for c in self.columns if c.name == column)
+        return pd.DataFrame(c.values, columns=[column, "count"])
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "DatasetProfile":
+        return cls(d["name"], d["n_rows"], d["n_cols"], [ColumnProfile(**c) for c in d["columns"]])
+
+
+def _py(v):
+    """Valor JSON-serializable (numpy -> Python, NaN -> None)."""
+    if v is None or v is pd.NA:
+        return None
+    if isinstance(v, (np.generic,)):
+        v = v.item()
+    if isinstance(v, float) and np.isnan(v):
+        return None
+    if isinstance(v, (int, float, str, bool)):
+        return v
+    return str(v)
+
+
+def _profile_numeric_block(block: pd.DataFrame, n_rows: int) -> List[ColumnProfile]:
+    arr = block.to_numpy(dtype=float, na_value=np.nan)
+    arr.sort(axis=0)  # una ordenación por columna (NaN al final)
+    counts = (~np.isnan(arr)).sum(axis=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        means = np.nanmean(arr, axis=0)
+        stds = np.nanstd(arr, axis=0, ddof=1)
+    out = []
+    for j, name in enumerate(block.columns):
+        k = int(counts[j])
+        s = arr[:k, j]
+        stats = {"count": float(k), "mean": _py(means[j]), "std": _py(stds[j]) if k > 1 else None}
+        if k:
+            stats["min"], stats["max"] = float(s[0]), float(s[-1])
+            # `s` ya está ordenado: cuantiles por interpolación lineal, como pandas.
+            pos = np.asarray(_QUANTILES) * (k - 1)
+            lo = np.floor(pos).astype(int)
+            hi = np.minimum(lo + 1, k - 1)
+            q = s[lo] + (s[hi] - s[lo]) * (pos - lo)
+            stats.update({"25%": float(q[0]), "50%": float(q[1]), "75%": float(q[2])})
+            bounds = np.flatnonzero(np.r_[True, s[1:] != s[:-1]])
+            uniq = s[bounds]
+            freqs = np.diff(np.r_[bounds, k])
+        else:
+            uniq = freqs = np.empty(0)
+        n_nan = n_rows - k
+        nunique = len(uniq) + (1 if n_nan else 0)
+        values = []
+        if nunique <= TOP_VALUES:
+            as_int = block[name].dtype.kind in "iu"
+            pairs = [(int(u) if as_int else _py(u), int(f)) for u, f in zip(uniq, freqs)]
+            if n_nan:
+                pairs.append((None, n_nan))
+            pairs.sort(key=lambda p: -p[1])
+            values = [list(p) for p in pairs]
+        out.append(ColumnProfile(name=str(name), dtype=str(block[name].dtype), numeric=True, count=k,
+                                 nunique=nunique, stats=stats, values=values))
+    return out
+
+
+def _profile_other(name, col: pd.Series) -> ColumnProfile:
+    vc = col.value_counts(dropna=False, sort=True)
+    non_null = vc[vc.index.notna()] if len(vc) else vc
+    top = freq = None
+    if len(non_null):
+        top, freq = _py(non_null.index[0]), int(non_null.iloc[0])
+    values = [[_py(v), int(n)] for v, n in vc.head(TOP_VALUES).items()]
+    return ColumnProfile(name=str(name), dtype=str(col.dtype), numeric=False, count=int(col.count()),
+                         nunique=int(len(vc)), top=top, freq=freq, unique=int(len(non_null)), values=values)
+
+
+@timed("profile.compute")
+def profile_frame(df: pd.DataFrame, name: str = "", chunk_columns: int = CHUNK_COLUMNS) -> DatasetProfile:
+    """Perfil completo de `df`. Las columnas numéricas se procesan en bloques de
+    `chunk_columns` para acotar la copia en float64 de frames anchos."""
+    numeric_cols = [c for c in df.columns
+                    if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+    numeric_set = set(numeric_cols)
+    by_name: Dict[str, ColumnProfile] = {}
+    for i in range(0, len(numeric_cols), chunk_columns):
+        block = df.loc[:, numeric_cols[i:i + chunk_columns]]
+        for prof in _profile_numeric_block(block, len(df)):
+            by_name[prof.name] = prof
+    columns = []
+    for pos, c in enumerate(df.columns):
+        if c in numeric_set:
+            columns.append(by_name[str(c)])
+        else:
+            columns.append(_profile_other(c, df.iloc[:, pos]))
+    return DatasetProfile(name=name, n_rows=len(df), n_cols=df.shape[1], columns=columns)
+
+
+class ProfileStore:
+    """Perfiles persistidos como JSON (uno por dataset)."""
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root is not None else PROFILE_DIR
+
+    def _path(self, name: str) -> Path:
+        if not name or "/" in name or "\\" in name or name.startswith("."):
+            raise KeyError(name)
+        return self.root / f"{name}.json"
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def get(self, name: str) -> Optional[DatasetProfile]:
+        """Perfil guardado o None si falta o es de otra versión (del perfil o del almacén)."""
+        try:
+            record = json.loads(self._path(name).read_text(encoding="utf-8"))
+            if record.get("version") != PROFILE_VERSION or record.get("store_version") != FORMAT_VERSION:
+                return None
+            return DatasetProfile.from_dict(record)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def put(self, profile: DatasetProfile) -> None:
+        path = self._path(profile.name)
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump({"version": PROFILE_VERSION, "store_version": FORMAT_VERSION, **profile.to_dict()},
+                      fh, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def precompute(self, names: Iterable[str], force: bool = False, progress=print) -> Dict[str, str]:
+        """Perfilar en bloque `names` desde el almacén de datasets. Devuelve {nombre: error}."""
+        from core.dataset_store import STORE
+
+        names = list(names)
+        failures = {}
+        for i, name in enumerate(names, 1):
+            if not force and name in self:
+                continue
+            try:
+                self.put(profile_frame(STORE.get(name), name=name))
+            except Exception as e:
+                failures[name] = repr(e)
+            if progress and (i % 50 == 0 or i == len(names)):
+                progress(f"[{i}/{len(names)}] perfiles en {self.root}")
+        return failures
+
+
+PROFILES = ProfileStore()
+
+
+@timed("profile.get")
+def get_profile(name: str, df: Optional[pd.DataFrame] = None) -> DatasetProfile:
+    """Perfil de un dataset: caché en memoria -> perfil precalculado en disco -> cálculo."""
+    from core.memory_cache import PROFILE_CACHE
+
+    def load() -> DatasetProfile:
+        profile = PROFILES.get(name)
+        if profile is None:
+            if df is None:
+                from core.memory_cache import get_dataset
+
+                frame = get_dataset(name)
+            else:
+                frame = df
+            profile = profile_frame(frame, name=name)
+            try:
+                PROFILES.put(profile)
+            except (OSError, KeyError):
+                pass
+        return profile
+
+    return PROFILE_CACHE.get_or_load(name, load)
+
+
+def main(argv=None) -> None:
+    from core.dataset_store import pydataset_ids
+
+    parser = argparse.ArgumentParser(description="Perfiles precalculados de los datasets de pydataset")
+    parser.add_argument("--dir", type=Path, default=None, help=f"directorio de perfiles (por defecto {PROFILE_DIR})")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    pre = sub.add_parser("precompute", help="calcular y guardar perfiles")
+    pre.add_argument("names", nargs="*", help="datasets a perfilar (por defecto, todo el catálogo)")
+    pre.add_argument("--force", action="store_true", help="recalcular aunque ya existan")
+    args = parser.parse_args(argv)
+
+    store = ProfileStore(args.dir)
+    failures = store.precompute(args.names or pydataset_ids(), force=args.force)
+    for name, err in failures.items():
+        print(f"ERROR {name}: {err}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Resultados de consulta del catálogo memoizados por (búsqueda, columna, orden).
+
+Un rerun que solo cambia `page` o `page_size` reutiliza el `QueryResult`
+existente y cuesta O(page_size): el filtrado y la ordenación se hacen una vez
+por combinación de búsqueda/orden y las exportaciones se calculan a demanda.
+La ordenación usa las permutaciones precalculadas de `core.sorting`.
+
+Modos de búsqueda: "exact" (por defecto) filtra por subcadena
+(`core.search_index`) y "ranked" pone primero las `top_k` filas más relevantes
+(`core.ranked_search`, tolerante a erratas) y detrás el resto de coincidencias
+exactas, así que nunca devuelve menos filas que "exact"; si el ranking llega a
+`top_k`, `QueryResult.truncated` avisa de que puede haber más aproximadas.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from core.arrowio import to_arrow_table, widget_table
+from core.instrumentation import count, timed
+from core.ranked_search import RankedSearch, doc_texts
+from core.search_index import SearchIndex
+from core.sorting import SortPermutations
+
+VISIBLE_COLUMNS = ["#", "dataset_id", "title", "title_es"]
+
+
+def visible_table(df: pd.DataFrame) -> pa.Table:
+    """Columnas visibles del catálogo en Arrow, listas para el widget ("#" se rellena por página)."""
+    cols = [c for c in VISIBLE_COLUMNS[1:] if c in df.columns]
+    frame = df[cols]
+    frame.insert(0, "#", np.zeros(len(frame), dtype=np.int64))
+    return widget_table(to_arrow_table(frame, preserve_index=True))
+
+
+class QueryResult:
+    """Posiciones filtradas y ordenadas de una consulta sobre el catálogo."""
+
+    def __init__(self, df: pd.DataFrame, positions: np.ndarray, table: Optional[Callable[[], pa.Table]] = None,
+                 truncated: bool = False):
+        self._df = df
+        self.positions = positions
+        self.truncated = truncated  # el ranking se cortó en `top_k` (puede haber más aproximadas)
+        self._table = table if table is not None else (lambda: visible_table(df))
+
+    @property
+    def total(self) -> int:
+        return len(self.positions)
+
+    def _bounds(self, page: int, page_size: int) -> Tuple[int, int]:
+        total = self.total
+        pages = max(1, (total - 1) // page_size + 1)
+        page = max(1, min(page, pages))
+        start = (page - 1) * page_size
+        return start, min(start + page_size, total)
+
+    def page(self, page: int = 1, page_size: int = 25) -> Tuple[pd.DataFrame, int, int]:
+        """Materializar solo la página pedida. Devuelve (page_df, start, end)."""
+        if self.total == 0:
+            return self._df.iloc[0:0], 0, 0
+        start, end = self._bounds(page, page_size)
+        page_df = self._df.iloc[self.positions[start:end]]  # indexar por posiciones ya devuelve una copia
+        page_df.insert(0, "#", range(1, len(page_df) + 1))
+        visible_cols = [c for c in VISIBLE_COLUMNS if c in page_df.columns]
+        return page_df[visible_cols], start, end
+
+    @timed("catalog.page_table")
+    def page_table(self, page: int = 1, page_size: int = 25) -> Tuple[pa.Table, int, int]:
+        """Como `page`, pero en Arrow para `st.dataframe`: solo las columnas visibles y sin pasar por pandas.
+
+        Si las filas de la página son contiguas en el catálogo (sin filtro ni orden) es un slice sin copia;
+        si no, un `take` de solo esas filas.
+        """
+        table = self._table()
+        start, end = self._bounds(page, page_size)
+        rows = self.positions[start:end]
+        if len(rows) and (np.diff(rows) == 1).all():
+            page_table = table.slice(int(rows[0]), len(rows))
+        else:
+            page_table = table.take(pa.array(rows, type=pa.int64()))
+        page_table = page_table.set_column(0, "#", pa.array(np.arange(1, len(rows) + 1, dtype=np.int64)))
+        return page_table, start, end
+
+    @cached_property
+    def frame(self) -> pd.DataFrame:
+        """El resultado completo como DataFrame (se materializa al primer acceso)."""
+        return self._df.iloc[self.positions]
+
+    @cached_property
+    def dataset_ids(self) -> List[str]:
+        if "dataset_id" not in self._df.columns:
+            return []
+        return list(self._df["dataset_id"].iloc[self.positions].astype(str).unique())
+
+
+class CatalogQueryEngine:
+    """Catálogo + índice de búsqueda con un LRU de `QueryResult` por consulta."""
+
+    def __init__(self, df: pd.DataFrame, index: Optional[SearchIndex] = None, max_entries: int = 64,
+                 ranker: Optional[RankedSearch] = None, top_k: int = 200):
+        self.df = df
+        self.index = index
+        self.ranker = ranker
+        self.top_k = top_k
+        self.orderings = SortPermutations(df)
+        self.max_entries = max_entries
+        self._results: "OrderedDict[tuple, QueryResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ranker_lock = threading.Lock()
+
+    @cached_property
+    def table(self) -> pa.Table:
+        """Columnas visibles de todo el catálogo en Arrow; se convierte una vez y las páginas son slices."""
+        return visible_table(self.df)
+
+    @timed("catalog.filter")
+    def _filter(self, search_q: str) -> np.ndarray:
+        if not search_q:
+            return np.arange(len(self.df), dtype=np.int64)
+        if self.index is None:
+            self.index = SearchIndex(self.df)
+        return self.index.search(search_q)
+
+    @timed("catalog.filter")
+    def _rank(self, search_q: str) -> np.ndarray:
+        if not search_q:
+            return np.arange(len(self.df), dtype=np.int64)
+        if self.ranker is None:
+            # Se construye la primera vez que se usa el modo "ranked" (no con cada carga del catálogo),
+            # con la documentación que haya indexada en ese momento.
+            with self._ranker_lock:
+                if self.ranker is None:
+                    self.ranker = RankedSearch(self.df, docs=doc_texts())
+        return self.ranker.search_positions(search_q, k=self.top_k)
+
+    @timed("catalog.sort")
+    def _sort(self, positions: np.ndarray, sort_column: str | None, sort_order: str) -> np.ndarray:
+        if not sort_column or sort_column not in self.df.columns or len(positions) < 2:
+            return positions
+        return self.orderings.sort_positions(positions, sort_column, ascending=sort_order != "desc")
+
+    def query(self, search_q: str = "", sort_column: str | None = None, sort_order: str = "asc",
+              mode: str = "exact") -> QueryResult:
+        key = (str(search_q or "").strip(), sort_column, sort_order, mode)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                count("catalog.query_cache.hit")
+                return result
+        count("catalog.query_cache.miss")
+        truncated = False
+        if mode == "ranked":
+            positions = self._rank(key[0])
+            if key[0]:
+                truncated = len(positions) >= self.top_k
+                # Las coincidencias por subcadena no se pierden nunca: van detrás de las del ranking.
+                exact = self._filter(key[0])
+                positions = np.concatenate([positions, exact[~np.isin(exact, positions)]])
+            if sort_column and sort_column in self.df.columns:
+                positions = self._sort(np.sort(positions), sort_column, sort_order)
+        else:
+            positions = self._sort(self._filter(key[0]), sort_column, sort_order)
+        result = QueryResult(self.df, positions, table=lambda: self.table, truncated=truncated)
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return result
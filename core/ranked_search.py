@@ -0,0 +1,250 @@
+"""Búsqueda por relevancia, tolerante a erratas y sin distinguir acentos.
+
+A diferencia de `core.search_index` (filtro por subcadena), aquí se ordenan las
+filas por relevancia con BM25F sobre `dataset_id`, `title`, `title_es` y, si
+se pasa, el texto de la documentación de pydataset de cada dataset:
+
+- Se construye una vez por carga del catálogo: tokens normalizados con
+  `core.text.fold`, vocabulario ordenado, postings por término con el impacto
+  BM25F ya calculado (frecuencia ponderada por campo y normalizada por
+  longitud), e índice de trigramas del vocabulario.
+- Cada palabra de la consulta se expande a términos del vocabulario: el
+  propio término, los que empiezan por él (búsqueda mientras se escribe) y los
+  parecidos por trigramas (erratas: "poblacoin" -> "poblacion"), con un peso
+  según la similitud.
+- La puntuación es vectorizada con NumPy sobre los postings de los términos
+  expandidos (solo se tocan las filas candidatas) y se devuelven las k mejores.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.instrumentation import timed
+from core.text import fold
+
+FIELD_WEIGHTS = {"dataset_id": 3.0, "title": 2.0, "title_es": 2.0, "doc": 0.5}
+K1 = 1.2
+B = 0.75
+FUZZY_MIN_SIMILARITY = 0.45
+FUZZY_MAX_EXPANSIONS = 8
+PREFIX_MAX_EXPANSIONS = 16
+PREFIX_WEIGHT = 0.8
+STOP_GRAM_TERMS = 2000
+STOP_GRAM_FRACTION = 0.05
+
+_TOKEN_RE = re.compile(r"\w+")
+_EMPTY_I = np.empty(0, dtype=np.int64)
+_EMPTY_F = np.empty(0, dtype=np.float64)
+
+
+def tokenize(text) -> List[str]:
+    if text is None or (not isinstance(text, str) and pd.isna(text)):
+        return []
+    return _TOKEN_RE.findall(fold(text))
+
+
+def _trigrams(term: str) -> List[str]:
+    padded = f"${term}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)] or [padded]
+
+
+class RankedSearch:
+    """Índice BM25F + trigramas del vocabulario para búsquedas aproximadas por relevancia."""
+
+    def __init__(self, df: pd.DataFrame, docs: Optional[Mapping[str, str]] = None,
+                 weights: Mapping[str, float] = FIELD_WEIGHTS, id_column: str = "dataset_id"):
+        self.n_rows = len(df)
+        fields: Dict[str, List] = {c: df[c].tolist() for c in weights if c in df.columns and c != "doc"}
+        if docs and id_column in df.columns:
+            fields["doc"] = [docs.get(str(i)) for i in df[id_column].tolist()]
+        self.fields = list(fields)
+        self._ids = {}
+        if id_column in df.columns:
+            for pos, value in enumerate(df[id_column].tolist()):
+                self._ids.setdefault(fold(str(value)), pos)
+        self._build(fields, weights)
+
+    # Construcción -----------------------------------------------------------
+
+    def _build(self, fields: Dict[str, List], weights: Mapping[str, float]) -> None:
+        vocab: Dict[str, int] = {}
+        rows_parts, terms_parts, tf_parts = [], [], []
+        for field, values in fields.items():
+            rows, terms = [], []
+            for pos, value in enumerate(values):
+                for tok in tokenize(value):
+                    rows.append(pos)
+                    terms.append(vocab.setdefault(tok, len(vocab)))
+            rows = np.asarray(rows, dtype=np.int64)
+            terms = np.asarray(terms, dtype=np.int64)
+            lengths = np.bincount(rows, minlength=self.n_rows).astype(np.float64)
+            avg = lengths.mean() if self.n_rows and lengths.any() else 1.0
+            norm = 1.0 - B + B * lengths / avg
+            # Frecuencia de cada (fila, término) en el campo, ya ponderada y normalizada.
+            pairs, counts = np.unique(rows * max(len(vocab), 1) + terms, return_counts=True) if len(rows) \
+                else (_EMPTY_I, _EMPTY_I)
+            pair_rows = pairs // max(len(vocab), 1)
+            rows_parts.append(pair_rows)
+            terms_parts.append(pairs % max(len(vocab), 1))
+            tf_parts.append(weights.get(field, 1.0) * counts / norm[pair_rows])
+        # Los ids de término de campos anteriores siguen siendo válidos: el vocabulario solo crece.
+        n_terms = len(vocab)
+        rows = np.concatenate(rows_parts) if rows_parts else _EMPTY_I
+        terms = np.concatenate(terms_parts) if terms_parts else _EMPTY_I
+        tf = np.concatenate(tf_parts) if tf_parts else _EMPTY_F
+        key = terms * max(self.n_rows, 1) + rows
+        key, inverse = np.unique(key, return_inverse=True)
+        tf = np.bincount(inverse, weights=tf, minlength=len(key))
+        terms, rows = key // max(self.n_rows, 1), key % max(self.n_rows, 1)
+        df_t = np.bincount(terms, minlength=n_terms)
+        idf = np.log1p((self.n_rows - df_t + 0.5) / (df_t + 0.5))
+
+        self._post_rows = rows
+        self._post_impact = idf[terms] * tf * (K1 + 1) / (tf + K1)
+        self._post_start = np.searchsorted(terms, np.arange(n_terms + 1))
+
+        # Vocabulario ordenado (prefijos por búsqueda binaria) y trigramas de cada término.
+        self.terms = np.array(sorted(vocab, key=vocab.get), dtype=object)
+        order = np.argsort(self.terms.astype(str))
+        self._sorted_terms = self.terms[order].astype(str)
+        self._sorted_ids = order
+        gram_ids: Dict[str, int] = {}
+        g_terms, g_ids = [], []
+        self._n_grams = np.zeros(n_terms, dtype=np.int64)
+        for tid, term in enumerate(self.terms):
+            grams = set(_trigrams(term))
+            self._n_grams[tid] = len(grams)
+            for g in grams:
+                g_ids.append(gram_ids.setdefault(g, len(gram_ids)))
+                g_terms.append(tid)
+        g_ids = np.asarray(g_ids, dtype=np.int64)
+        g_terms = np.asarray(g_terms, dtype=np.int64)
+        order = np.argsort(g_ids, kind="stable")
+        self._gram_ids = gram_ids
+        self._gram_terms = g_terms[order]
+        self._gram_start = np.searchsorted(g_ids[order], np.arange(len(gram_ids) + 1))
+        self._vocab = vocab
+
+    # Expansión de términos --------------------------------------------------
+
+    def _prefix_terms(self, prefix: str) -> np.ndarray:
+        lo = np.searchsorted(self._sorted_terms, prefix, side="left")
+        hi = np.searchsorted(self._sorted_terms, prefix + "\U0010ffff", side="left")
+        return self._sorted_ids[lo:min(hi, lo + PREFIX_MAX_EXPANSIONS)]
+
+    def _fuzzy_terms(self, token: str) -> Tuple[np.ndarray, np.ndarray]:
+        grams = [self._gram_ids[g] for g in set(_trigrams(token)) if g in self._gram_ids]
+        if not grams:
+            return _EMPTY_I, _EMPTY_F
+        # Los trigramas muy comunes apenas discriminan y dominan el coste: se ignoran si quedan otros.
+        sizes = self._gram_start[np.add(grams, 1)] - self._gram_start[grams]
+        common = sizes > max(STOP_GRAM_TERMS, STOP_GRAM_FRACTION * len(self.terms))
+        if not common.all():
+            grams = [g for g, c in zip(grams, common) if not c]
+        cand = np.concatenate([self._gram_terms[self._gram_start[g]:self._gram_start[g + 1]] for g in grams])
+        tids, overlap = np.unique(cand, return_counts=True)
+        sim = 2.0 * overlap / (len(set(_trigrams(token))) + self._n_grams[tids])  # Dice
+        keep = sim >= FUZZY_MIN_SIMILARITY
+        tids, sim = tids[keep], sim[keep]
+        if len(tids) > FUZZY_MAX_EXPANSIONS:
+            top = np.argpartition(-sim, FUZZY_MAX_EXPANSIONS)[:FUZZY_MAX_EXPANSIONS]
+            tids, sim = tids[top], sim[top]
+        return tids, sim
+
+    def expand(self, token: str) -> Dict[int, float]:
+        """{id de término: peso} con el que cuenta una palabra de la consulta."""
+        out: Dict[int, float] = {}
+        exact = self._vocab.get(token)
+        if exact is not None:
+            out[exact] = 1.0
+        for tid in self._prefix_terms(token):
+            out.setdefault(int(tid), PREFIX_WEIGHT)
+        if len(token) >= 3:
+            for tid, sim in zip(*self._fuzzy_terms(token)):
+                out[int(tid)] = max(out.get(int(tid), 0.0), float(sim) ** 2)
+        return out
+
+    # Consultas --------------------------------------------------------------
+
+    def _postings(self, token: str) -> List[Tuple[int, int, float]]:
+        """[(inicio, fin, peso)] de los postings de las expansiones de una palabra."""
+        return [(int(self._post_start[tid]), int(self._post_start[tid + 1]), weight)
+                for tid, weight in self.expand(token).items()]
+
+    def _token_scores(self, postings: List[Tuple[int, int, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Mejor puntuación por fila para una palabra (máximo sobre sus expansiones)."""
+        if not postings:
+            return _EMPTY_I, _EMPTY_F
+        rows = np.concatenate([self._post_rows[s:e] for s, e, _ in postings])
+        vals = np.concatenate([self._post_impact[s:e] * w for s, e, w in postings])
+        if len(postings) == 1:
+            return rows, vals  # un término: filas ya únicas
+        order = np.lexsort((-vals, rows))
+        rows, vals = rows[order], vals[order]
+        first = np.r_[True, rows[1:] != rows[:-1]]
+        return rows[first], vals[first]
+
+    def _score_sparse(self, per_token) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        parts = [self._token_scores(p) for p in per_token]
+        rows = np.concatenate([p[0] for p in parts])
+        vals = np.concatenate([p[1] for p in parts])
+        cand, inverse = np.unique(rows, return_inverse=True)
+        return cand, np.bincount(inverse, weights=vals), np.bincount(inverse)
+
+    def _score_dense(self, per_token) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Con postings del orden del catálogo completo, un array por fila es más barato que ordenar.
+        total = np.zeros(self.n_rows)
+        matched = np.zeros(self.n_rows, dtype=np.int64)
+        best = np.empty(self.n_rows)
+        for postings in per_token:
+            best.fill(0.0)
+            for s, e, w in postings:
+                rows = self._post_rows[s:e]
+                best[rows] = np.maximum(best[rows], self._post_impact[s:e] * w)
+            total += best
+            matched += best > 0
+        cand = np.flatnonzero(total)
+        return cand, total[cand], matched[cand]
+
+    @timed("catalog.ranked_search")
+    def search(self, query: str, k: int = 100) -> Tuple[np.ndarray, np.ndarray]:
+        """(posiciones, puntuaciones) de las `k` filas más relevantes, de mayor a menor."""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return _EMPTY_I, _EMPTY_F
+        per_token = [self._postings(t) for t in tokens]
+        n_postings = sum(e - s for postings in per_token for s, e, _ in postings)
+        if not n_postings:
+            return _EMPTY_I, _EMPTY_F
+        if n_postings > self.n_rows // 8:
+            cand, scores, matched = self._score_dense(per_token)
+        else:
+            cand, scores, matched = self._score_sparse(per_token)
+        # Las filas que cubren todas las palabras de la consulta van por delante.
+        scores *= (matched / len(tokens)) ** 2
+        exact = self._ids.get(fold(str(query).strip()))
+        if exact is not None:
+            hit = np.searchsorted(cand, exact)
+            if hit < len(cand) and cand[hit] == exact:
+                scores[hit] += scores.max() + 1.0
+        if len(cand) > k:
+            top = np.argpartition(-scores, k)[:k]
+            cand, scores = cand[top], scores[top]
+        order = np.lexsort((cand, -scores))
+        return cand[order], scores[order]
+
+    def search_positions(self, query: str, k: int = 100) -> np.ndarray:
+        return self.search(query, k)[0]
+
+
+def doc_texts(names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """Textos de documentación del índice SQLite (vacío si aún no se ha construido)."""
+    from core.doc_index import DOC_INDEX
+
+    if not DOC_INDEX.exists():
+        return {}
+    return DOC_INDEX.texts(names)
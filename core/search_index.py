@@ -0,0 +1,141 @@
+"""Índice de búsqueda precompilado para el catálogo.
+
+Se construye una vez por carga del catálogo y responde consultas de subcadena
+(insensibles a mayúsculas y acentos) devolviendo posiciones de fila, sin
+recorrer el DataFrame en cada rerun.
+
+- Postings de tokens: ``token -> posiciones`` para búsquedas por palabra.
+- Índice de trigramas: ``trigrama -> posiciones``; una consulta de 3 o más
+  caracteres intersecta los postings de sus trigramas y verifica la subcadena
+  solo sobre los candidatos.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.text import fold
+
+SEARCH_COLUMNS = ("dataset_id", "title", "title_es")
+
+# Separadores que nunca aparecen en una consulta normalizada: evitan que una
+# subcadena coincida "a caballo" entre dos columnas o dos filas.
+_COL_SEP = "\x1f"
+_ROW_SEP = "\x1e"
+_TOKEN_RE = re.compile(r"\w+")
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def _gram_codes(codes: np.ndarray) -> np.ndarray:
+    """Codificar cada trigrama de un array de code points como un int64."""
+    c = codes.astype(np.int64)
+    return (c[:-2] << 42) | (c[1:-1] << 21) | c[2:]
+
+
+def _intersect_sorted(small: np.ndarray, large: np.ndarray) -> np.ndarray:
+    """Intersección de dos arrays ordenados en O(k log m), con k = len(small)."""
+    if not len(small) or not len(large):
+        return _EMPTY
+    idx = np.searchsorted(large, small)
+    idx[idx == len(large)] = 0
+    return small[large[idx] == small]
+
+
+def _encode(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+class SearchIndex:
+    """Índice de tokens y trigramas sobre las columnas de búsqueda del catálogo."""
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str] = SEARCH_COLUMNS):
+        self.columns = [c for c in columns if c in df.columns]
+        self.n_rows = len(df)
+        folded = [
+            [fold(v) if isinstance(v, str) else ("" if pd.isna(v) else fold(v)) for v in df[c].tolist()]
+            for c in self.columns
+        ]
+        self.haystacks: List[str] = [_COL_SEP.join(parts) for parts in zip(*folded)] if folded else [""] * self.n_rows
+        self._trigrams = self._build_trigrams(self.haystacks)
+        self._tokens = self._build_tokens(self.haystacks)
+
+    # Construcción -----------------------------------------------------------
+
+    @staticmethod
+    def _build_trigrams(haystacks: List[str]) -> Dict[int, np.ndarray]:
+        if not haystacks:
+            return {}
+        codes = _encode(_ROW_SEP.join(haystacks))
+        lengths = np.fromiter((len(h) + 1 for h in haystacks), dtype=np.int64, count=len(haystacks))
+        rows = np.repeat(np.arange(len(haystacks), dtype=np.int64), lengths)[: len(codes)]
+        if len(codes) < 3:
+            return {}
+        grams = _gram_codes(codes)
+        is_sep = (codes == ord(_COL_SEP)) | (codes == ord(_ROW_SEP))
+        valid = ~(is_sep[:-2] | is_sep[1:-1] | is_sep[2:])
+        grams = grams[valid]
+        gram_rows = rows[:-2][valid]
+        # Orden estable por trigrama: dentro de cada trigrama las filas quedan ascendentes.
+        order = np.argsort(grams, kind="stable")
+        grams = grams[order]
+        gram_rows = gram_rows[order]
+        keep = np.ones(len(grams), dtype=bool)
+        keep[1:] = (grams[1:] != grams[:-1]) | (gram_rows[1:] != gram_rows[:-1])
+        grams = grams[keep]
+        gram_rows = gram_rows[keep]
+        starts = np.flatnonzero(np.r_[True, grams[1:] != grams[:-1]])
+        ends = np.r_[starts[1:], len(grams)]
+        return {int(grams[s]): gram_rows[s:e] for s, e in zip(starts, ends)}
+
+    @staticmethod
+    def _build_tokens(haystacks: List[str]) -> Dict[str, np.ndarray]:
+        postings: Dict[str, List[int]] = {}
+        for i, h in enumerate(haystacks):
+            for tok in set(_TOKEN_RE.findall(h)):
+                postings.setdefault(tok, []).append(i)
+        return {tok: np.asarray(rows, dtype=np.int64) for tok, rows in postings.items()}
+
+    # Consultas --------------------------------------------------------------
+
+    def _verify(self, q: str, candidates: Iterable[int]) -> np.ndarray:
+        hs = self.haystacks
+        return np.asarray([i for i in candidates if q in hs[i]], dtype=np.int64)
+
+    def search(self, query: str) -> np.ndarray:
+        """Posiciones (ascendentes) de las filas que contienen `query` en alguna columna."""
+        q = fold(str(query).strip())
+        if not q:
+            return np.arange(self.n_rows, dtype=np.int64)
+        if len(q) < 3:
+            return self._verify(q, range(self.n_rows))
+        postings = []
+        for code in np.unique(_gram_codes(_encode(q))):
+            rows = self._trigrams.get(int(code))
+            if rows is None:
+                return _EMPTY
+            postings.append(rows)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for rows in postings[1:]:
+            candidates = _intersect_sorted(candidates, rows)
+            if not len(candidates):
+                return _EMPTY
+        if len(postings) == 1 and len(q) == 3:
+            return candidates
+        return self._verify(q, candidates.tolist())
+
+    def search_tokens(self, query: str) -> np.ndarray:
+        """Posiciones de las filas que contienen todos los tokens (palabras completas) de `query`."""
+        tokens = set(_TOKEN_RE.findall(fold(query)))
+        if not tokens:
+            return np.arange(self.n_rows, dtype=np.int64)
+        result = None
+        for tok in sorted(tokens, key=lambda t: len(self._tokens.get(t, _EMPTY))):
+            rows = self._tokens.get(tok)
+            if rows is None:
+                return _EMPTY
+            result = rows if result is None else _intersect_sorted(result, rows)
+        return result if result is not None else _EMPTY
@@ -0,0 +1,142 @@
+"""Caché compartida entre procesos (varias réplicas de Streamlit en la misma máquina).
+
+`st.cache_data` vive en la memoria de cada proceso: con varias réplicas detrás
+de un balanceador, cada una paga por separado el catálogo, los Excel, los
+datasets y la documentación. Aquí hay dos niveles:
+
+- en memoria, por proceso (un `ByteLRUCache`);
+- en disco, compartido, bajo `.cache/shared/<espacio>/`: los DataFrames se
+  guardan como Arrow IPC (lectura memory-mapped), el texto tal cual y el resto
+  con pickle. Las escrituras son atómicas.
+
+Las cargas son *single-flight*: si N procesos (o hilos) piden a la vez la
+misma clave en frío, solo uno ejecuta el `loader`; los demás esperan el lock
+de la clave y leen el resultado que dejó el primero. Uso::
+
+    @cached("pydataset_catalog")
+    def get_catalog():
+        ...
+"""
+from __future__ import annotations
+
+import functools
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import pandas as pd
+
+from core.arrowio import read_ipc, to_arrow_table, write_ipc
+from core.excel_cache import CACHE_DIR
+from core.export import content_key
+from core.instrumentation import count
+from core.locks import file_lock
+
+SHARED_DIR = Path(os.environ.get("PYDATASETS_SHARED_CACHE_DIR", CACHE_DIR / "shared"))
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+_SUFFIXES = (".arrow", ".txt", ".pkl")
+
+
+class SharedCache:
+    """Nivel en disco compartido por todos los procesos, con cargas single-flight."""
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root) if root is not None else SHARED_DIR
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0  # cargas ejecutadas en este proceso
+
+    def _base(self, namespace: str, key: Hashable) -> Path:
+        return self.root / namespace / content_key(namespace, repr(key))[:32]
+
+    def get(self, namespace: str, key: Hashable, default=None):
+        base = self._base(namespace, key)
+        for suffix in _SUFFIXES:
+            path = base.with_suffix(suffix)
+            try:
+                if suffix == ".arrow":
+                    return read_ipc(path).to_pandas()
+                if suffix == ".txt":
+                    return path.read_text(encoding="utf-8")
+                return pickle.loads(path.read_bytes())
+            except FileNotFoundError:
+                continue
+        return default
+
+    def put(self, namespace: str, key: Hashable, value: Any) -> None:
+        base = self._base(namespace, key)
+        if isinstance(value, pd.DataFrame):
+            write_ipc(to_arrow_table(value, preserve_index=True), base.with_suffix(".arrow"))
+        elif isinstance(value, str):
+            _atomic_write_bytes(base.with_suffix(".txt"), value.encode("utf-8"))
+        else:
+            _atomic_write_bytes(base.with_suffix(".pkl"), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def invalidate(self, namespace: str, key: Hashable) -> None:
+        base = self._base(namespace, key)
+        for suffix in _SUFFIXES:
+            base.with_suffix(suffix).unlink(missing_ok=True)
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], Any]):
+        sentinel = object()
+        value = self.get(namespace, key, sentinel)
+        if value is sentinel:
+            base = self._base(namespace, key)
+            with file_lock(base.with_suffix(".lock")):
+                # Otro proceso pudo terminar la carga mientras esperábamos el lock.
+                value = self.get(namespace, key, sentinel)
+                if value is sentinel:
+                    with self._stats_lock:
+                        self.misses += 1
+                    count(f"shared.{namespace}.miss")
+                    value = loader()
+                    self.put(namespace, key, value)
+                    return value
+        with self._stats_lock:
+            self.hits += 1
+        count(f"shared.{namespace}.hit")
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+SHARED_CACHE = SharedCache()
+
+
+def cached(namespace: str, memory=None, shared: Optional[SharedCache] = None):
+    """Decorador: memoriza `fn(*args)` en memoria (opcional) y en la caché compartida.
+
+    `memory` es un `ByteLRUCache` del proceso; los argumentos forman la clave y
+    deben tener un `repr` estable. Los valores devueltos se comparten: no deben
+    modificarse in situ.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            store = shared if shared is not None else SHARED_CACHE
+            load = functools.partial(store.get_or_load, namespace, args, lambda: fn(*args))
+            if memory is None:
+                return load()
+            return memory.get_or_load((namespace, args), load)
+
+        return wrapper
+
+    return decorator
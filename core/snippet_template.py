@@ -0,0 +1,101 @@
+"""Generador de los snippets de Colab a partir de una única plantilla.
+
+Todos los `codigos/<dataset>.md` eran la misma plantilla con el nombre del
+dataset cambiado. Aquí la plantilla se compila una vez (Jinja2) y se
+renderiza para cualquier `dataset_id`, con un LRU de resultados. Si se pasa el
+perfil del dataset se añaden secciones específicas (tipos de columnas y
+`value_counts` de las columnas de baja cardinalidad).
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+SNIPPET_TEMPLATE = '''```python
+# Código Colab para dataset: {{ name }}
+
+import pandas as pd
+import io
+from IPython.display import display
+
+# 1) Cargar el dataset
+try:
+    try:
+        df = pd.read_csv('data/{{ name }}.csv')
+        print('Cargado desde data/{{ name }}.csv')
+    except Exception:
+        df = pd.read_excel('data/{{ name }}.xlsx', engine='openpyxl')
+        print('Cargado desde data/{{ name }}.xlsx')
+except Exception:
+    try:
+        from google.colab import files
+        uploaded = files.upload()
+        if uploaded:
+            # uploaded is a dict {filename: bytes}
+            fname, content = next(iter(uploaded.items()))
+            if fname.lower().endswith(('.xls', '.xlsx')):
+                df = pd.read_excel(io.BytesIO(content), engine='openpyxl')
+            else:
+                df = pd.read_csv(io.BytesIO(content))
+            print('Archivo subido y cargado: {}'.format(fname))
+        else:
+            raise FileNotFoundError('No se proporcionó archivo')
+    except Exception as e:
+        raise RuntimeError('No se pudo cargar el dataset: ' + str(e))
+
+# 2) Mostrar el dataset (primeras filas)
+display(df.head())
+
+# 3) info() del dataset
+print('\\nInfo del DataFrame:')
+df.info()
+
+# 4) describe() del dataset
+print('\\nDescribe:')
+display(df.describe(include='all'))
+{%- if dtypes %}
+
+# 5) Tipos de columnas esperados ({{ n_rows }} filas x {{ dtypes | length }} columnas)
+{%- for col, dtype in dtypes %}
+#   {{ col }}: {{ dtype }}
+{%- endfor %}
+{%- endif %}
+{%- if value_columns %}
+
+# 6) Valores de las columnas categóricas o de baja cardinalidad
+for col in {{ value_columns | list }}:
+    print('\\nValores de', col)
+    display(df[col].value_counts(dropna=False).head(20))
+{%- endif %}
+```
+'''
+
+
+@lru_cache(maxsize=1)
+def _template():
+    # Jinja2 se importa y la plantilla se compila en el primer render, no al arrancar la página.
+    import jinja2
+
+    env = jinja2.Environment(autoescape=False, keep_trailing_newline=True, undefined=jinja2.StrictUndefined)
+    return env.from_string(SNIPPET_TEMPLATE)
+
+
+@lru_cache(maxsize=2048)
+def _render(name: str, n_rows: int, dtypes: Tuple[Tuple[str, str], ...], value_columns: Tuple[str, ...]) -> str:
+    return _template().render(name=name, n_rows=n_rows, dtypes=dtypes, value_columns=value_columns)
+
+
+def render_snippet(dataset_id: str, profile=None) -> str:
+    """Snippet de Colab para `dataset_id`; con `profile` añade las secciones específicas del dataset."""
+    if profile is None:
+        return _render(dataset_id, 0, (), ())
+    dtypes = tuple((c.name, c.dtype) for c in profile.columns)
+    return _render(dataset_id, profile.n_rows, dtypes, tuple(profile.value_columns()))
+
+
+def snippet_name(dataset_id: str) -> str:
+    return f"{dataset_id}.md"
+
+
+def dataset_id_from_snippet(name: str) -> Optional[str]:
+    return name[:-3] if name.endswith(".md") else None
@@ -0,0 +1,319 @@
+"""Índice en memoria de los snippets de Colab.
+
+Cada dataset del catálogo tiene un snippet generado desde la plantilla de
+`core.snippet_template`; `codigos/*.md` solo contiene los snippets editados a
+mano, que tienen prioridad sobre el generado. Los ficheros se leen una vez y se
+guardan por nombre con su hash, el número de líneas/caracteres y la vista
+previa ya recortada; listar, filtrar y abrir un snippet no toca el disco. Un
+observador de watchdog invalida las entradas cuando cambian los ficheros (si
+watchdog no está disponible, se compara el mtime del directorio en cada
+listado).
+
+Los guardados del editor son atómicos (fichero temporal + `os.replace`), se
+serializan por snippet entre hilos y procesos, rechazan ediciones hechas sobre
+una versión que ya no es la vigente y quedan anotados en un log de revisiones.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.instrumentation import timed
+from core.locks import file_lock
+from core.snippet_template import dataset_id_from_snippet, render_snippet, snippet_name
+from core.text import fold
+
+ROOT = Path(__file__).resolve().parents[1]
+CODE_DIR = ROOT / "codigos"
+PREVIEW_MAX_LINES = 10
+PREVIEW_MAX_CHARS = 1200
+REVISION_LOG = ".revisions.jsonl"
+LOCK_DIR = ".locks"
+
+
+class StaleSnippetError(RuntimeError):
+    """El snippet cambió en disco desde que el editor lo abrió."""
+
+
+def content_sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@dataclass(frozen=True)
+class Snippet:
+    name: str
+    content: str
+    sha256: str
+    n_lines: int
+    n_chars: int
+    preview: str
+    truncated: bool
+
+    @classmethod
+    def from_text(cls, name: str, content: str) -> "Snippet":
+        lines = content.splitlines()
+        preview = "\n".join(lines[:PREVIEW_MAX_LINES])
+        truncated = len(lines) > PREVIEW_MAX_LINES or len(content) > PREVIEW_MAX_CHARS
+        if len(preview) > PREVIEW_MAX_CHARS:
+            preview = preview[:PREVIEW_MAX_CHARS] + "\n\n... (preview truncado por caracteres)"
+        elif len(lines) > PREVIEW_MAX_LINES:
+            preview += (f"\n\n... (archivo truncado: mostrando {PREVIEW_MAX_LINES} de {len(lines)} líneas, "
+                        "pulsa 'Mostrar contenido completo' para ver todo)")
+        return cls(name=name, content=content, sha256=content_sha(content),
+                   n_lines=len(lines), n_chars=len(content), preview=preview, truncated=truncated)
+
+
+class SnippetStore:
+    """Snippets `*.md` de un directorio, cargados una vez e invalidados por cambios en disco."""
+
+    def __init__(self, root: str | Path = CODE_DIR, watch: bool = True,
+                 dataset_ids: Optional[Callable[[], Iterable[str]]] = None):
+        self.root = Path(root).resolve()
+        self._watch = watch
+        self._dataset_ids = dataset_ids if dataset_ids is not None else _pydataset_ids
+        self._generated: Optional[Dict[str, Optional[Snippet]]] = None  # nombre -> Snippet (perezoso)
+        self._lock = threading.RLock()
+        self._snippets: Optional[Dict[str, Snippet]] = None
+        self._folded: Dict[str, str] = {}  # ficheros editados
+        self._generated_folded: Dict[str, str] = {}  # snippets generados, a medida que se buscan
+        self._names: List[str] = []
+        self._dir_mtime: Optional[int] = None
+        self._observer = None
+
+    # Carga e invalidación ---------------------------------------------------
+
+    def _read(self, path: Path) -> Optional[Snippet]:
+        try:
+            return Snippet.from_text(path.name, path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _load_all(self) -> None:
+        snippets = {}
+        if self.root.exists():
+            for path in self.root.glob("*.md"):
+                snippet = self._read(path)
+                if snippet is not None:
+                    snippets[path.name] = snippet
+        self._snippets = snippets
+        self._folded = {n: fold(s.content) for n, s in snippets.items()}
+        self._update_names()
+        self._dir_mtime = self._current_dir_mtime()
+        if self._watch:
+            self._start_observer()
+
+    def _current_dir_mtime(self) -> Optional[int]:
+        try:
+            return self.root.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _ensure(self) -> Dict[str, Snippet]:
+        with self._lock:
+            if self._snippets is None or (self._observer is None and self._current_dir_mtime() != self._dir_mtime):
+                self._load_all()
+            return self._snippets
+
+    def refresh(self, name: str) -> None:
+        """Releer (o descartar, si ya no existe) un snippet concreto."""
+        with self._lock:
+            if self._snippets is None:
+                return
+            snippet = self._read(self.root / name)
+            if snippet is None:
+                self._snippets.pop(name, None)
+                self._folded.pop(name, None)
+            else:
+                self._snippets[name] = snippet
+                self._folded[name] = fold(snippet.content)
+            self._update_names()
+
+    def _generated_snippets(self) -> Dict[str, Optional[Snippet]]:
+        if self._generated is None:
+            try:
+                ids = list(self._dataset_ids())
+            except Exception:
+                ids = []
+            self._generated = {snippet_name(i): None for i in dict.fromkeys(map(str, ids))}
+        return self._generated
+
+    def _update_names(self) -> None:
+        self._names = sorted(set(self._snippets) | set(self._generated_snippets()))
+
+    def _rendered(self, name: str) -> Optional[Snippet]:
+        generated = self._generated_snippets()
+        if name not in generated:
+            return None
+        snippet = generated[name]
+        if snippet is None:
+            snippet = generated[name] = Snippet.from_text(name, render_snippet(dataset_id_from_snippet(name)))
+        return snippet
+
+    def is_override(self, name: str) -> bool:
+        """True si `name` es un fichero editado en `codigos/` (no el snippet generado)."""
+        return name in self._ensure()
+
+    def _current_text(self, name: str) -> Optional[str]:
+        """Contenido vigente leído de disco (o el generado si no hay fichero editado)."""
+        try:
+            return (self.root / name).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            with self._lock:
+                rendered = self._rendered(name)
+            return rendered.content if rendered is not None else None
+
+    def save(self, name: str, content: str, expected_sha: Optional[str] = None) -> str:
+        """Guardar `content` de forma atómica y devolver su hash.
+
+        Con `expected_sha` (hash de la versión que abrió el editor) se rechaza con
+        `StaleSnippetError` si entretanto otra sesión guardó una versión distinta.
+        Cada guardado se anota en un log de revisiones (JSON lines, contenido
+        comprimido) en `codigos/.revisions.jsonl`.
+        """
+        if not name.endswith(".md") or "/" in name or "\\" in name or name.startswith("."):
+            raise ValueError(f"Nombre de snippet no válido: {name}")
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / name
+        with file_lock(self.root / LOCK_DIR / f"{name}.lock"):
+            current = self._current_text(name)
+            prev_sha = content_sha(current) if current is not None else None
+            if expected_sha is not None and prev_sha is not None and prev_sha != expected_sha:
+                raise StaleSnippetError(f"{name} fue modificado por otra sesión")
+            new_sha = content_sha(content)
+            if new_sha != prev_sha or not path.exists():
+                _atomic_write_text(path, content)
+                self._append_revision({"ts": time.time(), "name": name, "sha": new_sha, "prev_sha": prev_sha,
+                                       "data": base64.b64encode(zlib.compress(content.encode("utf-8"))).decode("ascii")})
+        self.refresh(name)
+        return new_sha
+
+    def _append_revision(self, record: dict) -> None:
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with file_lock(self.root / LOCK_DIR / "revisions.lock"):
+            fd = os.open(self.root / REVISION_LOG, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def revisions(self, name: Optional[str] = None) -> List[dict]:
+        """Revisiones registradas (la más antigua primero), con el contenido ya descomprimido."""
+        out = []
+        try:
+            lines = (self.root / REVISION_LOG).read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return out
+        for line in lines:
+            rec = json.loads(line)
+            if name is None or rec["name"] == name:
+                rec["content"] = zlib.decompress(base64.b64decode(rec.pop("data"))).decode("utf-8")
+                out.append(rec)
+        return out
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snippets = None
+
+    def _start_observer(self) -> None:
+        if self._observer is not None or not self.root.exists():
+            return
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except Exception:
+            return  # sin watchdog: se usa el mtime del directorio
+
+        store = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                for attr in ("src_path", "dest_path"):
+                    path = Path(str(getattr(event, attr, "") or ""))
+                    if path.suffix == ".md" and path.parent == store.root:
+                        store.refresh(path.name)
+
+        try:
+            observer = Observer()
+            observer.daemon = True
+            observer.schedule(_Handler(), str(self.root), recursive=False)
+            observer.start()
+            self._observer = observer
+        except Exception:
+            self._observer = None
+
+    def close(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer = None
+
+    # Consultas --------------------------------------------------------------
+
+    def names(self) -> List[str]:
+        self._ensure()
+        return list(self._names)
+
+    @timed("snippet.read")
+    def get(self, name: str) -> Optional[Snippet]:
+        snippet = self._ensure().get(name)
+        if snippet is None:
+            with self._lock:
+                snippet = self._rendered(name)
+        return snippet
+
+    def filter_names(self, q: str) -> List[str]:
+        """Nombres que contienen `q` (sin distinguir mayúsculas ni acentos)."""
+        names = self.names()
+        q = fold(q.strip())
+        return [n for n in names if q in fold(n)] if q else names  # ~1k nombres: barato
+
+    def search(self, q: str) -> List[str]:
+        """Nombres cuyo contenido contiene `q` (sin distinguir mayúsculas ni acentos)."""
+        self._ensure()
+        q = fold(q.strip())
+        if not q:
+            return list(self._names)
+        with self._lock:
+            out = []
+            for n in self._names:
+                text = self._folded.get(n)
+                if text is None:
+                    text = self._generated_folded.get(n)
+                if text is None:
+                    # La plantilla no cambia en el proceso: cada snippet generado se pliega una vez.
+                    text = self._generated_folded[n] = fold(self._rendered(n).content)
+                if q in text:
+                    out.append(n)
+            return out
+
+
+def _pydataset_ids() -> List[str]:
+    from core.dataset_store import pydataset_ids
+
+    return pydataset_ids()
+
+
+SNIPPETS = SnippetStore()
@@ -0,0 +1,165 @@
+"""Permutaciones de orden precalculadas para las columnas del catálogo.
+
+En vez de llamar a `sort_values` sobre el subconjunto filtrado en cada rerun,
+cada columna se ordena una sola vez por carga del catálogo: se calcula el
+rango (denso) de cada fila y, a partir de él, la permutación ascendente y la
+descendente. Ordenar un filtro es entonces seleccionar de la permutación las
+posiciones filtradas (vectorizado con NumPy).
+
+- Texto: clave de colación para español (sin distinguir mayúsculas ni acentos
+  en primer nivel, con la "ñ" como letra propia entre "n" y "o"; los acentos y
+  las mayúsculas solo desempatan). Si PyICU está instalado se usa su colador
+  para el locale `es`.
+- Columnas mixtas: claves tipadas (números, luego fechas, luego texto, luego el
+  resto por su `str`), en vez de fallar y dejar la salida sin ordenar.
+- Los valores ausentes van siempre al final, en ambos sentidos; los empates
+  conservan el orden original de las filas.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import numbers
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+_ENYE = "n\U0010ffff"  # la ñ ordena después de cualquier "n..." y antes de "o"
+
+# Por debajo de esta fracción de filas filtradas sale más barato ordenar el subconjunto por rango.
+_SUBSET_FRACTION = 1 / 16
+
+
+@lru_cache(maxsize=1)
+def _icu_collator():
+    try:
+        import icu
+    except ImportError:
+        return None
+    return icu.Collator.createInstance(icu.Locale("es"))
+
+
+def collation_key(text: str):
+    """Clave de orden para texto en español (ver el docstring del módulo)."""
+    collator = _icu_collator()
+    if collator is not None:
+        return collator.getSortKey(text)
+    lower = unicodedata.normalize("NFC", text.casefold()).replace("ñ", _ENYE)
+    decomposed = unicodedata.normalize("NFD", lower)
+    primary = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return primary, decomposed, text
+
+
+def typed_key(value) -> Tuple[int, object]:
+    """Clave comparable para cualquier valor no ausente de una columna mixta."""
+    if isinstance(value, (bool, np.bool_)):
+        return 0, float(value)
+    if isinstance(value, numbers.Real):
+        return 0, float(value)
+    if isinstance(value, (pd.Timestamp, _dt.datetime, _dt.date, np.datetime64)):
+        return 1, pd.Timestamp(value).value
+    if isinstance(value, str):
+        return 2, collation_key(value)
+    return 3, collation_key(str(value))
+
+
+def _is_missing(value) -> bool:
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def column_ranks(series: pd.Series) -> np.ndarray:
+    """Rango denso (int64, desde 0) de cada fila según el orden de la columna; -1 para los ausentes."""
+    values = series
+    if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.ordered:
+        return values.cat.codes.to_numpy().astype(np.int64)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+    if pd.api.types.is_bool_dtype(values.dtype) or pd.api.types.is_numeric_dtype(values.dtype) \
+            or pd.api.types.is_datetime64_any_dtype(values.dtype):
+        missing = values.isna().to_numpy()
+        if pd.api.types.is_datetime64_any_dtype(values.dtype):
+            arr = values.to_numpy(dtype="datetime64[ns]").view(np.int64).astype(np.float64)
+        else:
+            arr = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        ranks = np.full(len(arr), -1, dtype=np.int64)
+        present = ~missing
+        ranks[present] = np.unique(arr[present], return_inverse=True)[1]
+        return ranks
+
+    codes, uniques = pd.factorize(values.to_numpy(dtype=object), use_na_sentinel=True)
+    keys = {}
+    for i, value in enumerate(uniques):
+        if not _is_missing(value):
+            keys[i] = typed_key(value)
+    unique_rank = np.full(len(uniques), -1, dtype=np.int64)
+    rank = -1
+    previous = object()
+    for i in sorted(keys, key=keys.__getitem__):
+        if keys[i] != previous:
+            rank += 1
+            previous = keys[i]
+        unique_rank[i] = rank
+    ranks = np.full(len(codes), -1, dtype=np.int64)
+    found = codes >= 0
+    ranks[found] = unique_rank[codes[found]]
+    return ranks
+
+
+def _order_keys(ranks: np.ndarray, ascending: bool) -> np.ndarray:
+    # Claves para un argsort estable: los ausentes (-1) quedan al final en ambos sentidos.
+    if ascending:
+        return np.where(ranks < 0, np.iinfo(np.int64).max, ranks)
+    return np.where(ranks < 0, 1, -ranks)
+
+
+class SortPermutations:
+    """Rangos y permutaciones por columna de un DataFrame, calculados una vez y reutilizados."""
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._ranks: Dict[str, np.ndarray] = {}
+        self._perms: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def ranks(self, column: str) -> np.ndarray:
+        ranks = self._ranks.get(column)
+        if ranks is None:
+            ranks = column_ranks(self.df[column])
+            with self._lock:
+                self._ranks[column] = ranks
+        return ranks
+
+    def permutation(self, column: str, ascending: bool = True) -> np.ndarray:
+        """Posiciones de todas las filas en el orden de `column`."""
+        key = (column, ascending)
+        perm = self._perms.get(key)
+        if perm is None:
+            perm = np.argsort(_order_keys(self.ranks(column), ascending), kind="stable")
+            with self._lock:
+                self._perms[key] = perm
+        return perm
+
+    def sort_positions(self, positions: np.ndarray, column: str, ascending: bool = True) -> np.ndarray:
+        """`positions` (crecientes, p. ej. las de un filtro) reordenadas según `column`."""
+        n = len(self.df)
+        if len(positions) < _SUBSET_FRACTION * n:
+            keys = _order_keys(self.ranks(column)[positions], ascending)
+            return positions[np.argsort(keys, kind="stable")]
+        perm = self.permutation(column, ascending)
+        if len(positions) == n:
+            return perm
+        selected = np.zeros(n, dtype=bool)
+        selected[positions] = True
+        return perm[selected[perm]]
+
+    def warm(self) -> "SortPermutations":
+        """Calcular ya los rangos de todas las columnas."""
+        for column in self.df.columns:
+            self.ranks(column)
+        return self
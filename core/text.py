@@ -0,0 +1,13 @@
+"""Normalización de texto para búsqueda y ordenación."""
+from __future__ import annotations
+
+import unicodedata
+
+
+def fold(text: str) -> str:
+    """Pasar a minúsculas y eliminar acentos (``"Población"`` -> ``"poblacion"``)."""
+    text = str(text).casefold()
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
@@ -0,0 +1,85 @@
+"""Componentes de Streamlit compartidos por las páginas."""
+from __future__ import annotations
+
+from typing import Callable
+
+import pandas as pd
+import streamlit as st
+
+from core.export import EXPORT_CACHE, EXPORT_FORMATS, content_key, export_bytes
+
+
+def lazy_download_button(label: str, make_df: Callable[[], pd.DataFrame], key: str, file_stem: str,
+                         fmt: str = "csv") -> None:
+    """Botón de descarga que solo genera los bytes cuando el usuario lo pide.
+
+    En un rerun normal no se codifica nada: se muestra un botón "Preparar";
+    una vez generada (por esta u otra sesión) la exportación queda en caché y
+    se ofrece directamente el `st.download_button`.
+    """
+    mime, ext = EXPORT_FORMATS[fmt]
+    export_key = content_key(key, fmt)
+    ready = export_key in EXPORT_CACHE or st.session_state.get(f"export_{export_key}", False)
+    if not ready and st.button(f"Preparar: {label}", key=f"prepare_{export_key}"):
+        st.session_state[f"export_{export_key}"] = True
+        ready = True
+    if ready:
+        with st.spinner("Generando exportación..."):
+            data = export_bytes(make_df, fmt, key)
+        st.download_button(label, data=data, file_name=f"{file_stem}{ext}", mime=mime, key=f"download_{export_key}")
+
+
+def cache_stats_sidebar() -> None:
+    """Contadores de las cachés compartidas de datasets y documentación en la barra lateral."""
+    from core.memory_cache import DATASET_CACHE, DOC_CACHE
+    from core.shared_cache import SHARED_CACHE
+
+    with st.sidebar.expander("Cachés (memoria)", expanded=False):
+        for cache in (DATASET_CACHE, DOC_CACHE):
+            s = cache.stats()
+            lookups = s["hits"] + s["misses"] + s["disk_hits"]
+            ratio = f"{s['hits'] / lookups:.0%}" if lookups else "—"
+            st.markdown(f"**{cache.name}** — {s['entries']} entradas, "
+                        f"{s['bytes'] / 1e6:.1f} / {s['max_bytes'] / 1e6:.0f} MB")
+            st.caption(f"aciertos {s['hits']} ({ratio}) · disco {s['disk_hits']} · fallos {s['misses']} · "
+                       f"desalojos {s['evictions']}")
+        s = SHARED_CACHE.stats()
+        st.caption(f"**compartida (disco)** — aciertos {s['hits']} · cargas en este proceso {s['misses']}")
+
+
+def begin_timing(page: str) -> bool:
+    """Casilla de depuración en la barra lateral; si está marcada, mide las etapas de este rerun."""
+    from core.instrumentation import begin_rerun
+
+    enabled = st.sidebar.checkbox("Depuración: tiempos por etapa", value=False, key="debug_timings")
+    begin_rerun(page, enabled=enabled)
+    return enabled
+
+
+def timing_panel() -> None:
+    """Cascada de las etapas medidas en este rerun (llamar al final de la página)."""
+    from core import instrumentation
+
+    trace = instrumentation.current_trace()
+    if trace is None:
+        return
+    total_ms = trace.elapsed() * 1000
+    with st.sidebar.expander(f"Tiempos del rerun ({total_ms:.0f} ms)", expanded=True):
+        if not trace.spans:
+            st.caption("Ninguna etapa medida en este rerun.")
+        else:
+            import altair as alt
+
+            rows = pd.DataFrame([{"etapa": "  " * s.depth + s.name, "inicio_ms": s.start * 1000,
+                                  "fin_ms": (s.start + s.duration) * 1000, "ms": s.duration * 1000}
+                                 for s in sorted(trace.spans, key=lambda s: s.start)])
+            chart = alt.Chart(rows).mark_bar().encode(
+                x=alt.X("inicio_ms:Q", title="ms desde el inicio del rerun"), x2="fin_ms:Q",
+                y=alt.Y("etapa:N", sort=None, title=None), tooltip=["etapa", alt.Tooltip("ms:Q", format=".2f")])
+            st.altair_chart(chart, use_container_width=True)
+        if trace.counters:
+            st.caption(" · ".join(f"{k}: {v}" for k, v in sorted(trace.counters.items())))
+        st.download_button("Etapas (JSON lines)", data=instrumentation.to_jsonl(trace),
+                           file_name="timings.jsonl", mime="application/jsonl", key="timings_jsonl")
+        st.download_button("Métricas del proceso (Prometheus)", data=instrumentation.prometheus_text(),
+                           file_name="metrics.prom", mime="text/plain", key="timings_prom")
@@ -0,0 +1,136 @@
+"""Precarga en paralelo de toda la colección de pydataset.
+
+Para cada dataset del catálogo: carga desde pydataset, normaliza tipos (tipos
+compactos de `core.dtypes` y conversión tipada a Arrow del almacén), calcula el
+perfil y persiste ambos, en paralelo con `ProcessPoolExecutor`. Es reanudable (se saltan los datasets ya
+almacenados y perfilados), informa del progreso y escribe un informe de
+tiempos por dataset en JSON lines; un fallo no detiene el resto. Uso::
+
+    python -m core.warmup                 # todo el catálogo, un proceso por núcleo
+    python -m core.warmup --workers 4 --report warmup.jsonl
+    python -m core.warmup iris cats --force
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from core.excel_cache import CACHE_DIR
+
+DEFAULT_REPORT = CACHE_DIR / "warmup_report.jsonl"
+
+
+def warm_one(name: str, store_dir: str | None = None, profile_dir: str | None = None) -> Dict:
+    """Cargar, normalizar, perfilar y persistir un dataset. Nunca lanza: el error va en el informe."""
+    from core.dataset_store import DatasetStore, load_from_pydataset
+    from core.profiling import ProfileStore, profile_frame
+
+    store = DatasetStore(store_dir)
+    profiles = ProfileStore(profile_dir)
+    record = {"name": name, "ok": False, "pid": os.getpid()}
+    t_start = time.perf_counter()
+    try:
+        t = time.perf_counter()
+        df = load_from_pydataset(name)
+        record["load_s"] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        meta = store.put(name, df)
+        record["persist_s"] = time.perf_counter() - t
+
+        # Perfilar lo que se sirve realmente: el dataset ya normalizado del almacén.
+        t = time.perf_counter()
+        profiles.put(profile_frame(store.get(name), name=name))
+        record["profile_s"] = time.perf_counter() - t
+
+        record.update(ok=True, rows=meta["rows"], columns=meta["columns"], nbytes=meta["nbytes"],
+                      bytes_before=meta["memory"]["before"], bytes_after=meta["memory"]["after"])
+    except Exception as e:
+        record["error"] = repr(e)
+    record["total_s"] = time.perf_counter() - t_start
+    return record
+
+
+def pending(names: Iterable[str], store_dir: str | None = None, profile_dir: str | None = None) -> List[str]:
+    """Datasets que aún no están almacenados y perfilados."""
+    from core.dataset_store import DatasetStore
+    from core.profiling import ProfileStore
+
+    store = DatasetStore(store_dir)
+    profiles = ProfileStore(profile_dir)
+    return [n for n in names if n not in store or n not in profiles]
+
+
+def run(names: Iterable[str], workers: Optional[int] = None, force: bool = False,
+        store_dir: str | None = None, profile_dir: str | None = None,
+        report: str | Path | None = DEFAULT_REPORT, progress=print,
+        on_result: Optional[Callable[[int, int, Dict], None]] = None) -> List[Dict]:
+    """Precargar `names` en paralelo. Devuelve los registros de tiempos.
+
+    `on_result(i, total, registro)` se llama al terminar cada dataset (p. ej. para una barra de progreso).
+    """
+    names = list(dict.fromkeys(names))
+    todo = names if force else pending(names, store_dir, profile_dir)
+    if progress:
+        progress(f"{len(names) - len(todo)} ya precargados, {len(todo)} pendientes")
+    if not todo:
+        return []
+
+    report_fh = None
+    if report is not None:
+        Path(report).parent.mkdir(parents=True, exist_ok=True)
+        report_fh = open(report, "a", encoding="utf-8")
+    records = []
+    t0 = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(warm_one, n, store_dir, profile_dir): n for n in todo}
+            for i, fut in enumerate(as_completed(futures), 1):
+                try:
+                    rec = fut.result()
+                except Exception as e:  # el worker murió (p. ej. sin memoria)
+                    rec = {"name": futures[fut], "ok": False, "error": repr(e)}
+                records.append(rec)
+                if report_fh is not None:
+                    # Se escribe en cuanto llega: una ejecución interrumpida conserva su progreso.
+                    report_fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                    report_fh.flush()
+                if on_result is not None:
+                    on_result(i, len(todo), rec)
+                if progress:
+                    status = f"{rec.get('total_s', 0):.2f}s" if rec["ok"] else f"ERROR {rec['error']}"
+                    progress(f"[{i}/{len(todo)}] {rec['name']}: {status}")
+    finally:
+        if report_fh is not None:
+            report_fh.close()
+    if progress:
+        failed = sum(1 for r in records if not r["ok"])
+        progress(f"Listo en {time.perf_counter() - t0:.1f}s: {len(records) - failed} ok, {failed} errores")
+    return records
+
+
+def main(argv=None) -> None:
+    from core.dataset_store import pydataset_ids
+
+    parser = argparse.ArgumentParser(description="Precarga en paralelo de los datasets de pydataset")
+    parser.add_argument("names", nargs="*", help="datasets a precargar (por defecto, todo el catálogo)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--force", action="store_true", help="rehacer aunque ya estén precargados")
+    parser.add_argument("--store", default=None, help="directorio del almacén de datasets")
+    parser.add_argument("--profiles", default=None, help="directorio de perfiles")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT, help="informe de tiempos (JSON lines)")
+    args = parser.parse_args(argv)
+
+    records = run(args.names or pydataset_ids(), workers=args.workers, force=args.force,
+                  store_dir=args.store, profile_dir=args.profiles, report=args.report)
+    sys.exit(1 if any(not r["ok"] for r in records) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,35 +4,42 @@ Esta página contiene la lógica del catálogo que antes vivía en `app.py`.
 """
 from __future__ import annotations
 
-import io
-from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 import json
+import uuid
 
 import streamlit as st
 import pandas as pd
-import streamlit.components.v1 as components
 
-
-DATA_FILE = Path(__file__).parent.parent / "data" / "pydataset_list_translated.xlsx"
+from core.arrowio import widget_table
+from core.background import LoadHandle, get_loader, neighbours, wait_for
+from core.catalog import CATALOG
+from core.dataset_store import STORE
+from core.deps import pydataset_status
+from core.excel_cache import read_workbook, upload_digest
+from core.export import EXPORT_FORMATS
+from core.memory_cache import get_dataset
+from core.paging import PagedSource, open_dataset
+from core.profiling import get_profile
+from core.query import CatalogQueryEngine
+from core.search_index import SearchIndex
+from core.snippet_template import dataset_id_from_snippet, render_snippet
+from core.snippets import SNIPPETS, Snippet, StaleSnippetError
+from core.instrumentation import span
+from core.ui import begin_timing, cache_stats_sidebar, lazy_download_button, timing_panel
+
+
+DATA_FILE = CATALOG.data_file
 
 st.set_page_config(page_title="Pydataset — Catálogo traducido", layout="wide")
+begin_timing("catalogo")
 
 st.title("Pydataset — Catálogo traducido")
 
 
-def _check_pydataset_import():
-    try:
-        import importlib
-        mod = importlib.import_module("pydataset")
-        ver = getattr(mod, "__version__", None)
-        return True, ver
-    except Exception as e:
-        return False, str(e)
-
-
-available_pydataset, pydataset_info = _check_pydataset_import()
+# Solo se comprueba que esté instalado: importarlo cargaría su catálogo en cada arranque.
+available_pydataset, pydataset_info = pydataset_status()
 with st.sidebar:
     st.markdown("---")
     if available_pydataset:
@@ -41,127 +48,98 @@ with st.sidebar:
         st.error(f"pydataset NO disponible: {pydataset_info}")
 
 
-@st.cache_data
-def get_sheet_names_from_path(path: str | Path):
-    x = pd.ExcelFile(path, engine="openpyxl")
-    return x.sheet_names
-
-
-@st.cache_data
-def get_sheet_names_from_bytes(data: bytes):
-    x = pd.ExcelFile(io.BytesIO(data), engine="openpyxl")
-    return x.sheet_names
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_uploaded_workbook(digest: str, _data: bytes) -> Dict[str, pd.DataFrame]:
+    """Todas las hojas del fichero subido, parseadas en una pasada y cacheadas por la huella de su contenido.
 
+    La clave es solo `digest` (los bytes no se vuelven a hashear en cada rerun); cambiar de hoja
+    es una consulta al dict. Los DataFrames se comparten: no deben modificarse in situ.
+    """
+    return {name: table.to_pandas() for name, table in read_workbook(_data).items()}
 
-@st.cache_data
-def load_data_from_path(path: str | Path, sheet_name=None):
-    return pd.read_excel(path, engine="openpyxl", sheet_name=sheet_name)
 
+def uploaded_digest(uploaded) -> str:
+    """Huella del fichero subido, calculada una sola vez por subida (se guarda por `file_id`)."""
+    digests = st.session_state.setdefault("upload_digests", {})
+    file_id = getattr(uploaded, "file_id", None) or getattr(uploaded, "name", "")
+    if file_id not in digests:
+        digests.clear()  # solo interesa la subida actual
+        digests[file_id] = upload_digest(uploaded.getvalue())
+    return digests[file_id]
 
-@st.cache_data
-def load_data_from_bytes(data: bytes, sheet_name=None):
-    return pd.read_excel(io.BytesIO(data), engine="openpyxl", sheet_name=sheet_name)
 
+@st.cache_resource(show_spinner=False)
+def get_query_engine(_df: pd.DataFrame, cache_key: tuple) -> CatalogQueryEngine:
+    """Motor de consultas del catálogo (índice + resultados memoizados), uno por carga (`cache_key`)."""
+    # El ranker (búsqueda por relevancia, también sobre la documentación indexada) lo construye el
+    # motor la primera vez que se usa ese modo; la búsqueda exacta es la de por defecto.
+    engine = CatalogQueryEngine(_df, index=SearchIndex(_df), ranker=None)
+    engine.orderings.warm()  # rangos de orden de todas las columnas, una vez por carga
+    return engine
 
-def filter_sort_paginate(df: pd.DataFrame, search_q: str = "", sort_column: str | None = None,
-                         sort_order: str = "asc", page_size: int = 25, page: int = 1):
-    filtered = df
-    if search_q:
-        q = str(search_q).strip()
-        mask = (
-            df["dataset_id"].astype(str).str.contains(q, case=False, na=False)
-        ) | (
-            df["title"].astype(str).str.contains(q, case=False, na=False)
-        ) | (
-            df["title_es"].astype(str).str.contains(q, case=False, na=False)
-        )
-        filtered = df[mask]
 
-    if sort_column:
-        ascending = True if sort_order == "asc" else False
-        try:
-            filtered = filtered.sort_values(by=sort_column, ascending=ascending)
-        except Exception:
-            pass
-
-    total = len(filtered)
-    if total == 0:
-        return filtered.copy(), 0, 0, 0
-
-    pages = (total - 1) // page_size + 1
-    page = max(1, min(page, pages))
-    start = (page - 1) * page_size
-    end = min(start + page_size, total)
-    page_df = filtered.iloc[start:end].copy()
-    page_df.insert(0, "#", range(1, len(page_df) + 1))
-
-    visible_cols = ["#", "dataset_id", "title", "title_es"]
-    visible_cols = [c for c in visible_cols if c in page_df.columns]
-    return page_df[visible_cols], total, start, end
-
-
-def apply_filter_sort(df: pd.DataFrame, search_q: str = "", sort_column: str | None = None,
-                      sort_order: str = "asc") -> pd.DataFrame:
-    filtered = df
-    if search_q:
-        q = str(search_q).strip()
-        mask = (
-            df["dataset_id"].astype(str).str.contains(q, case=False, na=False)
-        ) | (
-            df["title"].astype(str).str.contains(q, case=False, na=False)
-        ) | (
-            df["title_es"].astype(str).str.contains(q, case=False, na=False)
-        )
-        filtered = df[mask]
-
-    if sort_column:
-        ascending = True if sort_order == "asc" else False
-        try:
-            filtered = filtered.sort_values(by=sort_column, ascending=ascending)
-        except Exception:
-            pass
-
-    return filtered
-
-
-@st.cache_data
 def load_dataset_by_name(name: str):
     """Cargar un dataset de pydataset por nombre. Devuelve un DataFrame.
 
+    Pasa por la caché acotada compartida con la página de documentación y, en
+    un fallo, por el almacén local (Arrow memory-mapped); solo la primera vez se
+    parsea el CSV de pydataset.
     Lanza ImportError si pydataset no está disponible y RuntimeError si la carga falla.
     """
     try:
-        from pydataset import data
+        return get_dataset(name)
+    except ImportError:
+        raise
     except Exception as e:
-        raise ImportError(f"pydataset no disponible: {e}")
+        raise RuntimeError(f"No se pudo cargar dataset {name}: {e}")
+
+
+# Tiempo máximo de espera de una carga en segundo plano antes de darla por fallida.
+BACKGROUND_TIMEOUT_S = 300.0
+
+
+def _progress(status, message: str):
+    """`on_tick` para `wait_for`: mantiene actualizado el aviso de carga en curso."""
+    def tick(seconds: float) -> None:
+        if status is not None:
+            status.info(f"{message} ({seconds:.1f} s)")
+
+    return tick
+
+
+def open_preview_source(name: str, handle: Optional[LoadHandle] = None, status=None) -> PagedSource:
+    """Fuente paginada del dataset para la vista previa (mismos errores que `load_dataset_by_name`).
+
+    Con `handle` (carga en segundo plano) se espera en pasos cortos, mostrando el progreso en `status`.
+    """
     try:
-        df = data(name)
-        return df
+        if handle is None:
+            return open_dataset(name)
+        return wait_for(handle.source, BACKGROUND_TIMEOUT_S, on_tick=_progress(status, f"Cargando dataset `{name}` en segundo plano"))
+    except ImportError:
+        raise
     except Exception as e:
         raise RuntimeError(f"No se pudo cargar dataset {name}: {e}")
 
 
 required_columns = {"dataset_id", "title", "title_es"}
 
-uploaded_bytes = None
 sheet_to_use = None
 
 if DATA_FILE.exists():
     try:
-        sheets = get_sheet_names_from_path(DATA_FILE)
+        sheets = CATALOG.sheet_names()
         if len(sheets) > 1:
             sheet_to_use = st.sidebar.selectbox("Seleccionar hoja", options=sheets, index=0)
-        df = load_data_from_path(DATA_FILE, sheet_name=sheet_to_use)
-        if isinstance(df, dict):
-            if sheet_to_use and sheet_to_use in df:
-                df = df[sheet_to_use]
-            else:
-                df = next(iter(df.values()))
+        with span("excel.read"):
+            # Compartida con el catálogo unificado (core.catalog): una copia por proceso, no por sesión.
+            df = CATALOG.translated(sheet_to_use)
         file_source = DATA_FILE.name
         try:
             file_mtime = datetime.fromtimestamp(DATA_FILE.stat().st_mtime)
         except Exception:
             file_mtime = datetime.now()
+        catalog_key = (str(DATA_FILE), str(file_mtime), sheet_to_use)
     except Exception as e:
         st.error(f"Error al leer el archivo Excel en {DATA_FILE}: {e}")
         st.stop()
@@ -171,18 +149,18 @@ else:
     if uploaded is None:
         st.stop()
     try:
-        uploaded_bytes = uploaded.read()
-        sheets = get_sheet_names_from_bytes(uploaded_bytes)
+        digest = uploaded_digest(uploaded)
+        with span("excel.read_upload"):
+            workbook = load_uploaded_workbook(digest, uploaded.getvalue())
+        sheets = list(workbook)
+        if not sheets:
+            raise ValueError("el libro no tiene hojas")
         if len(sheets) > 1:
             sheet_to_use = st.sidebar.selectbox("Seleccionar hoja (archivo subido)", options=sheets, index=0)
-        df = load_data_from_bytes(uploaded_bytes, sheet_name=sheet_to_use)
-        if isinstance(df, dict):
-            if sheet_to_use and sheet_to_use in df:
-                df = df[sheet_to_use]
-            else:
-                df = next(iter(df.values()))
+        df = workbook[sheet_to_use or sheets[0]]
         file_source = getattr(uploaded, "name", "archivo_subido.xlsx")
         file_mtime = datetime.now()
+        catalog_key = (file_source, digest, sheet_to_use)
     except Exception as e:
         st.error(f"Error al leer el archivo Excel subido: {e}")
         st.stop()
@@ -198,41 +176,41 @@ st.success(f"Cargado: {file_source} — {len(df)} filas, {len(df.columns)} colum
 # Barra lateral: controles
 st.sidebar.header("Controles")
 search_q = st.sidebar.text_input("Buscar (dataset_id, title, title_es)")
+SEARCH_MODES = {"Texto exacto": "exact", "Relevancia (tolera erratas)": "ranked"}
+search_mode = SEARCH_MODES[st.sidebar.radio("Modo de búsqueda", options=list(SEARCH_MODES), index=0, horizontal=True)]
 
 st.sidebar.markdown("---")
 show_codes = st.sidebar.checkbox("Mostrar códigos disponibles para copiar")
 code_filter = st.sidebar.text_input("Filtrar códigos (nombre)")
+code_search_content = st.sidebar.checkbox("Buscar también en el contenido de los códigos")
 
 def list_code_files() -> List[str]:
-    p = Path(__file__).parent / ".." / "codigos"
-    p = p.resolve()
-    if not p.exists():
-        return []
-    files = sorted([f.name for f in p.glob('*.md')])
-    return files
+    # Índice en memoria de `codigos/` (ver core.snippets); no recorre el disco en cada rerun.
+    return SNIPPETS.names()
 
 def read_code_file(name: str) -> str:
-    p = Path(__file__).parent / ".." / "codigos" / name
-    p = p.resolve()
-    if not p.exists():
-        return ""
-    return p.read_text(encoding='utf-8')
+    snippet = SNIPPETS.get(name)
+    return snippet.content if snippet is not None else ""
 
-def write_code_file(name: str, content: str) -> None:
-    p = Path(__file__).parent / ".." / "codigos" / name
-    p = p.resolve()
-    p.write_text(content, encoding='utf-8')
+def write_code_file(name: str, content: str, expected_sha: Optional[str] = None) -> str:
+    # Guardar crea (o reemplaza) el snippet editado en `codigos/`, que tiene prioridad sobre la plantilla.
+    # Escritura atómica y con bloqueo; lanza StaleSnippetError si otra sesión guardó antes (ver core.snippets).
+    return SNIPPETS.save(name, content, expected_sha=expected_sha)
 
 page_size = st.sidebar.selectbox("Tamaño de página", options=[10, 25, 50, 100], index=1)
 sort_column = st.sidebar.selectbox("Ordenar por columna", options=[None] + list(df.columns), index=0)
 sort_order = st.sidebar.radio("Orden", options=["asc", "desc"], index=0, horizontal=True)
+export_fmt = st.sidebar.selectbox("Formato de exportación", options=list(EXPORT_FORMATS), index=0)
 
 total_pages = max(1, (len(df) - 1) // page_size + 1)
 page = st.sidebar.number_input("Página", min_value=1, max_value=total_pages, value=1, step=1)
 
-page_df, total_filtered, start_idx, end_idx = filter_sort_paginate(
-    df, search_q=search_q, sort_column=sort_column, sort_order=sort_order, page_size=page_size, page=page
-)
+query_engine = get_query_engine(df, catalog_key)
+with span("catalog.query"):
+    query_result = query_engine.query(search_q, sort_column=sort_column, sort_order=sort_order, mode=search_mode)
+total_filtered = query_result.total
+with span("catalog.page"):
+    page_table, start_idx, end_idx = query_result.page_table(page, page_size)
 
 if total_filtered == 0:
     st.info("No hay filas que mostrar después de aplicar filtros.")
@@ -245,27 +223,39 @@ else:
         st.metric(label="Registros filtrados", value=f"{total_filtered:,}")
 
     st.write(f"Mostrando {start_idx + 1}–{end_idx} de {total_filtered} registros filtrados")
+    if query_result.truncated:
+        st.caption(f"La búsqueda por relevancia se limita a las {query_engine.top_k} coincidencias aproximadas "
+                   "más relevantes; las que contienen el texto exacto se muestran todas a continuación.")
 
-    filtered_full = apply_filter_sort(df, search_q=search_q, sort_column=sort_column, sort_order=sort_order)
-    csv_full = filtered_full.to_csv(index=False).encode("utf-8")
-    csv_page = page_df.drop(columns=[c for c in page_df.columns if c == "#"], errors="ignore").to_csv(index=False).encode("utf-8")
+    filter_state = (catalog_key, query_result.total, search_q.strip(), search_mode, sort_column, sort_order)
+    fmt_label = export_fmt.upper()
 
     col1, col2, col3 = st.columns([1, 1, 1])
     with col1:
-        st.download_button("Descargar CSV (filtrado completo)", data=csv_full, file_name="pydataset_filtered.csv", mime="text/csv")
+        lazy_download_button(f"Descargar {fmt_label} (filtrado completo)", lambda: query_result.frame,
+                             key=("catalog", filter_state), file_stem="pydataset_filtered", fmt=export_fmt)
     with col2:
-        st.download_button("Descargar CSV (página visible)", data=csv_page, file_name="pydataset_page.csv", mime="text/csv")
-    st.dataframe(page_df, use_container_width=True)
+        lazy_download_button(f"Descargar {fmt_label} (página visible)",
+                             lambda: query_result.page(page, page_size)[0].drop(columns="#", errors="ignore"),
+                             key=("catalog_page", filter_state, page, page_size), file_stem="pydataset_page", fmt=export_fmt)
+    st.dataframe(page_table, use_container_width=True)
 
     # Selector desplegable para elegir un dataset (desde los resultados filtrados)
     try:
-        available_ids = list(filtered_full['dataset_id'].astype(str).unique())
+        available_ids = query_result.dataset_ids
     except Exception:
         available_ids = list(df['dataset_id'].astype(str).unique())
 
     if available_ids:
-        selected_dataset = st.selectbox('Seleccionar dataset (desde resultados)', options=sorted(available_ids), key='catalog_selected')
+        dataset_options = sorted(available_ids)
+        selected_dataset = st.selectbox('Seleccionar dataset (desde resultados)', options=dataset_options, key='catalog_selected')
         st.markdown(f"**Seleccionado:** `{selected_dataset}`")
+        # Forma y tamaño precalculados si ya está almacenado: se lee solo su manifest, sin construir el
+        # catálogo unido (que importaría pydataset y releería todo el almacén en cada rerun).
+        selected_meta = STORE.meta(selected_dataset)
+        if selected_meta:
+            st.caption(f"{selected_meta['rows']} filas x {selected_meta['columns']} columnas, "
+                       f"{selected_meta['nbytes'] / 1e3:.1f} kB en Arrow")
     else:
         st.info('No hay datasets disponibles para seleccionar.')
 
@@ -274,99 +264,83 @@ else:
         st.markdown("---")
         st.header("Vista previa del dataset")
         try:
-            with st.spinner(f"Cargando dataset `{selected_dataset}` ..."):
-                df_selected = load_dataset_by_name(selected_dataset)
-
-            if df_selected is None:
-                st.warning(f"El dataset `{selected_dataset}` devolvió None.")
+            # Carga y perfil en segundo plano; se cancela la selección anterior de esta sesión
+            # y se precargan los vecinos en la lista para que el siguiente cambio sea inmediato.
+            loader_owner = st.session_state.setdefault("loader_owner", uuid.uuid4().hex)
+            handle = get_loader().request(loader_owner, selected_dataset,
+                                          prefetch=neighbours(dataset_options, selected_dataset))
+            load_status = st.empty()
+            source = open_preview_source(selected_dataset, handle, load_status)
+            load_status.empty()
+
+            if source.num_rows == 0:
+                st.warning(f"El dataset `{selected_dataset}` está vacío.")
             else:
-                # Forma y metadatos básicos
-                try:
-                    nrows, ncols = df_selected.shape
-                except Exception:
-                    nrows = len(df_selected) if hasattr(df_selected, '__len__') else 'N/A'
-                    ncols = len(df_selected.columns) if hasattr(df_selected, 'columns') else 'N/A'
-
+                # Forma y metadatos básicos (del fichero del almacén, sin cargar el dataset)
+                nrows, ncols = source.shape
                 st.write(f"Forma: {nrows} filas x {ncols} columnas")
 
                 # Controles de paginado para la vista previa
                 preview_col1, preview_col2 = st.columns([1, 3])
                 with preview_col1:
                     preview_page_size = st.number_input("Filas por página", min_value=5, max_value=1000, value=20, step=5, key='preview_page_size')
-                    total_pages_preview = max(1, (nrows - 1) // preview_page_size + 1) if isinstance(nrows, int) else 1
+                    total_pages_preview = max(1, (nrows - 1) // preview_page_size + 1)
                     preview_page = st.number_input("Página (preview)", min_value=1, max_value=total_pages_preview, value=1, step=1, key='preview_page')
                 with preview_col2:
                     st.markdown("_Navega por las primeras filas del dataset completo._")
+                    preview_columns = st.multiselect("Columnas (vacío = todas)", options=source.columns,
+                                                     key=f"preview_columns_{selected_dataset}")
 
-                # Seleccionar rango y mostrar subset
+                # Leer solo la ventana visible (y solo las columnas elegidas)
                 try:
                     start = (preview_page - 1) * preview_page_size
-                    end = min(start + preview_page_size, nrows) if isinstance(nrows, int) else None
-                    if end is None:
-                        preview_df = df_selected.head(preview_page_size)
-                    else:
-                        preview_df = df_selected.iloc[start:end]
-                    st.dataframe(preview_df, use_container_width=True)
-                    st.write(f"Mostrando filas {start + 1}–{end if end is not None else '∞'}")
+                    end = min(start + preview_page_size, nrows)
+                    # Ventana Arrow del fichero memory-mapped: llega al widget sin pasar por pandas.
+                    preview_table = source.window_table(start, end, columns=preview_columns or None)
+                    st.dataframe(widget_table(preview_table), use_container_width=True)
+                    st.write(f"Mostrando filas {start + 1}–{end}")
                 except Exception as e:
                     st.error(f"No se pudo mostrar preview: {e}")
 
-                # Tipos de columnas
+                # Perfil del dataset: una sola pasada, cacheado por dataset (ver core.profiling).
+                # La forma y la primera página ya están pintadas mientras se calcula.
+                profile_status = st.empty()
                 try:
-                    dtypes = pd.DataFrame({'column': list(df_selected.columns), 'dtype': [str(t) for t in df_selected.dtypes]})
+                    profile = wait_for(handle.profile, BACKGROUND_TIMEOUT_S,
+                                       on_tick=_progress(profile_status, "Calculando estadísticas"))
+                except Exception as e:
+                    profile = None
+                    st.warning(f"No se pudieron calcular estadísticas: {e}")
+                profile_status.empty()
+
+                if profile is not None:
                     with st.expander("Tipos de columnas", expanded=False):
-                        st.dataframe(dtypes, use_container_width=True)
-                except Exception:
-                    pass
+                        st.dataframe(profile.dtypes(), use_container_width=True)
 
-                # Estadísticas resumidas (describe)
-                try:
                     with st.expander("Estadísticas resumidas (describe)", expanded=False):
-                        desc_num = df_selected.describe(include=["number"]).transpose()
-                        desc_all = df_selected.describe(include='all').transpose()
                         st.markdown("**Numéricas**")
-                        st.dataframe(desc_num, use_container_width=True)
+                        st.dataframe(profile.describe_numeric(), use_container_width=True)
                         st.markdown("**Todas (incluye categóricas)**")
-                        st.dataframe(desc_all, use_container_width=True)
-                except Exception as e:
-                    st.warning(f"No se pudieron calcular estadísticas: {e}")
+                        st.dataframe(profile.describe_all(), use_container_width=True)
 
-                # Vistas de columnas categóricas (value_counts)
-                try:
-                    # detectar columnas categóricas o de baja cardinalidad
-                    # considerar object y las columnas con dtype Categorical
-                    cat_cols = []
-                    for c in df_selected.columns:
-                        try:
-                            dtype = df_selected[c].dtype
-                            if str(dtype) == 'object' or isinstance(dtype, pd.CategoricalDtype):
-                                cat_cols.append(c)
-                        except Exception:
-                            # fallback: tratar como no categórica si hay error
-                            continue
-                    # incluir columnas con baja cardinalidad
-                    low_card_cols = [c for c in df_selected.columns if df_selected[c].nunique(dropna=False) <= 50]
-                    cols_to_show = sorted(set(cat_cols + low_card_cols))
+                    # Vistas de columnas categóricas o de baja cardinalidad (value_counts):
+                    # solo se renderizan las columnas que el usuario elige.
+                    cols_to_show = profile.value_columns()
                     if not cols_to_show:
                         st.info("No se detectaron columnas categóricas o de baja cardinalidad.")
                     else:
-                        # Evitar anidar expanders: creamos un expander por cada columna al mismo nivel
-                        for c in cols_to_show:
-                            try:
-                                with st.expander(f"{c} (valores)", expanded=False):
-                                    vc = df_selected[c].value_counts(dropna=False).head(100)
-                                    st.dataframe(vc.rename_axis(c).reset_index(name='count'))
-                            except Exception as e:
-                                st.write(f"No se pudo calcular value_counts para {c}: {e}")
-                except Exception as e:
-                    st.warning(f"Error al generar vistas categóricas: {e}")
+                        chosen = st.multiselect("Ver valores de columnas (categóricas o de baja cardinalidad)",
+                                                options=cols_to_show, key=f"value_cols_{selected_dataset}")
+                        for c in chosen:
+                            with st.expander(f"{c} (valores)", expanded=True):
+                                st.dataframe(profile.value_counts(c), use_container_width=True)
 
-                # Descarga CSV del dataset completo
+                # Descarga del dataset completo (se genera solo al pedirla)
                 try:
-                    csv_bytes = df_selected.to_csv(index=False).encode('utf-8')
-                    st.download_button(label=f"Descargar `{selected_dataset}` como CSV", data=csv_bytes, file_name=f"{selected_dataset}.csv", mime="text/csv")
+                    lazy_download_button(f"Descargar `{selected_dataset}` como {export_fmt.upper()}", lambda: load_dataset_by_name(selected_dataset),
+                                         key=("dataset", selected_dataset), file_stem=selected_dataset, fmt=export_fmt)
                 except Exception as e:
-                    st.error(f"No se pudo preparar descarga CSV: {e}")
+                    st.error(f"No se pudo preparar la descarga: {e}")
 
         except ImportError as ie:
             st.error(str(ie))
@@ -382,64 +356,85 @@ else:
             st.sidebar.info("No se encontraron archivos en la carpeta `codigos/`.")
         else:
             if code_filter:
-                files = [f for f in files if code_filter.lower() in f.lower()]
+                files = SNIPPETS.search(code_filter) if code_search_content else SNIPPETS.filter_names(code_filter)
             sel = st.sidebar.selectbox("Selecciona un archivo", options=files)
-            content = read_code_file(sel)
+            snippet = SNIPPETS.get(sel) if sel else None
+            stored_sha = snippet.sha256 if snippet is not None else None
+            with_profile = False
+            if snippet is not None and not SNIPPETS.is_override(sel):
+                # Snippet generado desde la plantilla: opcionalmente con secciones del perfil del dataset.
+                with_profile = st.sidebar.checkbox("Incluir tipos y valores del dataset (perfil)", value=False)
+                if with_profile:
+                    try:
+                        snippet_dataset = dataset_id_from_snippet(sel)
+                        snippet = Snippet.from_text(sel, render_snippet(snippet_dataset, get_profile(snippet_dataset)))
+                    except Exception as e:
+                        st.sidebar.warning(f"No se pudo obtener el perfil: {e}")
+            content = snippet.content if snippet is not None else ""
             st.sidebar.markdown("#### Contenido (preview)")
-            PREVIEW_MAX_LINES = 10
-            PREVIEW_MAX_CHARS = 1200
             show_full_if_small = st.sidebar.checkbox("Mostrar completo en sidebar si es corto", value=True)
-            content_str = content or ""
-            content_lines = content_str.splitlines()
-            n_lines = len(content_lines)
-            n_chars = len(content_str)
 
             def sidebar_show_full(text: str):
                 with st.sidebar.expander("Mostrar contenido completo", expanded=False):
                     st.code(text, language='python')
 
-            if show_full_if_small and (n_lines <= PREVIEW_MAX_LINES and n_chars <= PREVIEW_MAX_CHARS):
-                st.sidebar.code(content_str, language='python')
+            if snippet is None:
+                st.sidebar.info("Ningún archivo coincide con el filtro.")
+            elif show_full_if_small and not snippet.truncated:
+                st.sidebar.code(content, language='python')
             else:
-                preview_lines = content_lines[:PREVIEW_MAX_LINES]
-                preview = "\n".join(preview_lines)
-                if len(preview) > PREVIEW_MAX_CHARS:
-                    preview = preview[:PREVIEW_MAX_CHARS] + "\n\n... (preview truncado por caracteres)"
-                else:
-                    if n_lines > PREVIEW_MAX_LINES:
-                        preview += f"\n\n... (archivo truncado: mostrando {PREVIEW_MAX_LINES} de {n_lines} líneas, pulsa 'Mostrar contenido completo' para ver todo)"
-
-                st.sidebar.code(preview, language='python')
-                sidebar_show_full(content_str)
-
-            st.markdown("## Editor de código seleccionado")
-            edited = st.text_area(f"Editar código (archivo: {sel})", value=content, height=400)
-            col_save, col_dl = st.columns([1, 1])
-            with col_save:
-                if st.button("Guardar cambios"):
-                    try:
-                        write_code_file(sel, edited)
-                        st.success(f"Guardado {sel}")
-                    except Exception as e:
-                        st.error(f"Error al guardar: {e}")
-            with col_dl:
-                st.download_button(label="Descargar archivo .md", data=edited, file_name=sel, mime="text/markdown")
-
-            js_fn = (
-                "<script>\n"
-                "async function copyText(text){\n"
-                "  try{\n"
-                "    await navigator.clipboard.writeText(text);\n"
-                "    const btn = document.getElementById('copy-btn');\n"
-                "    if(btn) btn.innerText = 'Copiado ✅';\n"
-                "  }catch(e){\n"
-                "    alert('No se pudo copiar al portapapeles: ' + e);\n"
-                "  }\n"
-                "}\n"
-                "</script>\n"
-            )
-            copy_js = js_fn + "<button id='copy-btn' onclick=\"copyText(" + json.dumps(edited) + ")\">Copiar código para Colab</button>"
-            components.html(copy_js, height=80)
+                # Vista previa precalculada al indexar (primeras líneas / caracteres)
+                st.sidebar.code(snippet.preview, language='python')
+                sidebar_show_full(content)
+
+            if snippet is not None:
+                st.markdown("## Editor de código seleccionado")
+                # Versión sobre la que se abrió el editor: se conserva entre reruns para detectar
+                # si otra sesión guarda el mismo snippet mientras se edita.
+                editor_bases = st.session_state.setdefault("editor_bases", {})
+                base_key = (sel, with_profile)
+                if base_key not in editor_bases:
+                    editor_bases[base_key] = (stored_sha, content)
+                base_sha, base_content = editor_bases[base_key]
+                edited = st.text_area(f"Editar código (archivo: {sel})", value=base_content, height=400)
+                col_save, col_dl = st.columns([1, 1])
+                with col_save:
+                    if st.button("Guardar cambios"):
+                        try:
+                            new_sha = write_code_file(sel, edited, expected_sha=base_sha)
+                            editor_bases[(sel, False)] = (new_sha, edited)
+                            st.success(f"Guardado {sel}")
+                        except StaleSnippetError:
+                            st.error(f"`{sel}` se modificó en otra sesión después de abrirlo; no se guardó "
+                                     "para no sobrescribirlo. Copia tus cambios y recarga la versión actual.")
+                        except Exception as e:
+                            st.error(f"Error al guardar: {e}")
+                    if base_sha != stored_sha and st.button("Recargar versión actual"):
+                        editor_bases.pop(base_key, None)
+                        st.experimental_rerun()
+                with col_dl:
+                    st.download_button(label="Descargar archivo .md", data=edited, file_name=sel, mime="text/markdown")
+
+                js_fn = (
+                    "<script>\n"
+                    "async function copyText(text){\n"
+                    "  try{\n"
+                    "    await navigator.clipboard.writeText(text);\n"
+                    "    const btn = document.getElementById('copy-btn');\n"
+                    "    if(btn) btn.innerText = 'Copiado ✅';\n"
+                    "  }catch(e){\n"
+                    "    alert('No se pudo copiar al portapapeles: ' + e);\n"
+                    "  }\n"
+                    "}\n"
+                    "</script>\n"
+                )
+                copy_js = js_fn + "<button id='copy-btn' onclick=\"copyText(" + json.dumps(edited) + ")\">Copiar código para Colab</button>"
+                import streamlit.components.v1 as components
+
+                components.html(copy_js, height=80)
+
+cache_stats_sidebar()
+timing_panel()
 
 # Footer
 st.write("---")
@@ -7,59 +7,56 @@ from __future__ import annotations
 
 import io
 import contextlib
-from typing import Optional, Tuple
 
 import streamlit as st
 import pandas as pd
-import streamlit.components.v1 as components
 
-
-def _import_pydataset() -> Tuple[bool, Optional[object], Optional[object], Optional[str]]:
-    try:
-        from pydataset import data
-        try:
-            from pydataset import data_info
-            return True, data, data_info, None
-        except Exception:
-            def _fallback(name: str) -> str:
-                buf = io.StringIO()
-                try:
-                    with contextlib.redirect_stdout(buf):
-                        _ = data(name, show_doc=True)
-                except Exception:
-                    pass
-                return buf.getvalue()
-
-            return True, data, _fallback, None
-    except Exception as e:
-        return False, None, None, repr(e)
+from core.arrowio import widget_table
+from core.catalog import CATALOG
+from core.deps import import_pydataset, pydataset_status
+from core.doc_index import DOC_INDEX
+from core.memory_cache import DOC_CACHE
+from core.paging import open_dataset
+from core.shared_cache import cached
+from core.instrumentation import timed
+from core.ui import begin_timing, cache_stats_sidebar, lazy_download_button, timing_panel
 
 
 st.set_page_config(page_title="Documentación de pydataset", layout="wide")
+begin_timing("documentacion")
 
+CATALOG_COLUMNS = ['title', 'title_es', 'package', 'rows', 'columns']
 
-@st.cache_data
-def get_catalog() -> pd.DataFrame:
-    ok, data_fn, _, err = _import_pydataset()
-    if not ok or data_fn is None:
-        raise ImportError(f"pydataset no disponible: {err}")
-    return data_fn()
 
-
-@st.cache_data
-def get_show_doc(name: str) -> str:
-    ok, data_fn, _, err = _import_pydataset()
-    if not ok or data_fn is None:
-        raise ImportError(f"pydataset no disponible: {err}")
+def _capture_show_doc(name: str) -> str:
+    pyds = import_pydataset()
+    if not pyds.ok:
+        raise ImportError(f"pydataset no disponible: {pyds.error}")
     buf = io.StringIO()
     try:
         with contextlib.redirect_stdout(buf):
-            _ = data_fn(name, show_doc=True)
+            _ = pyds.data(name, show_doc=True)
     except Exception:
         return buf.getvalue()
     return buf.getvalue()
 
 
+def get_doc_text(name: str) -> str:
+    """Texto de `show_doc` desde el índice de documentación; captura stdout solo si no está indexado."""
+    try:
+        text = DOC_INDEX.ensure().get(name)
+    except Exception:
+        text = None
+    return text if text is not None else _capture_show_doc(name)
+
+
+@timed("doc.text")
+@cached("pydataset_docs", memory=DOC_CACHE)
+def get_show_doc(name: str) -> str:
+    # Caché acotada por proceso (core.memory_cache) delante de la compartida entre réplicas.
+    return get_doc_text(name)
+
+
 def _nav_html() -> str:
         # Eliminado el control con botones porque puede fallar en iframes.
         # Se recomienda usar la barra lateral "Pages" para navegar entre páginas.
@@ -68,34 +65,48 @@ def _nav_html() -> str:
 
 def main() -> None:
     st.title('Documentación de pydataset')
+    import streamlit.components.v1 as components
+
     components.html(_nav_html(), height=70)
 
-    ok, _, _, err = _import_pydataset()
+    ok, info = pydataset_status()
     if not ok:
-        st.error(f'pydataset no instalado: {err}')
+        st.error(f'pydataset no instalado: {info}')
         return
 
-    try:
-        df = get_catalog()
-    except Exception as e:
-        st.error(f'Error cargando catálogo: {e}')
+    # Catálogo unificado (core.catalog): pydataset + traducciones + metadatos, uno por proceso.
+    catalog = CATALOG.catalog()
+    if 'pydataset' in catalog.errors:
+        st.error(f"Error cargando catálogo: {catalog.errors['pydataset']}")
         return
-
-    # Normalizar columnas comunes
-    if 'Item' in df.columns and 'dataset_id' not in df.columns:
-        df = df.rename(columns={'Item': 'dataset_id'})
-    if 'Title' in df.columns and 'title' not in df.columns:
-        df = df.rename(columns={'Title': 'title'})
-    if 'package' not in df.columns:
-        df['package'] = None
+    df = catalog.frame[catalog.frame['in_pydataset']]
 
     st.markdown('## Catálogo')
-    cols = [c for c in ('dataset_id', 'title', 'package') if c in df.columns]
-    st.dataframe(df[cols].head(200), use_container_width=True)
-    st.download_button('Descargar catálogo CSV', data=df.to_csv(index=False).encode('utf-8'), file_name='pydataset_catalog.csv', mime='text/csv')
+    # Las primeras filas de la tabla Arrow del catálogo, sin volver a convertir en cada rerun.
+    st.dataframe(widget_table(catalog.table.slice(0, 200), CATALOG_COLUMNS), use_container_width=True)
+    lazy_download_button('Descargar catálogo CSV', lambda: df.reset_index(), key=('pydataset_catalog', len(df)),
+                         file_stem='pydataset_catalog')
+
+    st.markdown('## Buscar en la documentación')
+    doc_q = st.text_input('Buscar por contenido (p. ej. "air pollution")')
+    matches = []
+    if doc_q:
+        try:
+            with st.spinner('Preparando índice de documentación...'):
+                matches = DOC_INDEX.ensure().search(doc_q)
+        except Exception as e:
+            st.warning(f'No se pudo buscar en la documentación: {e}')
+        if matches:
+            st.dataframe(pd.DataFrame(matches, columns=['dataset_id', 'fragmento']), use_container_width=True)
+        else:
+            st.info('Sin resultados en la documentación.')
 
     st.markdown('## Detalle')
-    ids = sorted(df['dataset_id'].astype(str).unique())
+    ids = sorted(df.index)
+    if matches:
+        # Resultados de la búsqueda primero, por relevancia.
+        ranked = [name for name, _ in matches]
+        ids = ranked + [i for i in ids if i not in set(ranked)]
     sel = st.selectbox('Seleccionar dataset_id', options=ids)
     st.subheader(sel)
     sd = get_show_doc(sel)
@@ -103,6 +114,16 @@ def main() -> None:
         st.code(sd, language='text')
         st.download_button('Descargar show_doc', data=sd, file_name=f'{sel}_show_doc.txt', mime='text/plain')
 
+    if st.checkbox('Mostrar vista previa (primeras 10 filas)', value=False):
+        try:
+            # Misma fuente que la vista previa del catálogo: ventana Arrow del almacén memory-mapped.
+            st.dataframe(widget_table(open_dataset(sel).window_table(0, 10)), use_container_width=True)
+        except Exception as e:
+            st.warning(f'No se pudo cargar `{sel}`: {e}')
+
+    cache_stats_sidebar()
+    timing_panel()
+
 
 if __name__ == '__main__':
     main()
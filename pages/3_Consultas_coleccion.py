@@ -0,0 +1,139 @@
+"""Página: consultas sobre toda la colección de pydataset.
+
+Filtros sobre el catálogo de esquema y estadísticas (`core.collection`) y
+agregaciones que escanean en paralelo solo los datasets seleccionados.
+"""
+from __future__ import annotations
+
+import time
+
+import streamlit as st
+
+from core.arrowio import widget_table
+from core.collection import COLLECTION, KINDS, OPERATORS
+from core.ui import begin_timing, cache_stats_sidebar, timing_panel
+
+KIND_LABELS = {"numeric": "numérica", "categorical": "categórica", "text": "texto",
+               "bool": "booleana", "datetime": "fecha", "other": "otra"}
+
+st.set_page_config(page_title="Consultas sobre la colección", layout="wide")
+begin_timing("coleccion")
+
+
+def _parse_value(text: str):
+    """Número si el texto lo es; si no, el texto tal cual (para comparar columnas de texto)."""
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return int(number) if number.is_integer() else number
+
+
+def _build_collection() -> None:
+    """Almacenar y perfilar la colección con la precarga en paralelo de `core.warmup` (reanudable)."""
+    from core import warmup
+    from core.dataset_store import pydataset_ids
+
+    bar = st.progress(0.0, text="Almacenando y perfilando la colección...")
+
+    def on_result(i: int, total: int, record: dict) -> None:
+        bar.progress(i / total, text=f"[{i}/{total}] {record['name']}" + ("" if record["ok"] else " (error)"))
+
+    records = warmup.run(pydataset_ids(), progress=None, on_result=on_result)
+    failed = [r["name"] for r in records if not r["ok"]]
+    if failed:
+        st.warning(f"{len(failed)} datasets no se pudieron almacenar: {', '.join(failed[:20])}")
+    with st.spinner("Construyendo el catálogo de la colección..."):
+        COLLECTION.catalog(rebuild=True)
+
+
+def main() -> None:
+    st.title("Consultas sobre la colección")
+    st.caption("Preguntas sobre todos los datasets a la vez: se responden con el catálogo de esquema y "
+               "estadísticas, y solo se abren los datasets necesarios cuando hay que mirar los datos.")
+
+    try:
+        catalog = COLLECTION.catalog()
+    except Exception as e:
+        st.error(f"No se pudo preparar el catálogo de la colección: {e}")
+        return
+    if len(catalog) == 0:
+        st.warning("El almacén de datasets está vacío. Se puede poblar desde aquí (varios minutos; si se sale "
+                   "de la página, lo ya almacenado se conserva y se continúa al repetirlo) o, mejor, con "
+                   "`python -m core.collection build --warm`.")
+        if st.button("Almacenar y catalogar toda la colección"):
+            _build_collection()
+            st.experimental_rerun()
+        return
+    st.info(f"Catálogo: {len(catalog)} datasets, {len(catalog.columns)} columnas. Los datasets que aún no "
+            f"están en el almacén no aparecen (`python -m core.collection build --warm`).")
+
+    st.markdown("## Datasets")
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        min_rows = st.number_input("Filas mínimas", min_value=0, value=0, step=1000)
+        max_rows = st.number_input("Filas máximas (0 = sin límite)", min_value=0, value=0, step=1000)
+    with c2:
+        kinds = st.multiselect("Con alguna columna", options=list(KINDS), format_func=KIND_LABELS.get)
+        name = st.text_input("Nombre del dataset contiene")
+    with c3:
+        column = st.text_input("Con una columna cuyo nombre contiene")
+        column_kinds = st.multiselect("... de tipo", options=list(KINDS), format_func=KIND_LABELS.get)
+
+    t = time.perf_counter()
+    datasets = catalog.find_datasets(min_rows=min_rows or None, max_rows=max_rows or None, kinds=kinds,
+                                     name=name, column=column, column_kinds=column_kinds)
+    elapsed = (time.perf_counter() - t) * 1e3
+    st.write(f"{len(datasets)} datasets ({elapsed:.1f} ms)")
+    st.dataframe(widget_table(datasets), use_container_width=True)
+    selected = datasets["dataset"].tolist()
+
+    st.markdown("## Columnas")
+    col_q = st.text_input("Buscar columnas por nombre (p. ej. `price`)")
+    only_selected = st.checkbox("Solo en los datasets filtrados", value=True)
+    if col_q:
+        t = time.perf_counter()
+        columns = catalog.search_columns(col_q, datasets=selected if only_selected else None)
+        elapsed = (time.perf_counter() - t) * 1e3
+        st.write(f"{len(columns)} columnas en {columns['dataset'].nunique()} datasets ({elapsed:.1f} ms)")
+        st.dataframe(widget_table(columns), use_container_width=True)
+
+    st.markdown("## Agregación por columna")
+    numeric = catalog.search_columns(kinds=["numeric"], datasets=selected)
+    options = numeric["column"].value_counts().index.tolist()
+    if not options:
+        st.info("Los datasets filtrados no tienen columnas numéricas.")
+    else:
+        a1, a2, a3, a4 = st.columns([2, 2, 1, 2])
+        with a1:
+            agg_column = st.selectbox("Columna numérica", options=options,
+                                      format_func=lambda c: f"{c} ({int((numeric['column'] == c).sum())} datasets)")
+        with a2:
+            where_column = st.text_input("Filtrar filas por la columna (opcional)")
+        with a3:
+            where_op = st.selectbox("Operador", options=list(OPERATORS), index=4)
+        with a4:
+            where_value = st.text_input("Valor")
+        if st.button("Ejecutar"):
+            where = (where_column.strip(), where_op, _parse_value(where_value)) \
+                if where_column.strip() and where_value != "" else None
+            t = time.perf_counter()
+            try:
+                result, errors = COLLECTION.aggregate(agg_column, names=selected, where=where)
+            except Exception as e:
+                st.error(f"No se pudo ejecutar la agregación: {e}")
+            else:
+                elapsed = (time.perf_counter() - t) * 1e3
+                if errors:
+                    st.warning(f"La agregación falló en {len(errors)} datasets:\n\n"
+                               + "\n".join(f"- **{name}**: {error}" for name, error in sorted(errors.items())))
+                st.write(f"{len(result)} datasets escaneados en {elapsed:.1f} ms; "
+                         f"{int(result['count'].sum())} valores en total")
+                st.dataframe(widget_table(result), use_container_width=True)
+
+    cache_stats_sidebar()
+    timing_panel()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import pandas as pd
-from app import filter_sort_paginate
+from core.filtering import filter_sort_paginate
 
 
 def make_df():
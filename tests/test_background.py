@@ -0,0 +1,159 @@
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures import Future
+
+import pytest
+
+from core.background import BackgroundLoader, neighbours, wait_for
+
+
+class FakeLoads:
+    """Cargas falsas: cada nombre espera a su Event (si lo tiene) y se cuentan las llamadas."""
+
+    def __init__(self):
+        self.calls = []
+        self.gates = {}
+        self.started = {}
+        self.lock = threading.Lock()
+
+    def gate(self, name):
+        self.gates[name] = threading.Event()
+        self.started[name] = threading.Event()
+        return self.gates[name]
+
+    def load(self, name):
+        with self.lock:
+            self.calls.append(("load", name))
+        if name in self.started:
+            self.started[name].set()
+        if name in self.gates:
+            assert self.gates[name].wait(5)
+        return f"src:{name}"
+
+    def profile(self, name):
+        with self.lock:
+            self.calls.append(("profile", name))
+        return f"prof:{name}"
+
+
+def test_neighbours():
+    items = ["a", "b", "c", "d"]
+    assert neighbours(items, "b") == ["c", "a"]
+    assert neighbours(items, "a", radius=2) == ["b", "c"]
+    assert neighbours(items, "x") == []
+
+
+def test_shared_future_and_profile_after_source():
+    fake = FakeLoads()
+    gate = fake.gate("iris")
+    loader = BackgroundLoader(fake.load, fake.profile)
+    h1 = loader.request("s1", "iris")
+    h2 = loader.request("s2", "iris")
+    assert h1.source is h2.source and h1.profile is h2.profile
+    assert fake.started["iris"].wait(5)
+    assert not h1.profile.done()
+    gate.set()
+    assert h1.source.result(5) == "src:iris"
+    assert h1.profile.result(5) == "prof:iris"
+    assert fake.calls == [("load", "iris"), ("profile", "iris")]
+    loader.shutdown()
+
+
+def test_superseded_selection_is_cancelled():
+    fake = FakeLoads()
+    gate = fake.gate("big")
+    loader = BackgroundLoader(fake.load, fake.profile, workers=1)
+    first = loader.request("s1", "big")
+    assert fake.started["big"].wait(5)
+    queued = loader.request("s1", "mtcars")  # en cola detrás de "big"
+    latest = loader.request("s1", "iris")
+    assert queued.source.cancelled() and queued.profile.cancelled()
+    assert not first.source.cancelled()  # ya había empezado
+    gate.set()
+    assert latest.profile.result(5) == "prof:iris"
+    assert ("load", "mtcars") not in fake.calls
+    assert loader.cancelled >= 2
+    loader.shutdown()
+
+
+def test_selection_wanted_by_other_session_is_kept():
+    fake = FakeLoads()
+    gate = fake.gate("big")
+    loader = BackgroundLoader(fake.load, fake.profile, workers=1)
+    loader.request("s1", "big")
+    assert fake.started["big"].wait(5)
+    h = loader.request("s1", "mtcars")
+    loader.request("s2", "mtcars")
+    loader.request("s1", "iris")
+    assert not h.source.cancelled()
+    gate.set()
+    assert h.source.result(5) == "src:mtcars"
+    loader.shutdown()
+
+
+def test_prefetch_neighbours():
+    fake = FakeLoads()
+    loader = BackgroundLoader(fake.load, fake.profile)
+    items = ["a", "b", "c"]
+    handle = loader.request("s1", "b", prefetch=neighbours(items, "b"))
+    handle.profile.result(5)
+    loader._prefetch_pool.shutdown(wait=True)
+    loads = {name for kind, name in fake.calls if kind == "load"}
+    assert loads == {"a", "b", "c"}
+    profiles = {name for kind, name in fake.calls if kind == "profile"}
+    assert profiles == {"b"}  # los vecinos solo se cargan
+    loader.shutdown()
+
+
+def test_load_error_reaches_profile():
+    def boom(name):
+        raise KeyError(name)
+
+    loader = BackgroundLoader(boom, lambda name: "nunca")
+    handle = loader.request("s1", "nope")
+    with pytest.raises(KeyError):
+        handle.source.result(5)
+    with pytest.raises(KeyError):
+        handle.profile.result(5)
+    loader.shutdown()
+
+
+def test_wait_for_ticks_and_timeout():
+    ticks = []
+    with pytest.raises(FutureTimeout):
+        wait_for(Future(), timeout=0.3, poll=0.05, on_tick=ticks.append)
+    assert len(ticks) >= 3
+    done = Future()
+    done.set_result(42)
+    assert wait_for(done, timeout=1) == 42
+
+
+def test_idle_owners_expire_and_stop_protecting_their_loads():
+    fake = FakeLoads()
+    gate = fake.gate("big")
+    now = [0.0]
+    loader = BackgroundLoader(fake.load, fake.profile, workers=1, owner_ttl=60, clock=lambda: now[0])
+    loader.request("s1", "big")
+    assert fake.started["big"].wait(5)
+    stale = loader.request("s2", "mtcars")  # en cola; s2 no vuelve a pedir nada
+    now[0] = 61
+    loader.request("s1", "iris")
+    assert stale.source.cancelled() and loader.owners() == 1
+    loader.release("s1")
+    assert loader.owners() == 0 and not loader._last_seen and not loader._prefetch_wanted
+    gate.set()
+    loader.shutdown()
+
+
+def test_foreground_request_promotes_queued_prefetch():
+    fake = FakeLoads()
+    gate = fake.gate("slow")
+    loader = BackgroundLoader(fake.load, fake.profile)
+    loader.request("s1", "a", prefetch=["slow", "b"])
+    assert fake.started["slow"].wait(5)  # ocupa el único hilo de precarga; "b" queda en cola
+    queued = loader._futures[("source", "b")]
+    handle = loader.request("s1", "b")
+    assert queued.cancelled() and handle.source is not queued
+    assert handle.profile.result(5) == "prof:b"  # sin esperar a que termine "slow"
+    gate.set()
+    loader.shutdown()
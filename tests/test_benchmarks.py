@@ -0,0 +1,20 @@
+from benchmarks.suite import compare, measure, run
+
+
+def test_measure_reports_percentiles_and_peak_memory():
+    stats = measure(lambda: bytearray(2_000_000), repeat=3)
+    assert stats["p50_ms"] <= stats["p95_ms"] and stats["repeat"] == 3
+    assert stats["peak_mb"] >= 2.0
+
+
+def test_compare_flags_only_real_regressions():
+    base = {"results": {"a": {"p50_ms": 10.0}, "b": {"p50_ms": 10.0}, "tiny": {"p50_ms": 0.1}}}
+    current = {"results": {"a": {"p50_ms": 11.0}, "b": {"p50_ms": 20.0}, "tiny": {"p50_ms": 0.5},
+                           "new": {"p50_ms": 5.0}}}
+    regressions = compare(current, base, threshold=1.25)
+    assert len(regressions) == 1 and regressions[0].startswith("b:")
+
+
+def test_small_run_is_headless():
+    report = run(sizes=[200], repeat=1, excel_max_rows=0, pages=False, progress=None)
+    assert {"search[200]", "sort[200]", "export_csv[200]", "dataset_load[200]"} <= set(report["results"])
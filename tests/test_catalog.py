@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from core.catalog import COLUMNS, DATA_FILE, CatalogService, join_catalogs, normalize_pydataset_catalog
+from core.dataset_store import DatasetStore
+
+
+@pytest.fixture
+def service(tmp_path):
+    return CatalogService(DATA_FILE, DatasetStore(tmp_path / "datasets"), excel_cache_dir=tmp_path)
+
+
+def test_join_catalogs_merges_sources_and_metadata():
+    pydataset = normalize_pydataset_catalog(pd.DataFrame({"Item": ["iris", "cars", "iris"],
+                                                          "Title": ["Iris", "Cars", "Iris (MASS)"]}))
+    translated = pd.DataFrame({"dataset_id": ["cars", "solo_es"], "title": ["Cars", "Only"],
+                               "title_es": ["Coches", "Solo"]})
+    manifest = {"iris": {"rows": 150, "columns": 5, "nbytes": 4000, "memory": {"after": 1000}}}
+    df = join_catalogs(translated, pydataset, {"iris": "datasets"}, manifest)
+    assert df.index.tolist() == ["iris", "cars", "solo_es"] and list(df.columns) == COLUMNS
+    assert df.loc["iris", "title"] == "Iris" and pd.isna(df.loc["iris", "title_es"])
+    assert df.loc["solo_es", "title"] == "Only" and not df.loc["solo_es", "in_pydataset"]
+    assert df.loc["cars", "title_es"] == "Coches" and df.loc["cars", "translated"]
+    assert df.loc["iris", "package"] == "datasets" and df.loc["iris", "rows"] == 150
+    assert df.loc["iris", "memory_bytes"] == 1000 and not df.loc["cars", "stored"]
+    assert join_catalogs(None, None, {}, {}).empty
+
+
+def test_service_builds_once_and_refreshes_when_store_changes(service):
+    catalog = service.catalog()
+    assert service.catalog() is catalog and not catalog.errors
+    assert catalog.frame.index.is_unique and len(catalog) > 700
+    iris = catalog.get("iris")
+    assert iris["title_es"] and iris["package"] == "datasets" and iris["rows"] is None
+    assert catalog.get("no_existe") is None
+    assert service.translated() is service.translated()  # una copia por proceso
+    service.store.put("iris", pd.DataFrame({"x": [1, 2, 3]}))
+    rebuilt = service.catalog()
+    assert rebuilt is not catalog and rebuilt.get("iris")["rows"] == 3
+    assert rebuilt.summary()["stored"] == 1
+    assert rebuilt.table.num_rows == len(rebuilt)
+
+
+def test_store_changes_refresh_only_changed_rows(service, monkeypatch):
+    catalog = service.catalog()
+    monkeypatch.setattr(service, "build", lambda: pytest.fail("no debe reconstruirse el catálogo"))
+    service.store.put("iris", pd.DataFrame({"x": [1, 2, 3]}))
+    service.store.put("fuera_del_catalogo", pd.DataFrame({"x": [1]}))
+    refreshed = service.catalog()
+    assert refreshed is not catalog and refreshed.get("iris")["rows"] == 3 and refreshed.get("iris")["stored"]
+    assert refreshed.frame.drop(index="iris").equals(catalog.frame.drop(index="iris"))
+    assert refreshed.frame.dtypes.equals(catalog.frame.dtypes)
+    service.store.invalidate("iris")
+    cleared = service.catalog()
+    assert not cleared.get("iris")["stored"] and cleared.get("iris")["rows"] is None
+    assert cleared.summary()["stored"] == 0
+
+
+def test_service_without_translations(tmp_path):
+    service = CatalogService(tmp_path / "no_existe.xlsx", DatasetStore(tmp_path / "datasets"), excel_cache_dir=tmp_path)
+    catalog = service.catalog()
+    assert not service.has_translations() and catalog.summary()["translated"] == 0
+    assert catalog.get("iris")["in_pydataset"]
@@ -0,0 +1,66 @@
+import pandas as pd
+import pytest
+
+from core.collection import Collection
+from core.dataset_store import DatasetStore
+from core.profiling import ProfileStore
+
+NAMES = ["iris", "mtcars", "diamonds", "cats", "Titanic"]
+
+
+@pytest.fixture(scope="module")
+def collection(tmp_path_factory):
+    root = tmp_path_factory.mktemp("collection")
+    store = DatasetStore(root / "datasets")
+    assert not store.warm(NAMES, progress=None)
+    return Collection(store, ProfileStore(root / "profiles"), root / "catalog", workers=2)
+
+
+def test_catalog_schema_and_stats(collection):
+    catalog = collection.catalog()
+    assert sorted(catalog.datasets["dataset"]) == sorted(NAMES)
+    diamonds = catalog.datasets.set_index("dataset").loc["diamonds"]
+    assert diamonds["rows"] == 53940 and diamonds["columns"] == 10
+    assert diamonds["numeric_columns"] == 7 and diamonds["categorical_columns"] == 3
+    carat = catalog.columns[(catalog.columns["dataset"] == "diamonds") & (catalog.columns["column"] == "carat")].iloc[0]
+    assert carat["kind"] == "numeric" and carat["min"] == pytest.approx(0.2) and carat["nulls"] == 0
+
+
+def test_collection_wide_filters(collection):
+    catalog = collection.catalog()
+    big = catalog.find_datasets(min_rows=10_000, kinds=["numeric"])
+    assert big["dataset"].tolist() == ["diamonds"]
+    with_sex = catalog.search_columns("SEX")
+    assert sorted(with_sex["dataset"]) == ["Titanic", "cats"]
+    assert catalog.find_datasets(column="sex", column_kinds=["categorical"], max_rows=100)["dataset"].tolist() == ["Titanic"]
+    assert catalog.find_datasets(name="CAR")["dataset"].tolist() == ["mtcars"]
+
+
+def test_catalog_is_persisted_and_rebuilt_when_store_changes(collection):
+    catalog = collection.catalog()
+    assert collection.catalog() is catalog
+    fresh = Collection(collection.store, collection.profiles, collection.root)
+    assert len(fresh.catalog()) == len(catalog)  # leído del disco
+    collection.store.put("extra", pd.DataFrame({"price": [1.0, 2.5]}))
+    assert "extra" in set(collection.catalog().datasets["dataset"])
+    collection.store.invalidate("extra")
+
+
+def test_parallel_aggregate_with_where(collection):
+    plain, errors = collection.aggregate("carat")
+    assert plain["dataset"].tolist() == ["diamonds"] and not errors
+    assert plain.iloc[0]["count"] == 53940
+    filtered, _ = collection.aggregate("Freq", where=("Sex", "==", "Male"))
+    row = filtered.set_index("dataset").loc["Titanic"]
+    assert row["rows"] == 16 and row["sum"] == 1731
+    assert collection.aggregate("mpg", names=["iris"])[0].empty
+    with pytest.raises(ValueError):
+        collection.aggregate("mpg", where=("cyl", "~", 4))
+    results, errors = collection.scan(lambda name, table: table.num_rows, ["iris", "no_existe"])
+    assert results == {"iris": 150} and set(errors) == {"no_existe"}
+
+
+def test_aggregate_reports_where_type_errors(collection):
+    result, errors = collection.aggregate("price", where=("carat", ">", "uno"))
+    assert result.empty and set(errors) == {"diamonds"}
+    assert "Arrow" in errors["diamonds"]
@@ -0,0 +1,50 @@
+import json
+
+import pandas as pd
+import pytest
+
+from core.dataset_store import DatasetStore, load_from_pydataset
+from core.dtypes import compact_frame
+
+
+def test_put_get_roundtrip_keeps_index_and_dtypes(tmp_path):
+    store = DatasetStore(tmp_path)
+    df = pd.DataFrame({"a": [1, 2, 3], "b": [0.5, None, 1.5], "c": ["x", "y", "z"]},
+                      index=pd.Index(["r1", "r2", "r3"]))
+    meta = store.put("demo", df)
+    assert meta["rows"] == 3 and [f["name"] for f in meta["schema"]] == ["a", "b", "c"]
+    assert "demo" in store
+    # Se guarda con tipos compactos: mismos valores e índice, tipos reducidos.
+    pd.testing.assert_frame_equal(store.get("demo"), compact_frame(df)[0])
+    pd.testing.assert_frame_equal(store.get("demo"), df, check_dtype=False)
+    assert store.get_table("demo").num_rows == 3
+    assert set(store.manifest()) == {"demo"}
+
+
+def test_get_persists_pydataset_on_first_use(tmp_path):
+    store = DatasetStore(tmp_path)
+    assert "cats" not in store
+    df = store.get("cats")
+    assert "cats" in store
+    pd.testing.assert_frame_equal(store.get("cats"), compact_frame(load_from_pydataset("cats"))[0])
+    assert store.meta("cats")["rows"] == len(df)
+
+
+def test_unknown_and_invalid_names(tmp_path):
+    store = DatasetStore(tmp_path)
+    with pytest.raises(KeyError):
+        store.get("../etc")
+    assert store.warm(["no_such_dataset_xyz"], progress=None)
+
+
+def test_entries_of_another_format_version_are_restored(tmp_path):
+    store = DatasetStore(tmp_path)
+    store.get("cats")
+    meta_path = tmp_path / "cats.json"
+    old = json.loads(meta_path.read_text(encoding="utf-8"))
+    old.pop("version")  # como un almacén escrito antes de la compactación de tipos
+    meta_path.write_text(json.dumps(old), encoding="utf-8")
+    assert "cats" not in store and store.meta("cats") is None and store.manifest() == {}
+    store.get("cats")
+    assert "cats" in store and "memory" in store.meta("cats")
+    assert store.warm(["cats"], progress=None) == {}
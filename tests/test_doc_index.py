@@ -0,0 +1,23 @@
+import contextlib
+import io
+
+from pydataset import data
+
+from core.doc_index import DocIndex, pydataset_doc_paths
+
+
+def test_index_matches_show_doc_and_searches(tmp_path):
+    paths = pydataset_doc_paths()
+    index = DocIndex(tmp_path / "docs.sqlite")
+    assert index.get("iris") is None
+    assert index.build({n: paths[n] for n in ("iris", "airquality", "cats")}) == 3
+
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        data("iris", show_doc=True)
+    assert index.get("iris") == buf.getvalue()
+    assert index.names() == ["airquality", "cats", "iris"]
+
+    assert [name for name, _ in index.search("ozone")] == ["airquality"]
+    assert [name for name, _ in index.search("Sépal")] == ["iris"]  # sin acentos ni mayúsculas
+    assert index.search('"; DROP TABLE docs') == []
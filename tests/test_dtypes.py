@@ -0,0 +1,63 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.dataset_store import load_from_pydataset, pydataset_ids
+from core.dtypes import compact_frame
+from core.profiling import profile_frame
+
+
+def test_compact_frame_columns():
+    df = pd.DataFrame({
+        "small": [1, 2, 3, 4],
+        "big": [0, 2**40, 5, 6],
+        "exact": [0.5, 1.25, np.nan, 2.0],
+        "inexact": [0.1, 0.2, 0.3, 0.4],
+        "group": ["a", "a", "a", None],
+        "text": ["w", "x", "y", "z"],
+        "mixed": ["a", 1, "b", 2.5],
+    })
+    out, report = compact_frame(df)
+    assert str(out["small"].dtype) == "int8" and out["big"].dtype == np.int64
+    assert out["exact"].dtype == np.float32 and out["inexact"].dtype == np.float64
+    assert isinstance(out["group"].dtype, pd.CategoricalDtype)
+    assert out["text"].dtype == pd.StringDtype("pyarrow")
+    assert out["mixed"].dtype == object
+    assert set(report["columns"]) == {"small", "exact", "group", "text"}
+    assert report["bytes_after"] < report["bytes_before"]
+    assert df["small"].dtype == np.int64  # el original no se modifica
+    pd.testing.assert_frame_equal(out.astype(object).where(out.notna(), None),
+                                  df.astype(object).where(df.notna(), None))
+
+
+@pytest.mark.filterwarnings("ignore")
+def test_bundled_collection_keeps_values_and_shrinks():
+    before = after = 0
+    for name in pydataset_ids():
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            df = load_from_pydataset(name)
+        out, report = compact_frame(df)
+        before += report["bytes_before"]
+        after += report["bytes_after"]
+        assert report["bytes_after"] <= report["bytes_before"], name
+        for c in range(df.shape[1]):
+            original, compact = df.iloc[:, c], out.iloc[:, c]
+            if original.dtype.kind == "f":
+                np.testing.assert_array_equal(compact.to_numpy(dtype=float), original.to_numpy(), err_msg=name)
+            else:
+                assert original.isna().equals(compact.isna()), name
+                mask = original.notna().to_numpy()
+                assert list(compact.to_numpy(dtype=object)[mask]) == list(original.to_numpy(dtype=object)[mask]), name
+    assert after < 0.6 * before
+
+
+def test_profile_unchanged_by_compaction():
+    df = load_from_pydataset("Titanic")
+    plain, compact = profile_frame(df), profile_frame(compact_frame(df)[0])
+    for a, b in zip(plain.columns, compact.columns):
+        assert (a.numeric, a.count, a.nunique, a.unique, a.freq) == (b.numeric, b.count, b.nunique, b.unique, b.freq)
+        assert a.stats == b.stats
+        assert dict(map(tuple, a.values)) == dict(map(tuple, b.values))
@@ -0,0 +1,112 @@
+import ast
+import os
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+from core.excel_cache import ExcelCache, read_workbook, upload_digest
+
+
+def write_xlsx(path, frames):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for name, frame in frames.items():
+            frame.to_excel(writer, sheet_name=name, index=False)
+
+
+def test_roundtrip_and_reuse(tmp_path):
+    xlsx = tmp_path / "catalog.xlsx"
+    a = pd.DataFrame({"dataset_id": ["x", "y"], "title": ["X", "Y"], "n": [1, 2]})
+    b = pd.DataFrame({"dataset_id": ["z"], "title": ["Z"], "n": [3]})
+    write_xlsx(xlsx, {"A": a, "B": b})
+
+    cache = ExcelCache(xlsx, cache_dir=tmp_path / "cache")
+    assert cache.sheet_names() == ["A", "B"]
+    assert cache.converted
+    pd.testing.assert_frame_equal(cache.load("B"), b)
+
+    again = ExcelCache(xlsx, cache_dir=tmp_path / "cache")
+    pd.testing.assert_frame_equal(again.load("A"), a)
+    assert not again.converted
+    assert set(again.load(None)) == {"A", "B"}
+
+
+def test_touch_keeps_cache_and_content_change_reconverts(tmp_path):
+    xlsx = tmp_path / "catalog.xlsx"
+    write_xlsx(xlsx, {"S": pd.DataFrame({"v": [1]})})
+    cache = ExcelCache(xlsx, cache_dir=tmp_path / "cache")
+    cache.load("S")
+
+    st = xlsx.stat()
+    os.utime(xlsx, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000_000))
+    cache.load("S")
+    assert not cache.converted
+
+    write_xlsx(xlsx, {"S": pd.DataFrame({"v": [1, 2]})})
+    assert cache.load("S")["v"].tolist() == [1, 2]
+    assert cache.converted
+
+
+def test_read_workbook_matches_pandas_in_one_pass(tmp_path):
+    xlsx = tmp_path / "libro.xlsx"
+    a = pd.DataFrame({"id": ["x", "y", None], "n": [1, 2, 3], "v": [0.5, None, 2.0], "mixto": ["a", 1, 2.5]})
+    b = pd.DataFrame({"dataset_id": ["z"], "title": ["Z"]})
+    write_xlsx(xlsx, {"A": a, "B": b})
+    tables = read_workbook(xlsx.read_bytes())
+    assert list(tables) == ["A", "B"]
+    expected = pd.read_excel(xlsx, sheet_name=None, engine="openpyxl")
+    got_a = tables["A"].to_pandas()
+    assert got_a["mixto"].tolist() == ["a", "1", "2.5"]  # tipos mezclados -> texto
+    pd.testing.assert_frame_equal(got_a.drop(columns="mixto").fillna(-1), expected["A"].drop(columns="mixto").fillna(-1))
+    pd.testing.assert_frame_equal(tables["B"].to_pandas(), expected["B"])
+
+
+def test_read_workbook_headers_and_blank_edges(tmp_path):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "S"
+    ws.append(["a", None, "a", None])
+    ws.append([1, 2, 3, None])
+    ws.append([None, None, None, None])
+    ws.cell(row=6, column=1, value=None)
+    wb.create_sheet("Vacía")
+    wb.save(tmp_path / "b.xlsx")
+    tables = read_workbook(tmp_path / "b.xlsx")
+    assert tables["S"].column_names == ["a", "Unnamed: 1", "a.1"]
+    assert tables["S"].num_rows == 1
+    assert tables["Vacía"].num_columns == 0
+    assert upload_digest(b"abc") == upload_digest(b"abc") != upload_digest(b"abd")
+
+
+def _page_function(page: str, name: str):
+    """Una función de nivel de módulo de una página (las páginas no se pueden importar en los tests)."""
+    import streamlit as st
+
+    path = Path(__file__).resolve().parent.parent / "pages" / page
+    fn = next(n for n in ast.parse(path.read_text(encoding="utf-8")).body
+              if isinstance(n, ast.FunctionDef) and n.name == name)
+    namespace = {"st": st, "pd": pd, "Dict": Dict, "read_workbook": read_workbook}
+    exec(compile(ast.Module(body=[fn], type_ignores=[]), str(path), "exec"), namespace)
+    return namespace[name]
+
+
+def test_uploaded_workbook_is_shared_across_reruns(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from streamlit.runtime.caching import cache_data_api, cache_resource_api
+
+    # Sin servidor no hay contexto de ejecución y las cachés de Streamlit no guardan nada: se simula uno.
+    ctx = SimpleNamespace(session_state={})
+    for api in (cache_data_api, cache_resource_api):
+        monkeypatch.setattr(api, "get_script_run_ctx", lambda: ctx)
+    xlsx = tmp_path / "subido.xlsx"
+    write_xlsx(xlsx, {"A": pd.DataFrame({"dataset_id": ["x"], "title": ["X"]})})
+    data = xlsx.read_bytes()
+    load = _page_function("1_Catalogo_traducido.py", "load_uploaded_workbook")
+    load.clear()
+    first = load(upload_digest(data), data)
+    # Segundo rerun: el mismo objeto por la huella, sin re-parsear, copiar ni serializar el dict.
+    assert load(upload_digest(data), data) is first
+    assert list(first) == ["A"] and first["A"]["dataset_id"].tolist() == ["x"]
@@ -0,0 +1,48 @@
+import io
+
+import pandas as pd
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from core.export import ExportCache, export_bytes, iter_export
+
+
+def make_df(n=25):
+    return pd.DataFrame({"x": range(n), "name": [f"r{i}" for i in range(n)], "mixed": [1, "a", None, 2.5, "b"] * (n // 5)})
+
+
+def test_csv_chunks_match_to_csv():
+    df = make_df()
+    chunks = list(iter_export(df, "csv", chunk_rows=7))
+    assert len(chunks) == 4
+    assert b"".join(chunks) == df.to_csv(index=False).encode("utf-8")
+
+
+def test_parquet_and_feather_roundtrip():
+    df = make_df()
+    pq_bytes = b"".join(iter_export(df, "parquet", chunk_rows=10))
+    assert pq.read_table(io.BytesIO(pq_bytes)).num_rows == len(df)
+    ft_bytes = b"".join(iter_export(df, "feather", chunk_rows=10))
+    back = feather.read_table(io.BytesIO(ft_bytes)).to_pandas()
+    assert back["x"].tolist() == df["x"].tolist()
+
+
+def test_export_bytes_is_cached_by_key():
+    cache = ExportCache()
+    calls = []
+
+    def make():
+        calls.append(1)
+        return make_df(5)
+
+    first = export_bytes(make, "csv", key=("dataset", "demo"), cache=cache)
+    second = export_bytes(make, "csv", key=("dataset", "demo"), cache=cache)
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_cache_evicts_over_budget():
+    cache = ExportCache(max_bytes=10)
+    cache.put("a", b"123456")
+    cache.put("b", b"123456")
+    assert "a" not in cache and "b" in cache
@@ -0,0 +1,37 @@
+import json
+
+from core import instrumentation as inst
+
+
+def test_disabled_records_nothing():
+    inst.reset()
+    inst.begin_rerun("x", enabled=False)
+    assert inst.span("stage") is inst._NULL
+
+    @inst.timed("deco")
+    def f():
+        return 1
+
+    assert f() == 1
+    inst.count("hits")
+    assert inst.summary() == {}
+
+
+def test_trace_nesting_counters_and_exports():
+    inst.reset()
+    trace = inst.begin_rerun("page")
+    with inst.span("outer"):
+        with inst.span("inner"):
+            inst.count("cache.docs.hit", 2)
+    inst.begin_rerun("page", enabled=False)
+    names = {s.name: s for s in trace.spans}
+    assert names["inner"].depth == 1 and names["outer"].depth == 0
+    assert names["inner"].duration <= names["outer"].duration
+    assert trace.counters == {"cache.docs.hit": 2}
+
+    records = [json.loads(line) for line in inst.to_jsonl(trace).splitlines()]
+    assert [r["name"] for r in records] == ["inner", "outer"]
+    text = inst.prometheus_text()
+    assert 'pydatasets_stage_seconds_count{stage="outer"} 1' in text
+    assert 'pydatasets_stage_seconds_bucket{stage="inner",le="+Inf"} 1' in text
+    assert "pydatasets_cache_docs_hit_total 2" in text
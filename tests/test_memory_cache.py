@@ -0,0 +1,38 @@
+import pandas as pd
+
+from core.memory_cache import ByteLRUCache, frame_nbytes
+
+
+def test_lru_eviction_by_bytes_and_counters():
+    cache = ByteLRUCache("t", max_bytes=10, size_of=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+    assert cache.get("a") == "xxxx"  # "a" pasa a ser el más reciente
+    cache.put("c", "xxxx")
+    assert "b" not in cache and "a" in cache and "c" in cache
+    s = cache.stats()
+    assert s["evictions"] == 1 and s["bytes"] == 8 and s["hits"] == 1
+
+
+def test_spill_and_disk_tier():
+    disk = {}
+    cache = ByteLRUCache("t", max_bytes=5, size_of=len, spill=disk.__setitem__, load_spilled=disk.get)
+    loads = []
+
+    def loader(v):
+        loads.append(v)
+        return v
+
+    cache.get_or_load("a", lambda: loader("aaaa"))
+    cache.get_or_load("b", lambda: loader("bbbb"))
+    assert disk == {"a": "aaaa"}
+    assert cache.get_or_load("a", lambda: loader("never")) == "aaaa"
+    assert loads == ["aaaa", "bbbb"]
+    assert cache.stats()["disk_hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_oversized_value_is_not_kept():
+    df = pd.DataFrame({"s": ["x" * 100] * 10})
+    cache = ByteLRUCache("t", max_bytes=frame_nbytes(df) - 1, size_of=frame_nbytes)
+    assert cache.get_or_load("big", lambda: df) is df
+    assert len(cache) == 0
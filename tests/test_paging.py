@@ -0,0 +1,46 @@
+import pandas as pd
+
+from core.dataset_store import DatasetStore
+from core.dtypes import compact_frame
+from core.paging import PagedSource, open_dataset
+
+
+def make_store(tmp_path, monkeypatch, n=10):
+    monkeypatch.setattr("core.dataset_store.BATCH_ROWS", 4)
+    store = DatasetStore(tmp_path)
+    df = pd.DataFrame({"a": range(n), "b": [f"v{i}" for i in range(n)]}, index=[f"r{i}" for i in range(n)])
+    store.put("demo", df)
+    return store, compact_frame(df)[0]  # el almacén sirve los tipos compactos
+
+
+def test_windows_across_batches(tmp_path, monkeypatch):
+    store, df = make_store(tmp_path, monkeypatch)
+    source = PagedSource(store.path("demo"))
+    assert source.shape == (10, 2)
+    assert source.columns == ["a", "b"]
+    pd.testing.assert_frame_equal(source.window(3, 9), df.iloc[3:9])
+    pd.testing.assert_frame_equal(source.page(3, 4), df.iloc[8:10])
+    assert source.window(20, 30).empty
+
+
+def test_column_projection_keeps_index(tmp_path, monkeypatch):
+    store, df = make_store(tmp_path, monkeypatch)
+    window = open_dataset("demo", store=store).window(2, 5, columns=["b"])
+    pd.testing.assert_frame_equal(window, df[["b"]].iloc[2:5])
+
+
+def test_widget_table_projection_metadata_and_string_types(tmp_path, monkeypatch):
+    import pyarrow as pa
+
+    from core.arrowio import widget_table
+
+    store, df = make_store(tmp_path, monkeypatch)
+    window = PagedSource(store.path("demo")).window_table(2, 6, columns=["b"])
+    table = widget_table(window)
+    meta = table.schema.pandas_metadata
+    assert [c["field_name"] for c in meta["columns"]] == ["b", "__index_level_0__"]
+    assert meta["index_columns"] == ["__index_level_0__"]
+    assert table.schema.field("b").type == pa.string()  # el frontend de Streamlit no lee large_string
+    pd.testing.assert_frame_equal(table.to_pandas(), df[["b"]].iloc[2:6], check_dtype=False)
+    sliced = widget_table(pd.DataFrame({"x": range(10)}).iloc[3:5])
+    assert sliced.to_pandas().index.tolist() == [3, 4]
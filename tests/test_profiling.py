@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from core.profiling import DatasetProfile, ProfileStore, profile_frame
+
+
+def make_df():
+    return pd.DataFrame({
+        "n": [1, 2, 2, 3, 10],
+        "x": [0.5, np.nan, 1.5, 2.5, 2.5],
+        "g": ["a", "b", "a", None, "a"],
+        "flag": [True, False, True, True, False],
+    })
+
+
+def test_describe_matches_pandas():
+    df = make_df()
+    profile = profile_frame(df, name="demo")
+    pd.testing.assert_frame_equal(profile.describe_numeric(), df.describe(include=["number"]).transpose(),
+                                  check_names=False)
+    expected = df.describe(include="all").transpose()
+    got = profile.describe_all()
+    assert list(got.columns) == list(expected.columns)
+    assert got.loc["g", "top"] == "a" and got.loc["g", "freq"] == 3 and got.loc["g", "unique"] == 2
+    assert float(got.loc["x", "mean"]) == float(expected.loc["x", "mean"])
+
+
+def test_nunique_and_value_counts():
+    df = make_df()
+    profile = profile_frame(df)
+    assert [c.nunique for c in profile.columns] == df.nunique(dropna=False).tolist()
+    assert profile.value_columns() == ["flag", "g", "n", "x"]
+    vc = profile.value_counts("x")
+    assert vc.iloc[0].tolist() == [2.5, 2]
+    assert vc["count"].sum() == len(df)
+
+
+def test_profile_json_roundtrip_and_chunks():
+    df = pd.DataFrame(np.arange(30, dtype=float).reshape(5, 6), columns=list("abcdef"))
+    profile = profile_frame(df, name="wide", chunk_columns=4)
+    assert [c.name for c in profile.columns] == list("abcdef")
+    back = DatasetProfile.from_dict(profile.to_dict())
+    pd.testing.assert_frame_equal(back.describe_numeric(), profile.describe_numeric())
+
+
+def test_stored_profiles_of_another_version_are_misses(tmp_path):
+    store = ProfileStore(tmp_path)
+    store.put(profile_frame(pd.DataFrame({"a": [1, 2, 2]}), name="demo"))
+    assert "demo" in store and store.get("demo").n_rows == 3
+    path = tmp_path / "demo.json"
+    record = json.loads(path.read_text(encoding="utf-8"))
+    for stale in ({k: v for k, v in record.items() if k != "version"}, {**record, "store_version": 0}):
+        path.write_text(json.dumps(stale), encoding="utf-8")
+        assert "demo" not in store and store.get("demo") is None
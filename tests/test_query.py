@@ -0,0 +1,55 @@
+import pandas as pd
+
+from core.query import CatalogQueryEngine
+
+
+def make_df():
+    return pd.DataFrame([
+        {"dataset_id": "b2", "title": "Second", "title_es": "Segundo"},
+        {"dataset_id": "A1", "title": "First Dataset", "title_es": "Primer Conjunto"},
+        {"dataset_id": "d4", "title": "Fourth", "title_es": "Cuarto"},
+        {"dataset_id": "C3", "title": "Third dataset", "title_es": "Tercer Conjunto"},
+    ])
+
+
+def test_query_is_memoized_per_search_and_sort():
+    engine = CatalogQueryEngine(make_df())
+    r1 = engine.query("dataset", "dataset_id", "asc")
+    assert engine.query(" dataset ", "dataset_id", "asc") is r1
+    assert engine.query("dataset", "dataset_id", "desc") is not r1
+
+
+def test_sorted_pages_and_exports():
+    df = make_df()
+    result = CatalogQueryEngine(df).query("", "dataset_id", "asc")
+    assert result.frame["dataset_id"].tolist() == ["A1", "b2", "C3", "d4"]  # sin distinguir mayúsculas
+    page_df, start, end = result.page(page=2, page_size=3)
+    assert (start, end) == (3, 4)
+    assert page_df["#"].tolist() == [1]
+    assert page_df["dataset_id"].tolist() == ["d4"]
+    assert result.dataset_ids == ["A1", "b2", "C3", "d4"]
+
+
+def test_mixed_column_sorts_with_typed_keys():
+    df = make_df()
+    df["mixed"] = [1, "x", 2.5, None]
+    engine = CatalogQueryEngine(df)
+    assert engine.query("", "mixed", "asc").positions.tolist() == [0, 2, 1, 3]
+    assert engine.query("", "mixed", "desc").positions.tolist() == [1, 2, 0, 3]  # ausentes al final
+
+
+def test_page_table_matches_page_and_slices_without_copy():
+    df = make_df()
+    engine = CatalogQueryEngine(df)
+    unsorted = engine.query("")
+    table, start, end = unsorted.page_table(page=1, page_size=3)
+    assert (start, end) == (0, 3)
+    assert table.column("dataset_id").to_pylist() == ["b2", "A1", "d4"]
+    # Sin filtro ni orden la página es un slice de la tabla del motor (comparte sus buffers).
+    assert table.column("dataset_id").chunk(0).buffers()[1].address == \
+        engine.table.column("dataset_id").chunk(0).buffers()[1].address
+    result = engine.query("", "dataset_id", "asc")
+    table, start, end = result.page_table(page=2, page_size=3)
+    page_df, _, _ = result.page(page=2, page_size=3)
+    assert table.column_names[:4] == ["#", "dataset_id", "title", "title_es"]
+    pd.testing.assert_frame_equal(table.to_pandas(), page_df)
@@ -0,0 +1,71 @@
+import pandas as pd
+
+from benchmarks.synthetic import make_catalog
+from core.query import CatalogQueryEngine
+from core.ranked_search import RankedSearch
+
+
+def make_df():
+    return pd.DataFrame([
+        {"dataset_id": "CanPop", "title": "Canadian Population Data", "title_es": "Datos de población canadienses"},
+        {"dataset_id": "iris", "title": "Edgar Anderson's Iris Data", "title_es": "Datos del iris"},
+        {"dataset_id": "ToothGrowth", "title": "Vitamin C and Tooth Growth", "title_es": "Crecimiento de dientes"},
+        {"dataset_id": "USPop", "title": "Population of the United States", "title_es": "Población de EE. UU."},
+    ])
+
+
+def test_accents_typos_and_prefixes():
+    df = make_df()
+    rs = RankedSearch(df)
+    assert set(df["dataset_id"].iloc[rs.search_positions("poblacion")]) == {"CanPop", "USPop"}
+    assert df["dataset_id"].iloc[rs.search_positions("poblacoin")[0]] in {"CanPop", "USPop"}
+    assert df["dataset_id"].iloc[rs.search_positions("crecim dientes")[0]] == "ToothGrowth"
+    assert rs.search_positions("xyzzy").size == 0
+
+
+def test_exact_id_ranks_first_and_doc_text_is_searched():
+    df = make_df()
+    rs = RankedSearch(df, docs={"iris": "Measurements of sepal and petal length"})
+    assert rs.search_positions("iris")[0] == 1
+    assert rs.search_positions("sepal").tolist() == [1]
+    positions, scores = rs.search("population data", k=1)
+    assert positions.tolist() == [0] and scores[0] > 0
+
+
+def test_dense_and_sparse_scoring_agree():
+    df = make_catalog(4000)
+    rs = RankedSearch(df)
+    for q in ("ventas mensual", "poblacoin", "estudio clima precios"):
+        per_token = [rs._postings(t) for t in q.split()]
+        c1, s1, m1 = rs._score_sparse(per_token)
+        c2, s2, m2 = rs._score_dense(per_token)
+        assert c1.tolist() == c2.tolist() and m1.tolist() == m2.tolist()
+        assert abs(s1 - s2).max() < 1e-9
+
+
+def test_engine_ranked_mode():
+    engine = CatalogQueryEngine(make_df())
+    result = engine.query("poblacion", mode="ranked")
+    assert set(result.frame["dataset_id"]) == {"CanPop", "USPop"}
+    by_id = engine.query("poblacion", "dataset_id", "desc", mode="ranked")
+    assert by_id.frame["dataset_id"].tolist() == ["USPop", "CanPop"]
+
+
+def test_ranked_mode_keeps_every_exact_match():
+    df = make_catalog(2000)
+    engine = CatalogQueryEngine(df, top_k=20)
+    for q in ("a", "data", "ven"):
+        exact, ranked = engine.query(q), engine.query(q, mode="ranked")
+        assert set(exact.positions) <= set(ranked.positions)
+        assert len(set(ranked.positions)) == ranked.total >= exact.total
+    assert engine.query("a", mode="ranked").truncated and not engine.query("a").truncated
+    assert not CatalogQueryEngine(make_df()).query("poblacion", mode="ranked").truncated
+
+
+def test_engine_builds_ranker_on_first_ranked_query(monkeypatch):
+    monkeypatch.setattr("core.query.doc_texts", lambda: {"iris": "Measurements of sepal and petal length"})
+    engine = CatalogQueryEngine(make_df())
+    engine.query("sepal")
+    assert engine.ranker is None  # la búsqueda exacta no lo construye
+    assert engine.query("sepal", mode="ranked").frame["dataset_id"].tolist() == ["iris"]
+    assert engine.ranker is not None
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from core.search_index import SearchIndex
+
+
+def make_df():
+    return pd.DataFrame([
+        {"dataset_id": "AirPassengers", "title": "Monthly Airline Passenger Numbers", "title_es": "Pasajeros de líneas aéreas"},
+        {"dataset_id": "CanPop", "title": "Canadian Population", "title_es": "Población de Canadá"},
+        {"dataset_id": "cats", "title": "Anatomical Data from Domestic Cats", "title_es": "Datos anatómicos de gatos"},
+        {"dataset_id": "x1", "title": None, "title_es": "Sin título"},
+    ])
+
+
+def mask_positions(df, q):
+    mask = False
+    for c in ("dataset_id", "title", "title_es"):
+        mask = mask | df[c].astype(str).str.contains(q, case=False, na=False, regex=False)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def test_matches_str_contains_on_plain_queries():
+    df = make_df()
+    index = SearchIndex(df)
+    for q in ["a", "ca", "cat", "passenger", "DATA", "zzz", "opulation"]:
+        assert index.search(q).tolist() == mask_positions(df, q).tolist(), q
+
+
+def test_accent_insensitive():
+    index = SearchIndex(make_df())
+    assert index.search("poblacion").tolist() == [1]
+    assert index.search("AÉREAS").tolist() == [0]
+
+
+def test_no_match_across_columns():
+    index = SearchIndex(make_df())
+    # "cats" + "anatomical" no debe unir dataset_id y title
+    assert index.search("catsanat").tolist() == []
+
+
+def test_empty_query_returns_all_and_tokens():
+    index = SearchIndex(make_df())
+    assert index.search("  ").tolist() == [0, 1, 2, 3]
+    assert index.search_tokens("datos gatos").tolist() == [2]
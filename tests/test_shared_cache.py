@@ -0,0 +1,94 @@
+import multiprocessing as mp
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from core import dataset_store
+from core.memory_cache import ByteLRUCache, _make_dataset_cache
+from core.shared_cache import SharedCache, cached
+
+
+def _slow_frame(counter):
+    with open(counter, "a") as fh:
+        fh.write("x")
+    time.sleep(0.3)
+    return pd.DataFrame({"a": range(1000), "b": ["x"] * 1000})
+
+
+def _worker(root, counter, out):
+    df = SharedCache(root).get_or_load("datasets", "cold", lambda: _slow_frame(counter))
+    with open(out, "a") as fh:
+        fh.write(f"{len(df)}\n")
+
+
+def test_roundtrip_types(tmp_path):
+    cache = SharedCache(tmp_path)
+    df = pd.DataFrame({"x": [1.5, 2.5]}, index=["a", "b"])
+    cache.put("ns", ("k", 1), df)
+    cache.put("ns", "texto", "¿documentación?")
+    cache.put("ns", "dict", {"a": [1, 2]})
+    pd.testing.assert_frame_equal(cache.get("ns", ("k", 1)), df)
+    assert cache.get("ns", "texto") == "¿documentación?"
+    assert cache.get("ns", "dict") == {"a": [1, 2]}
+    assert cache.get("ns", "missing", "default") == "default"
+
+
+def test_single_flight_across_processes(tmp_path):
+    counter, out = tmp_path / "loads", tmp_path / "out"
+    ctx = mp.get_context("spawn")
+    procs = [ctx.Process(target=_worker, args=(str(tmp_path / "shared"), str(counter), str(out))) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+    assert counter.read_text() == "x"  # un único loader para los 4 procesos
+    assert out.read_text().split() == ["1000"] * 4
+
+
+def test_cached_decorator_tiers(tmp_path):
+    calls = []
+    memory = ByteLRUCache("test", 1 << 20)
+
+    @cached("docs", memory=memory, shared=SharedCache(tmp_path))
+    def doc(name):
+        calls.append(name)
+        return f"doc de {name}"
+
+    assert doc("iris") == "doc de iris" and doc("iris") == "doc de iris"
+    assert calls == ["iris"] and memory.stats()["hits"] == 1
+    memory.clear()  # otra réplica: memoria vacía, disco compartido
+    assert doc("iris") == "doc de iris" and calls == ["iris"]
+
+
+def test_dataset_store_loads_cold_dataset_once(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_load(name):
+        calls.append(name)
+        time.sleep(0.2)
+        return pd.DataFrame({"v": [1, 2, 3]})
+
+    monkeypatch.setattr(dataset_store, "load_from_pydataset", fake_load)
+    store = dataset_store.DatasetStore(tmp_path)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        frames = list(pool.map(lambda _: store.get("cold"), range(8)))
+    assert calls == ["cold"]
+    assert all(f["v"].tolist() == [1, 2, 3] for f in frames)
+
+
+def test_cached_with_dataset_cache_past_spill_threshold(tmp_path, monkeypatch):
+    # Las claves de `cached` son tuplas: no deben llegar al almacén de datasets al cargar ni al desalojar.
+    monkeypatch.setattr(dataset_store, "STORE", dataset_store.DatasetStore(tmp_path / "store"))
+    monkeypatch.setenv("PYDATASETS_DATASET_CACHE_MB", "0.02")
+    memory = _make_dataset_cache()
+
+    @cached("frames", memory=memory, shared=SharedCache(tmp_path / "shared"))
+    def frame(n):
+        return pd.DataFrame({"a": range(n)})
+
+    for n in (1000, 2000, 3000, 1000):
+        assert len(frame(n)) == n
+    assert memory.stats()["bytes"] <= memory.max_bytes
+    assert not list((tmp_path / "store").glob("*.arrow"))
@@ -0,0 +1,68 @@
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from core.snippets import SnippetStore, StaleSnippetError, content_sha
+
+
+def _save_many(root, worker, n):
+    store = SnippetStore(root, watch=False, dataset_ids=list)
+    for i in range(n):
+        store.save("shared.md", f"worker {worker} rev {i}\n" * 200)
+
+
+def test_stale_editor_is_rejected(tmp_path):
+    store = SnippetStore(tmp_path, watch=False, dataset_ids=lambda: ["cats"])
+    base = store.get("cats.md").sha256
+    first = store.save("cats.md", "sesión A", expected_sha=base)
+    assert store.get("cats.md").content == "sesión A" and store.is_override("cats.md")
+    with pytest.raises(StaleSnippetError):
+        store.save("cats.md", "sesión B", expected_sha=base)  # B abrió la versión generada
+    assert (tmp_path / "cats.md").read_text(encoding="utf-8") == "sesión A"
+    assert store.save("cats.md", "sesión A 2", expected_sha=first) == content_sha("sesión A 2")
+    revs = store.revisions("cats.md")
+    assert [r["content"] for r in revs] == ["sesión A", "sesión A 2"]
+    assert revs[1]["prev_sha"] == first
+
+
+def test_invalid_names_are_rejected(tmp_path):
+    store = SnippetStore(tmp_path, watch=False, dataset_ids=list)
+    for name in ("../x.md", "x.txt", ".revisions.jsonl"):
+        with pytest.raises(ValueError):
+            store.save(name, "x")
+
+
+def test_concurrent_threads_same_base_only_one_wins(tmp_path):
+    store = SnippetStore(tmp_path, watch=False, dataset_ids=list)
+    base = store.save("a.md", "base")
+
+    def attempt(i):
+        try:
+            store.save("a.md", f"editor {i}", expected_sha=base)
+            return True
+        except StaleSnippetError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(attempt, range(32)))
+    assert sum(results) == 1
+    assert len(store.revisions("a.md")) == 2
+    assert not list(tmp_path.glob(".a.md.*.tmp"))
+
+
+def test_concurrent_processes_never_leave_partial_files(tmp_path):
+    ctx = mp.get_context("spawn")
+    procs = [ctx.Process(target=_save_many, args=(str(tmp_path), w, 15)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+        assert p.exitcode == 0
+    final = (tmp_path / "shared.md").read_text(encoding="utf-8")
+    lines = set(final.splitlines())
+    assert len(lines) == 1 and len(final.splitlines()) == 200  # una versión completa, sin mezclas
+    store = SnippetStore(tmp_path, watch=False, dataset_ids=list)
+    revs = store.revisions("shared.md")
+    assert len(revs) == 60  # todas las líneas del log están completas
+    assert revs[-1]["content"] == final
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from core.profiling import profile_frame
+from core.snippet_template import render_snippet
+
+
+def test_render_plain_snippet():
+    text = render_snippet("cats")
+    assert text.startswith("```python\n# Código Colab para dataset: cats\n")
+    assert "pd.read_csv('data/cats.csv')" in text
+    assert text.endswith("display(df.describe(include='all'))\n```\n")
+
+
+def test_render_with_profile_sections():
+    df = pd.DataFrame({"g": ["a", "b", "a"], "x": [1.5, 2.5, 3.5]})
+    text = render_snippet("demo", profile_frame(df, "demo"))
+    assert "#   g: object" in text and "#   x: float64" in text
+    assert "for col in ['g', 'x']:" in text
+    assert render_snippet("demo", profile_frame(df, "demo")) is text  # LRU
@@ -0,0 +1,67 @@
+import time
+
+from core.snippets import PREVIEW_MAX_LINES, Snippet, SnippetStore
+
+
+def test_listing_filter_and_content_search(tmp_path):
+    (tmp_path / "cats.md").write_text("df = data('cats')\n", encoding="utf-8")
+    (tmp_path / "Población.md").write_text("# Crecimiento de población\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("ignored", encoding="utf-8")
+    store = SnippetStore(tmp_path, watch=False, dataset_ids=list)
+    assert store.names() == ["Población.md", "cats.md"]
+    assert store.filter_names("POBLACION") == ["Población.md"]
+    assert store.search("crecimiento") == ["Población.md"]
+    assert store.get("cats.md").n_lines == 1
+
+
+def test_refresh_and_directory_change_without_watchdog(tmp_path):
+    (tmp_path / "a.md").write_text("uno", encoding="utf-8")
+    store = SnippetStore(tmp_path, watch=False, dataset_ids=list)
+    first = store.get("a.md").sha256
+    (tmp_path / "a.md").write_text("dos", encoding="utf-8")
+    store.refresh("a.md")
+    assert store.get("a.md").sha256 != first
+    (tmp_path / "b.md").write_text("tres", encoding="utf-8")
+    assert "b.md" in store.names()  # el mtime del directorio cambió
+
+
+def test_watchdog_invalidation(tmp_path):
+    (tmp_path / "a.md").write_text("uno", encoding="utf-8")
+    store = SnippetStore(tmp_path, watch=True, dataset_ids=list)
+    try:
+        assert store.names() == ["a.md"]
+        (tmp_path / "a.md").write_text("cambiado", encoding="utf-8")
+        deadline = time.time() + 5
+        while store.get("a.md").content != "cambiado" and time.time() < deadline:
+            time.sleep(0.05)
+        assert store.get("a.md").content == "cambiado"
+    finally:
+        store.close()
+
+
+def test_preview_is_truncated():
+    content = "\n".join(f"line {i}" for i in range(PREVIEW_MAX_LINES + 5))
+    snippet = Snippet.from_text("x.md", content)
+    assert snippet.truncated
+    assert snippet.preview.startswith("line 0") and "archivo truncado" in snippet.preview
+
+
+def test_generated_snippets_and_overrides(tmp_path):
+    (tmp_path / "cats.md").write_text("editado", encoding="utf-8")
+    store = SnippetStore(tmp_path, watch=False, dataset_ids=lambda: ["cats", "iris", "iris"])
+    assert store.names() == ["cats.md", "iris.md"]
+    assert store.get("cats.md").content == "editado" and store.is_override("cats.md")
+    assert "data/iris.csv" in store.get("iris.md").content and not store.is_override("iris.md")
+    assert store.search("data/iris") == ["iris.md"]
+    assert store.get("nope.md") is None
+
+
+def test_generated_snippets_are_folded_once(tmp_path, monkeypatch):
+    store = SnippetStore(tmp_path, watch=False, dataset_ids=lambda: ["cats", "iris"])
+    assert store.search("data/iris") == ["iris.md"]
+    folds = []
+    monkeypatch.setattr("core.snippets.fold", lambda text: folds.append(text) or text.casefold())
+    assert store.search("data/cats") == ["cats.md"]
+    assert folds == ["data/cats"]  # solo la consulta
+    (tmp_path / "iris.md").write_text("editado", encoding="utf-8")
+    assert store.search("editado") == ["iris.md"]  # el fichero editado tiene prioridad
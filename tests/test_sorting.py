@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from core.sorting import SortPermutations, column_ranks
+
+
+def test_spanish_collation():
+    s = pd.Series(["ñu", "nube", "Oso", "árbol", "Árbol", "zeta", None, "Nadar"])
+    ordered = s.iloc[SortPermutations(pd.DataFrame({"t": s})).permutation("t")].tolist()
+    assert ordered == ["Árbol", "árbol", "Nadar", "nube", "ñu", "Oso", "zeta", None]
+
+
+def test_numeric_and_datetime_ranks_with_missing():
+    assert column_ranks(pd.Series([3.0, np.nan, 1.0, 3.0])).tolist() == [1, -1, 0, 1]
+    dates = pd.Series(pd.to_datetime(["2021-01-01", None, "2020-01-01"]))
+    assert column_ranks(dates).tolist() == [1, -1, 0]
+
+
+def test_subset_and_permutation_paths_agree():
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({"v": rng.integers(0, 50, n).astype(float), "w": rng.choice(["b", "a", "ñ", "Á"], n)})
+    df.loc[rng.integers(0, n, 100), "v"] = np.nan
+    sp = SortPermutations(df)
+    for size in (50, 3000):  # por rango del subconjunto / por permutación completa
+        positions = np.sort(rng.choice(n, size, replace=False))
+        for col in ("v", "w"):
+            for asc in (True, False):
+                got = sp.sort_positions(positions, col, asc)
+                expected = df.iloc[positions].sort_values(col, ascending=asc, kind="stable",
+                                                          key=None if col == "v" else lambda s: s.map(
+                                                              {"a": 0, "Á": 1, "b": 2, "ñ": 3}))
+                assert df.index[got].tolist() == expected.index.tolist()
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+from importlib import metadata
+from pathlib import Path
+
+from benchmarks.suite import app_import_profile
+from core.deps import import_pydataset, module_available, pydataset_status
+
+ROOT = Path(__file__).resolve().parent.parent
+# Dependencias que solo se importan cuando hacen falta. El tiempo de importación no se comprueba
+# aquí (depende de la carga de la máquina): lo mide `python -m benchmarks.suite` ("app_imports").
+DEFERRED = ("pydataset", "jinja2", "openpyxl", "altair")
+
+
+def test_page_imports_defer_heavy_dependencies():
+    rows = app_import_profile()
+    assert any(name.startswith("core.") for _, name in rows)
+    loaded = {name.split(".")[0] for _, name in rows}
+    assert not loaded & set(DEFERRED)
+
+
+def test_pydataset_probe_does_not_import_it():
+    code = ("import sys\nfrom core.deps import pydataset_status\n"
+            "print(pydataset_status())\nassert 'pydataset' not in sys.modules")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == str((True, metadata.version("pydataset")))
+
+
+def test_probes_are_memoized():
+    assert pydataset_status() is pydataset_status()
+    assert module_available("pydataset") and not module_available("no_existe_este_modulo")
+    pyds = import_pydataset()
+    assert pyds.ok and pyds.error is None and import_pydataset() is pyds
+    assert "iris" in set(pyds.data()["dataset_id"])
@@ -0,0 +1,25 @@
+import json
+
+from core.warmup import pending, run
+
+
+def test_parallel_warmup_is_resumable_and_reports_failures(tmp_path):
+    store, profiles, report = str(tmp_path / "ds"), str(tmp_path / "pr"), tmp_path / "report.jsonl"
+    names = ["cats", "iris", "no_such_dataset_xyz"]
+
+    seen = []
+    records = run(names, workers=2, store_dir=store, profile_dir=profiles, report=report, progress=None,
+                  on_result=lambda i, total, rec: seen.append((i, total, rec["name"])))
+    assert [(i, total) for i, total, _ in seen] == [(1, 3), (2, 3), (3, 3)]
+    assert sorted(name for _, _, name in seen) == sorted(names)
+    by_name = {r["name"]: r for r in records}
+    assert by_name["cats"]["ok"] and by_name["iris"]["ok"]
+    assert not by_name["no_such_dataset_xyz"]["ok"]
+    assert {"load_s", "persist_s", "profile_s"} <= set(by_name["iris"])
+    assert len(report.read_text().splitlines()) == 3
+    assert json.loads(report.read_text().splitlines()[0])["name"] in names
+
+    # Segunda ejecución: solo queda pendiente el que falló.
+    assert pending(names, store, profiles) == ["no_such_dataset_xyz"]
+    again = run(names, workers=2, store_dir=store, profile_dir=profiles, report=None, progress=None)
+    assert [r["name"] for r in again] == ["no_such_dataset_xyz"]